@@ -0,0 +1,454 @@
+import logging
+import os
+import threading
+from datetime import datetime
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Iterator, Optional, Union
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from ..indexes.ticket_index import TicketIndex
+from ..indexes.status_counts import StatusCounts
+from ..indexes.ticket_rollups import TicketRollups
+from ..indexes.message_graph import MessageGraph
+from ..storage.message_store import MessageRecord, MessageStore
+from ..storage.status_overlay import StatusOverlay
+from ..storage.status_log import StatusLog
+from ..utils.data_utils import DataUtils
+from ..utils.list_utils import ListUtils
+from ..utils.snapshot_utils import SnapshotUtils
+from ..utils.datetime_utils import DatetimeUtils
+from ..utils.cancellation_utils import CancellationUtils
+from ..exceptions.not_found_exception import NotFoundException
+from .ticket_backend import TicketBackend
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTicketBackend(TicketBackend):
+
+    LAZY_SNAPSHOT_SUFFIX = ".lazy" + SnapshotUtils.SNAPSHOT_SUFFIX
+
+    def __init__(
+        self,
+        filepath: str,
+        use_snapshot: bool = True,
+        status_log_path: Optional[str] = None,
+        lazy_messages: bool = False
+    ):
+        """
+        Loads all tickets and messages of a JSON file into memory, and indexes them.
+
+        Parameters:
+        - filepath (str): The path to the JSON file.
+        - use_snapshot (bool): Whether to load the data from a snapshot of the JSON file when it is up to date.
+        - status_log_path (Optional[str]): The path to the log that keeps status changes across restarts, if any.
+          A change reaches the disk at most `StatusLog.fsync_interval` seconds after it is made.
+        - lazy_messages (bool): Whether tickets keep only their message ID, and are linked to their message only
+          when they are returned with it. Filters and indexes read the compact message records instead. Otherwise,
+          each ticket keeps a message built from its record, next to the record.
+        """
+        self.filepath = filepath
+        self.use_snapshot = use_snapshot
+        self.lazy_messages = lazy_messages
+        self.lock = threading.RLock()
+        # The snapshot is only rewritten with the loaded data while the data file is still the one that was loaded
+        self.source_stat = os.stat(filepath)
+
+        # The tickets of both modes differ, so each mode keeps its own snapshot
+        self.snapshot_path = filepath + (self.LAZY_SNAPSHOT_SUFFIX if lazy_messages else SnapshotUtils.SNAPSHOT_SUFFIX)
+
+        if use_snapshot:
+            # Later starts load the already validated and linked data, until the source file changes
+            self.data = SnapshotUtils.load_or_build(filepath, lambda: self.__read_data(filepath), self.snapshot_path)
+        else:
+            self.data = self.__read_data(filepath)
+
+        # Tickets and messages ingested later are appended after these, and are left out of the snapshot
+        self.source_ticket_count = len(self.data["tickets"])
+        self.source_message_count = len(self.data["messages"])
+
+        # Status changes since the data was loaded are replayed before building the indexes over the statuses
+        self.status_log = None if status_log_path is None else StatusLog(status_log_path)
+        self.__replay_status_log()
+
+        # Scans walk a list, which new tickets are appended to without disturbing them, unlike the dictionary
+        self.tickets = list(self.data["tickets"].values())
+        self.get_message = self.__get_message_record if lazy_messages else lambda ticket: ticket.msg
+        self.index = TicketIndex(self.data["tickets"].values(), self.get_message)
+        self.status_counts = StatusCounts(self.data["tickets"], self.index, self.get_message)
+        self.rollups = TicketRollups(self.data["tickets"], self.index, self.get_message)
+        self.message_graph = MessageGraph(self.data["messages"].iter_records(), self.data["messages"].find_record)
+        self.overlay: Optional[StatusOverlay] = None
+        self.overlay_generation = 0
+        # Set while a compaction is scheduled or running, so that status changes start at most one at a time
+        self.compaction_scheduled = False
+        self.compaction_lock = threading.Lock()
+
+    def attach_overlay(self, overlay: Optional[StatusOverlay] = None) -> StatusOverlay:
+        """
+        Shares the ticket status changes with other processes through a status overlay in shared memory.
+
+        Processes forked after attaching the overlay see each other's status changes on their next `sync`.
+
+        Parameters:
+        - overlay (Optional[StatusOverlay]): The overlay to attach, created over the same tickets in the same order.
+          A new overlay with the current statuses is created if none is given.
+
+        Returns:
+        StatusOverlay: The attached overlay.
+        """
+        self.overlay = overlay or StatusOverlay([ticket.status for ticket in self.data["tickets"].values()])
+        self.overlay_generation = 0
+        self.ticket_ids = list(self.data["tickets"].keys())
+
+        return self.overlay
+
+    def share_with_workers(self):
+        self.attach_overlay()
+
+    def is_shared_with_workers(self) -> bool:
+        return self.overlay is not None
+
+    def check_shared_with_workers(self) -> bool:
+        return self.overlay is None or self.overlay.check_lock()
+
+    def __replay_status_log(self):
+        """
+        Applies the status changes recorded in the status log on top of the loaded tickets, unless a ticket holds a
+        later change, e.g. from a new export of the data file.
+        """
+        if self.status_log is None:
+            return
+
+        replayed_count = 0
+        skipped_count = 0
+
+        for ticket_id, status, ts_last_status_change in self.status_log.read():
+            ticket = self.data["tickets"].get(ticket_id)
+
+            # Tickets that are no longer in the data file are ignored
+            if ticket is None:
+                continue
+
+            if DatetimeUtils.is_later(ts_last_status_change, ticket.ts_last_status_change):
+                ticket.status = status
+                ticket.ts_last_status_change = ts_last_status_change
+                replayed_count += 1
+            else:
+                skipped_count += 1
+
+        logger.info(
+            "Replayed %d status changes from %s, skipped %d older than the loaded tickets",
+            replayed_count, self.status_log.path, skipped_count
+        )
+
+    def compact_status_log(self):
+        """
+        Compacts the status log, and stores the current statuses in the snapshot of the data file if it is up to date.
+
+        Only the statuses and the list of messages are copied while holding the lock, so that status changes are not
+        blocked while the snapshot is written. The snapshot only holds the tickets and messages of the data file,
+        as ingested ones are ingested again from their log on the next start. It may miss changes of other
+        processes and changes made while it is written, which is harmless: the compacted log keeps the latest change
+        of every ticket, and is replayed on top of the snapshot.
+        """
+        if self.status_log is None:
+            return
+
+        with self.compaction_lock:
+            if self.use_snapshot and self.__is_source_unchanged():
+                with self.lock:
+                    tickets = list(islice(self.data["tickets"].values(), self.source_ticket_count))
+                    statuses = [(ticket.status, ticket.ts_last_status_change) for ticket in tickets]
+                    messages = self.data["messages"].head(self.source_message_count)
+
+                SnapshotUtils.rewrite(self.filepath, {
+                    "tickets": {
+                        ticket.id: ticket.model_copy(
+                            update={"status": status, "ts_last_status_change": ts_last_status_change}
+                        )
+                        for ticket, (status, ts_last_status_change) in zip(tickets, statuses)
+                    },
+                    "messages": messages
+                }, self.snapshot_path)
+
+            self.status_log.compact()
+
+    def __compact_status_log_in_background(self):
+        """
+        Compacts the status log if it still needs it once the compaction thread runs.
+        """
+        try:
+            if self.status_log.needs_compaction():
+                self.compact_status_log()
+        except Exception:
+            logger.exception("Failed to compact the status log %s", self.status_log.path)
+        finally:
+            with self.lock:
+                self.compaction_scheduled = False
+
+    def __is_source_unchanged(self) -> bool:
+        """
+        Checks whether the data file is still the one that was loaded, e.g. since a new export may have replaced it.
+
+        Returns:
+        bool: True if the size and modification time of the data file are unchanged.
+        """
+        try:
+            source_stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return False
+
+        return (source_stat.st_size, source_stat.st_mtime_ns) == (
+            self.source_stat.st_size, self.source_stat.st_mtime_ns
+        )
+
+    def close(self):
+        if self.status_log is not None:
+            self.status_log.close()
+
+    def sync(self) -> Optional[list[str]]:
+        if self.overlay is None or self.overlay.generation == self.overlay_generation:
+            return []
+
+        with self.lock:
+            generation, positions = self.overlay.read_changes(self.overlay_generation)
+            changed_ticket_ids = []
+
+            for position in range(len(self.ticket_ids)) if positions is None else positions:
+                ticket = self.data["tickets"][self.ticket_ids[position]]
+                status, ts_last_status_change = self.overlay.read(position)
+
+                if ts_last_status_change is not None:
+                    self.__apply_ticket_status(ticket, status, ts_last_status_change)
+                    changed_ticket_ids.append(ticket.id)
+
+            self.overlay_generation = generation
+
+        return changed_ticket_ids
+
+    def __read_data(self, filepath: str) -> dict[str, MutableMapping[str, Union[Ticket, Message]]]:
+        """
+        Reads and validates the tickets and messages from a JSON file, and links each ticket to its message unless
+        the messages are loaded lazily.
+
+        Messages are kept in a compact message store, which only builds pydantic messages when they are accessed.
+
+        Parameters:
+        - filepath (str): The path to the JSON file.
+
+        Returns:
+        dict[str, MutableMapping[str, Union[Ticket, Message]]]: The tickets and messages by their IDs.
+        """
+        data = DataUtils.read_and_validate_data(
+            filepath,
+            [Ticket, Message],
+            ["tickets", "messages"],
+            progress_callback=lambda data_key, count: logger.info("Validated %d %s from %s", count, data_key, filepath),
+            containers={"messages": MessageStore()}
+        )
+
+        # Set message attribute for each ticket
+        for ticket in data["tickets"].values():
+            if ticket.msg_id not in data["messages"]:
+                raise NotFoundException("message", ticket.msg_id)
+
+            if not self.lazy_messages:
+                ticket.msg = data["messages"][ticket.msg_id]
+
+        return data
+
+    def find_tickets(
+        self,
+        page: int,
+        page_size: int,
+        with_count: bool,
+        **filter_arguments
+    ) -> dict[str, Union[int, list[Ticket]]]:
+        # Only the candidates of the most selective index are verified against the full set of filters
+        candidate_ids = self.index.search(**filter_arguments)
+        candidates = (
+            self.tickets if candidate_ids is None
+            else (self.data["tickets"][ticket_id] for ticket_id in candidate_ids)
+        )
+        tickets_filtered = (
+            ticket for ticket in CancellationUtils.iter_checked(candidates)
+            if ticket.filter(self.get_message(ticket), **filter_arguments)
+        )
+
+        if not with_count:
+            return {"tickets": list(islice(tickets_filtered, page * page_size, (page + 1) * page_size))}
+
+        tickets_filtered = list(tickets_filtered)
+
+        return {
+            "ticket_count": len(tickets_filtered),
+            "tickets": ListUtils.get_paginated_list(lst=tickets_filtered, page=page, page_size=page_size)
+        }
+
+    def find_tickets_by_cursor(
+        self,
+        after: Optional[tuple[datetime, str]],
+        page_size: int,
+        **filter_arguments
+    ) -> list[Ticket]:
+        start_index, end_index = self.index.get_timestamp_range(
+            filter_arguments.get("timestamp_start"), filter_arguments.get("timestamp_end"), after
+        )
+
+        # Sorting the candidates of a selective index is cheaper than walking the whole timestamp range
+        candidate_ids = self.index.search(max_candidates=end_index - start_index, **{
+            key: value for key, value in filter_arguments.items() if key not in ("timestamp_start", "timestamp_end")
+        })
+
+        if candidate_ids is None:
+            candidate_ids = islice(self.index.timestamp_ids, start_index, end_index)
+            candidates = (self.data["tickets"][ticket_id] for ticket_id in candidate_ids)
+        else:
+            candidates = sorted(
+                (self.data["tickets"][ticket_id] for ticket_id in candidate_ids),
+                key=lambda ticket: (ticket.timestamp, ticket.id)
+            )
+
+        tickets_filtered = (
+            ticket for ticket in CancellationUtils.iter_checked(candidates)
+            if (after is None or (ticket.timestamp, ticket.id) > after)
+            and ticket.filter(self.get_message(ticket), **filter_arguments)
+        )
+
+        return list(islice(tickets_filtered, page_size))
+
+    def iter_ticket_batches(self, batch_size: int, **filter_arguments) -> Iterator[list[Ticket]]:
+        candidate_ids = self.index.search(**filter_arguments)
+        candidates = (
+            iter(self.tickets) if candidate_ids is None
+            else (self.data["tickets"][ticket_id] for ticket_id in candidate_ids)
+        )
+        tickets_filtered = (
+            ticket for ticket in CancellationUtils.iter_checked(candidates)
+            if ticket.filter(self.get_message(ticket), **filter_arguments)
+        )
+
+        while batch := list(islice(tickets_filtered, batch_size)):
+            yield batch
+
+    def hydrate(self, tickets: list[Ticket]) -> list[Ticket]:
+        if not self.lazy_messages:
+            return tickets
+
+        # Linking copies keeps the stored tickets slim, and the copies are dropped with the response
+        return [
+            ticket.model_copy(update={"msg": self.data["messages"][ticket.msg_id]}) for ticket in tickets
+        ]
+
+    def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
+        return self.data["tickets"].get(ticket_id)
+
+    def get_tickets_by_ids(self, ticket_ids: list[str]) -> dict[str, Ticket]:
+        return {
+            ticket_id: self.data["tickets"][ticket_id] for ticket_id in ticket_ids if ticket_id in self.data["tickets"]
+        }
+
+    def iter_tickets(self) -> Iterator[Ticket]:
+        return iter(self.tickets)
+
+    def get_messages_by_ids(self, message_ids: list[str]) -> dict[str, Message]:
+        return {
+            message_id: self.data["messages"][message_id]
+            for message_id in message_ids if message_id in self.data["messages"]
+        }
+
+    def get_thread(self, message_id: str, max_depth: int, max_size: int) -> tuple[list[str], bool]:
+        return self.message_graph.get_thread(message_id, max_depth, max_size)
+
+    def get_counts(
+        self,
+        author: Optional[str] = None,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[Status, int]:
+        # The counts are maintained on every status change, so they are never computed by scanning the tickets
+        return self.status_counts.get_counts(author, timestamp_start, timestamp_end)
+
+    def get_histogram(
+        self,
+        bucket: TimeBucket,
+        grouping: TicketGrouping,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[str, dict[int, int]]:
+        # The hourly counts are maintained on every status change, so only the edges of the window are scanned
+        return self.rollups.get_histogram(bucket, grouping, timestamp_start, timestamp_end)
+
+    def get_sizes(self) -> dict[str, int]:
+        return {"tickets": len(self.data["tickets"]), "messages": len(self.data["messages"])}
+
+    def add(self, messages: list[Message], tickets: list[Ticket]):
+        with self.lock:
+            for message in messages:
+                self.data["messages"][message.id] = message
+                self.message_graph.add(self.data["messages"].get_record(message.id))
+
+            for ticket in tickets:
+                ticket.msg = None if self.lazy_messages else self.data["messages"][ticket.msg_id]
+                self.data["tickets"][ticket.id] = ticket
+                self.tickets.append(ticket)
+
+                rank = self.index.add(ticket, self.get_message(ticket))
+                self.status_counts.add(ticket, rank)
+                self.rollups.add(ticket)
+
+    def set_statuses(self, tickets: list[Ticket], new_status: Status, ts_last_status_change: datetime):
+        with self.lock:
+            # The changes are written to the log first, so that a visible change survives a crash of the process.
+            # They are flushed to disk within the log's fsync interval, so a crash of the machine loses the latest.
+            if self.status_log is not None:
+                self.status_log.append([(ticket.id, new_status, ts_last_status_change) for ticket in tickets])
+
+            for ticket in tickets:
+                self.__apply_ticket_status(ticket, new_status, ts_last_status_change)
+
+            if self.overlay is not None:
+                generation = self.overlay.write_many([
+                    (self.index.positions[ticket.id], new_status, ts_last_status_change) for ticket in tickets
+                ])
+
+                # Changes of other processes published in between are applied on the next synchronization
+                if generation == self.overlay_generation + len(tickets):
+                    self.overlay_generation = generation
+
+            if self.status_log is not None and not self.compaction_scheduled and self.status_log.needs_compaction():
+                self.compaction_scheduled = True
+                threading.Thread(target=self.__compact_status_log_in_background, daemon=True).start()
+
+    def __get_message_record(self, ticket: Ticket) -> MessageRecord:
+        """
+        Gets the compact record of the message of a ticket, which is read like the message itself.
+
+        Parameters:
+        - ticket (Ticket): The ticket.
+
+        Returns:
+        MessageRecord: The record of the ticket's message.
+        """
+        return self.data["messages"].get_record(ticket.msg_id)
+
+    def __apply_ticket_status(self, ticket: Ticket, new_status: Status, ts_last_status_change: datetime):
+        """
+        Sets the status of a ticket and keeps the indexes in sync.
+
+        Parameters:
+        - ticket (Ticket): The ticket to update.
+        - new_status (Status): New status to set for the ticket.
+        - ts_last_status_change (datetime): Time of the status change.
+        """
+        self.index.update_status(ticket.id, ticket.status, new_status)
+        self.status_counts.update_status(ticket, ticket.status, new_status)
+        self.rollups.update_status(ticket, ticket.status, new_status)
+        ticket.status = new_status
+        ticket.ts_last_status_change = ts_last_status_change
@@ -0,0 +1,654 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Iterator, Optional, Union
+
+from pydantic import TypeAdapter
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from ..utils.data_utils import DataUtils
+from ..utils.json_stream_utils import JsonStreamUtils
+from ..utils.cancellation_utils import CancellationUtils
+from ..utils.time_bucket_utils import TimeBucketUtils
+from ..exceptions.not_found_exception import NotFoundException
+from .ticket_backend import TicketBackend
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteTicketBackend(TicketBackend):
+
+    BUSY_TIMEOUT = 5.0
+    # Number of virtual machine instructions between two checks for the cancellation of a query
+    PROGRESS_INTERVAL = 10000
+    # The trigram tokenizer only indexes substrings of at least three characters
+    MIN_SEARCH_LENGTH = 3
+
+    SCHEMA = """
+        CREATE TABLE messages (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        ) WITHOUT ROWID;
+
+        -- The links between messages for thread lookups
+        CREATE INDEX messages_reference ON messages (json_extract(data, '$.reference_msg_id'));
+        CREATE INDEX messages_discussion ON messages (
+            json_extract(data, '$.discussion_id'), json_extract(data, '$.timestamp'), id
+        );
+        CREATE INDEX messages_channel ON messages (
+            json_extract(data, '$.channel_id'), json_extract(data, '$.timestamp'), id
+        );
+
+        CREATE TABLE tickets (
+            position INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            msg_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            resolved_by TEXT,
+            ts_last_status_change TEXT,
+            timestamp TEXT NOT NULL,
+            context_messages TEXT NOT NULL
+        );
+
+        CREATE INDEX tickets_status ON tickets (status, position);
+        CREATE INDEX tickets_timestamp ON tickets (timestamp, id);
+
+        CREATE VIRTUAL TABLE ticket_search USING fts5 (author_name, msg_content, tokenize = 'trigram');
+    """
+    TICKET_COLUMNS = """
+        tickets.id, tickets.msg_id, tickets.status, tickets.resolved_by, tickets.ts_last_status_change,
+        tickets.timestamp, tickets.context_messages, messages.data
+    """
+
+    GROUP_COLUMNS = {
+        TicketGrouping.STATUS: "tickets.status",
+        TicketGrouping.AUTHOR: "json_extract(messages.data, '$.author.name')",
+        TicketGrouping.CHANNEL: "json_extract(messages.data, '$.channel_id')"
+    }
+
+    def __init__(self, database_path: str):
+        """
+        Serves the tickets and messages from an SQLite database created by `import_json`.
+
+        Filters are evaluated by SQLite: the status and timestamp filters through B-tree indexes, and the author
+        and message content filters through an FTS5 trigram index. Each thread uses its own connection, and status
+        changes are committed right away, so they are durable and visible to all processes.
+
+        Parameters:
+        - database_path (str): The path to the database file.
+
+        Raises:
+        FileNotFoundError: If the database file does not exist.
+        """
+        if not os.path.exists(database_path):
+            raise FileNotFoundError(f"Database {database_path} does not exist, create it with the importer first.")
+
+        self.database_path = database_path
+        self.local = threading.local()
+        self.connections: list[sqlite3.Connection] = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def import_json(
+        filepath: str,
+        database_path: str,
+        batch_size: int = DataUtils.DEFAULT_BATCH_SIZE
+    ) -> dict[str, int]:
+        """
+        Creates an SQLite database from the tickets and messages of a JSON file, replacing an existing one.
+
+        The file is streamed and validated in batches, and the database is built next to the target and moved in
+        place at the end, so a running server never sees a half imported database.
+
+        Parameters:
+        - filepath (str): The path to the JSON file.
+        - database_path (str): The path to the database file.
+        - batch_size (int): Maximum number of items validated and inserted at once.
+
+        Returns:
+        dict[str, int]: The number of imported items per data key.
+
+        Raises:
+        KeyError: If the tickets or messages are missing from the JSON file.
+        NotFoundException: If the message of a ticket is not found.
+        """
+        temporary_path = database_path + ".import"
+
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+        connection = sqlite3.connect(temporary_path)
+        connection.executescript(SqliteTicketBackend.SCHEMA)
+        connection.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TEMP TABLE message_search (id TEXT PRIMARY KEY, author_name TEXT, content TEXT) WITHOUT ROWID;
+        """)
+
+        type_adapters = {"tickets": TypeAdapter(list[Ticket]), "messages": TypeAdapter(list[Message])}
+        batches = {"tickets": [], "messages": []}
+        counts = {"tickets": 0, "messages": 0}
+
+        def insert_batch(data_key: str):
+            items = type_adapters[data_key].validate_python(batches[data_key])
+
+            if data_key == "tickets":
+                # Tickets appearing twice keep their first position and their last values, as in the JSON backend
+                connection.executemany("""
+                    INSERT INTO tickets (id, msg_id, status, resolved_by, ts_last_status_change, timestamp,
+                                         context_messages)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        msg_id = excluded.msg_id, status = excluded.status, resolved_by = excluded.resolved_by,
+                        ts_last_status_change = excluded.ts_last_status_change, timestamp = excluded.timestamp,
+                        context_messages = excluded.context_messages
+                """, [
+                    (
+                        ticket.id, ticket.msg_id, ticket.status.value, ticket.resolved_by,
+                        SqliteTicketBackend.__encode_timestamp(ticket.ts_last_status_change),
+                        SqliteTicketBackend.__encode_timestamp(ticket.timestamp), json.dumps(ticket.context_messages)
+                    )
+                    for ticket in items
+                ])
+            else:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO messages (id, data) VALUES (?, ?)",
+                    [(message.id, message.model_dump_json()) for message in items]
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO message_search (id, author_name, content) VALUES (?, ?, ?)",
+                    [(message.id, message.author.name.lower(), message.content.lower()) for message in items]
+                )
+
+            counts[data_key] += len(items)
+            batches[data_key].clear()
+            logger.info("Imported %d %s from %s", counts[data_key], data_key, filepath)
+
+        for data_key, item in JsonStreamUtils.iter_array_items(filepath, set(batches)):
+            batches[data_key].append(item)
+
+            if len(batches[data_key]) >= batch_size:
+                insert_batch(data_key)
+
+        for data_key in batches:
+            if batches[data_key]:
+                insert_batch(data_key)
+
+        missing_message = connection.execute(
+            "SELECT msg_id FROM tickets WHERE msg_id NOT IN (SELECT id FROM messages) LIMIT 1"
+        ).fetchone()
+
+        if missing_message is not None:
+            connection.close()
+            os.remove(temporary_path)
+            raise NotFoundException("message", missing_message[0])
+
+        connection.executescript("""
+            INSERT INTO ticket_search (rowid, author_name, msg_content)
+            SELECT tickets.position, message_search.author_name, message_search.content
+            FROM tickets JOIN message_search ON message_search.id = tickets.msg_id;
+
+            INSERT INTO ticket_search (ticket_search) VALUES ('optimize');
+            DROP TABLE message_search;
+            ANALYZE;
+        """)
+        connection.commit()
+        # Lets readers and the writer of a running server work concurrently
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.close()
+
+        os.replace(temporary_path, database_path)
+
+        return counts
+
+    def share_with_workers(self):
+        # Connections must not be carried over into forked processes
+        self.close()
+
+    def close(self):
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+
+            self.connections.clear()
+
+    def sync(self) -> Optional[list[str]]:
+        connection = self.__get_connection()
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+
+        # The data version only changes with commits of other connections, which do not tell what changed
+        if data_version == self.local.data_version:
+            return []
+
+        self.local.data_version = data_version
+
+        return None
+
+    def find_tickets(
+        self,
+        page: int,
+        page_size: int,
+        with_count: bool,
+        **filter_arguments
+    ) -> dict[str, Union[int, list[Ticket]]]:
+        condition, parameters = self.__get_condition(**filter_arguments)
+        response = {}
+
+        if with_count:
+            response["ticket_count"] = self.__query(f"SELECT COUNT(*) FROM tickets WHERE {condition}", parameters)[0][0]
+
+        rows = self.__query(f"""
+            SELECT {self.TICKET_COLUMNS}
+            FROM tickets LEFT JOIN messages ON messages.id = tickets.msg_id
+            WHERE {condition}
+            ORDER BY tickets.position
+            LIMIT ? OFFSET ?
+        """, [*parameters, page_size, page * page_size])
+        response["tickets"] = [self.__get_ticket_from_row(row) for row in rows]
+
+        return response
+
+    def find_tickets_by_cursor(
+        self,
+        after: Optional[tuple[datetime, str]],
+        page_size: int,
+        **filter_arguments
+    ) -> list[Ticket]:
+        condition, parameters = self.__get_condition(**filter_arguments)
+
+        if after is not None:
+            condition += " AND (tickets.timestamp, tickets.id) > (?, ?)"
+            parameters += [self.__encode_timestamp(after[0]), after[1]]
+
+        rows = self.__query(f"""
+            SELECT {self.TICKET_COLUMNS}
+            FROM tickets LEFT JOIN messages ON messages.id = tickets.msg_id
+            WHERE {condition}
+            ORDER BY tickets.timestamp, tickets.id
+            LIMIT ?
+        """, [*parameters, page_size])
+
+        return [self.__get_ticket_from_row(row) for row in rows]
+
+    def iter_ticket_batches(self, batch_size: int, **filter_arguments) -> Iterator[list[Ticket]]:
+        condition, parameters = self.__get_condition(**filter_arguments)
+        after_position = -1
+
+        # Each batch seeks past the last position, so that no query holds a cursor across threads
+        while True:
+            rows = self.__query(f"""
+                SELECT tickets.position, {self.TICKET_COLUMNS}
+                FROM tickets LEFT JOIN messages ON messages.id = tickets.msg_id
+                WHERE {condition} AND tickets.position > ?
+                ORDER BY tickets.position
+                LIMIT ?
+            """, [*parameters, after_position, batch_size])
+
+            if not rows:
+                return
+
+            after_position = rows[-1][0]
+            yield [self.__get_ticket_from_row(row[1:]) for row in rows]
+
+    def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
+        return self.get_tickets_by_ids([ticket_id]).get(ticket_id)
+
+    def get_tickets_by_ids(self, ticket_ids: list[str]) -> dict[str, Ticket]:
+        rows = self.__get_connection().execute(f"""
+            SELECT {self.TICKET_COLUMNS}
+            FROM tickets LEFT JOIN messages ON messages.id = tickets.msg_id
+            WHERE tickets.id IN (SELECT value FROM json_each(?))
+        """, [json.dumps(ticket_ids)]).fetchall()
+        tickets = {ticket.id: ticket for ticket in map(self.__get_ticket_from_row, rows)}
+
+        return {ticket_id: tickets[ticket_id] for ticket_id in ticket_ids if ticket_id in tickets}
+
+    def iter_tickets(self) -> Iterator[Ticket]:
+        rows = self.__get_connection().execute(f"""
+            SELECT {self.TICKET_COLUMNS}
+            FROM tickets LEFT JOIN messages ON messages.id = tickets.msg_id
+            ORDER BY tickets.position
+        """)
+
+        return map(self.__get_ticket_from_row, rows)
+
+    def get_messages_by_ids(self, message_ids: list[str]) -> dict[str, Message]:
+        rows = self.__get_connection().execute(
+            "SELECT id, data FROM messages WHERE id IN (SELECT value FROM json_each(?))", [json.dumps(message_ids)]
+        ).fetchall()
+
+        return {message_id: Message.model_validate_json(data) for message_id, data in rows}
+
+    def get_thread(self, message_id: str, max_depth: int, max_size: int) -> tuple[list[str], bool]:
+        message = self.__query(
+            "SELECT json_extract(data, '$.discussion_id'), json_extract(data, '$.channel_id'), "
+            "json_extract(data, '$.timestamp') FROM messages WHERE id = ?",
+            [message_id]
+        )
+
+        if not message:
+            return [], False
+
+        discussion_id, channel_id, timestamp = message[0]
+
+        # Walking one edge further than the depth limit tells whether the limit left out messages
+        rows = self.__query("""
+            WITH RECURSIVE reply_chain (id, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT json_extract(messages.data, '$.reference_msg_id'), reply_chain.depth + 1
+                FROM reply_chain JOIN messages ON messages.id = reply_chain.id
+                WHERE reply_chain.depth <= ? AND json_extract(messages.data, '$.reference_msg_id') IS NOT NULL
+                UNION
+                SELECT messages.id, reply_chain.depth + 1
+                FROM reply_chain JOIN messages ON json_extract(messages.data, '$.reference_msg_id') = reply_chain.id
+                WHERE reply_chain.depth <= ?
+            )
+            SELECT reply_chain.id, MIN(reply_chain.depth) AS depth
+            FROM reply_chain JOIN messages ON messages.id = reply_chain.id
+            GROUP BY reply_chain.id
+            ORDER BY depth, json_extract(messages.data, '$.timestamp'), reply_chain.id
+        """, [message_id, max_depth, max_depth])
+
+        thread = [reply_id for reply_id, depth in rows if depth <= max_depth]
+
+        if len(thread) > max_size:
+            return thread[:max_size], True
+
+        truncated = len(thread) < len(rows)
+        thread = dict.fromkeys(thread)
+
+        for column, value in (("discussion_id", discussion_id), ("channel_id", channel_id)):
+            if value is None:
+                continue
+
+            for neighbor_id in self.__get_closest_messages(
+                column, value, message_id, timestamp, max_size + len(thread)
+            ):
+                if neighbor_id not in thread:
+                    if len(thread) == max_size:
+                        return list(thread), True
+
+                    thread[neighbor_id] = None
+
+        return list(thread), truncated
+
+    def __get_closest_messages(
+        self, column: str, value: str, message_id: str, timestamp: str, limit: int
+    ) -> list[str]:
+        """
+        Gets the messages of a discussion or channel from the closest in time to a message to the farthest.
+
+        Parameters:
+        - column (str): The message attribute holding the discussion or channel ID.
+        - value (str): ID of the discussion or channel.
+        - message_id (str): ID of the message.
+        - timestamp (str): The timestamp of the message, as stored in the messages.
+        - limit (int): Maximum number of messages on each side of the message.
+
+        Returns:
+        list[str]: IDs of the messages.
+        """
+        before, after = (
+            [
+                (datetime.fromisoformat(message_timestamp), message_id)
+                for message_id, message_timestamp in self.__query(f"""
+                    SELECT id, json_extract(data, '$.timestamp')
+                    FROM messages
+                    WHERE json_extract(data, '$.{column}') = ?
+                    AND (json_extract(data, '$.timestamp'), id) {operator} (?, ?)
+                    ORDER BY json_extract(data, '$.timestamp') {order}, id {order}
+                    LIMIT ?
+                """, [value, timestamp, message_id, limit])
+            ]
+            for operator, order in (("<", "DESC"), (">=", "ASC"))
+        )
+        timestamp = datetime.fromisoformat(timestamp)
+        closest_ids = []
+        before_index = after_index = 0
+
+        while before_index < len(before) or after_index < len(after):
+            if after_index == len(after) or (
+                before_index < len(before)
+                and timestamp - before[before_index][0] <= after[after_index][0] - timestamp
+            ):
+                closest_ids.append(before[before_index][1])
+                before_index += 1
+            else:
+                closest_ids.append(after[after_index][1])
+                after_index += 1
+
+        return closest_ids
+
+    def get_sizes(self) -> dict[str, int]:
+        ticket_count, message_count = self.__query(
+            "SELECT (SELECT COUNT(*) FROM tickets), (SELECT COUNT(*) FROM messages)", []
+        )[0]
+
+        return {"tickets": ticket_count, "messages": message_count}
+
+    def get_counts(
+        self,
+        author: Optional[str] = None,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[Status, int]:
+        condition, parameters = self.__get_condition(
+            author=author, timestamp_start=timestamp_start, timestamp_end=timestamp_end
+        )
+        rows = self.__query(f"SELECT status, COUNT(*) FROM tickets WHERE {condition} GROUP BY status", parameters)
+
+        return {Status(status): count for status, count in rows}
+
+    def get_histogram(
+        self,
+        bucket: TimeBucket,
+        grouping: TicketGrouping,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[str, dict[int, int]]:
+        condition, parameters = self.__get_condition(timestamp_start=timestamp_start, timestamp_end=timestamp_end)
+        # The timestamps are numbered in the wall-clock time they were recorded in, as by `TimeBucketUtils`
+        hour = "CAST(strftime('%s', substr(tickets.timestamp, 1, 19)) AS INTEGER) / 3600"
+        rows = self.__query(f"""
+            SELECT {self.GROUP_COLUMNS[grouping]},
+                   ({hour} + {TimeBucketUtils.BUCKET_OFFSET_HOURS[bucket]}) / {TimeBucketUtils.BUCKET_HOURS[bucket]},
+                   COUNT(*)
+            FROM tickets LEFT JOIN messages ON messages.id = tickets.msg_id
+            WHERE {condition} AND {self.GROUP_COLUMNS[grouping]} IS NOT NULL
+            GROUP BY 1, 2
+        """, parameters)
+        histogram = {}
+
+        for group, bucket_number, count in rows:
+            histogram.setdefault(group, {})[bucket_number] = count
+
+        return histogram
+
+    def add(self, messages: list[Message], tickets: list[Ticket]):
+        new_messages = {message.id: message for message in messages}
+        ticket_messages = {
+            **self.get_messages_by_ids([ticket.msg_id for ticket in tickets if ticket.msg_id not in new_messages]),
+            **new_messages
+        }
+        connection = self.__get_connection()
+
+        with connection:
+            connection.executemany(
+                "INSERT INTO messages (id, data) VALUES (?, ?)",
+                [(message.id, message.model_dump_json()) for message in messages]
+            )
+
+            for ticket in tickets:
+                position = connection.execute("""
+                    INSERT INTO tickets (id, msg_id, status, resolved_by, ts_last_status_change, timestamp,
+                                         context_messages)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    ticket.id, ticket.msg_id, ticket.status.value, ticket.resolved_by,
+                    self.__encode_timestamp(ticket.ts_last_status_change), self.__encode_timestamp(ticket.timestamp),
+                    json.dumps(ticket.context_messages)
+                ]).lastrowid
+                message = ticket_messages[ticket.msg_id]
+                connection.execute(
+                    "INSERT INTO ticket_search (rowid, author_name, msg_content) VALUES (?, ?, ?)",
+                    [position, message.author.name.lower(), message.content.lower()]
+                )
+
+    def set_statuses(self, tickets: list[Ticket], new_status: Status, ts_last_status_change: datetime):
+        connection = self.__get_connection()
+
+        with connection:
+            connection.executemany(
+                "UPDATE tickets SET status = ?, ts_last_status_change = ? WHERE id = ?",
+                [
+                    (new_status.value, self.__encode_timestamp(ts_last_status_change), ticket.id)
+                    for ticket in tickets
+                ]
+            )
+
+        for ticket in tickets:
+            ticket.status = new_status
+            ticket.ts_last_status_change = ts_last_status_change
+
+    def __query(self, sql: str, parameters: list[Any]) -> list[tuple]:
+        """
+        Runs a query on the connection of the current thread, which stops early if the operation is cancelled.
+
+        Parameters:
+        - sql (str): The query.
+        - parameters (list[Any]): The parameters of the query.
+
+        Returns:
+        list[tuple]: The rows of the result.
+
+        Raises:
+        ServiceUnavailableException: If the operation is cancelled while the query runs.
+        """
+        try:
+            return self.__get_connection().execute(sql, parameters).fetchall()
+        except sqlite3.OperationalError:
+            # The progress handler interrupts the queries of cancelled operations
+            CancellationUtils.check()
+            raise
+
+    def __get_connection(self) -> sqlite3.Connection:
+        """
+        Gets the connection of the current thread, opening it on first use.
+
+        Returns:
+        sqlite3.Connection: The connection.
+        """
+        connection = getattr(self.local, "connection", None)
+
+        # The connection may have been closed by another thread, or be inherited from a parent process
+        if connection is None or self.local.pid != os.getpid() or connection not in self.connections:
+            connection = sqlite3.connect(self.database_path, timeout=self.BUSY_TIMEOUT, check_same_thread=False)
+            connection.set_progress_handler(CancellationUtils.is_cancelled, self.PROGRESS_INTERVAL)
+
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+            self.local.data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+
+            with self.lock:
+                self.connections.append(connection)
+
+        return connection
+
+    def __get_condition(self, **filter_arguments) -> tuple[str, list[Any]]:
+        """
+        Translates the ticket filters into an SQL condition on the tickets table.
+
+        Parameters:
+        - **filter_arguments: Filtering criteria for author, message content, status, timestamp range.
+
+        Returns:
+        tuple[str, list[Any]]: The condition and its parameters.
+        """
+        clauses = ["1"]
+        parameters = []
+
+        if filter_arguments.get("status") is not None:
+            clauses.append("tickets.status IN (SELECT value FROM json_each(?))")
+            parameters.append(json.dumps([status.value for status in filter_arguments["status"]]))
+
+        for column, argument in (("author_name", "author"), ("msg_content", "msg_content")):
+            text = filter_arguments.get(argument)
+
+            if text is None:
+                continue
+
+            if len(text) >= self.MIN_SEARCH_LENGTH:
+                # A phrase of trigrams matches exactly the texts containing the query as a substring
+                clauses.append(f"tickets.position IN (SELECT rowid FROM ticket_search WHERE {column} MATCH ?)")
+                parameters.append('"' + text.lower().replace('"', '""') + '"')
+            else:
+                clauses.append(f"tickets.position IN (SELECT rowid FROM ticket_search WHERE instr({column}, ?) > 0)")
+                parameters.append(text.lower())
+
+        if filter_arguments.get("timestamp_start") is not None:
+            clauses.append("tickets.timestamp >= ?")
+            parameters.append(self.__encode_timestamp(filter_arguments["timestamp_start"]))
+
+        if filter_arguments.get("timestamp_end") is not None:
+            clauses.append("tickets.timestamp <= ?")
+            parameters.append(self.__encode_timestamp(filter_arguments["timestamp_end"]))
+
+        return " AND ".join(clauses), parameters
+
+    @staticmethod
+    def __get_ticket_from_row(row: tuple) -> Ticket:
+        """
+        Builds a ticket from a row of the ticket columns, without validating the already validated values again.
+
+        Parameters:
+        - row (tuple): The values of the ticket columns.
+
+        Returns:
+        Ticket: The ticket, linked to its message.
+        """
+        ticket_id, msg_id, status, resolved_by, ts_last_status_change, timestamp, context_messages, msg = row
+
+        return Ticket.model_construct(
+            id=ticket_id,
+            msg_id=msg_id,
+            msg=None if msg is None else Message.model_validate_json(msg),
+            status=Status(status),
+            resolved_by=resolved_by,
+            ts_last_status_change=None if ts_last_status_change is None else datetime.fromisoformat(
+                ts_last_status_change
+            ),
+            timestamp=datetime.fromisoformat(timestamp),
+            context_messages=json.loads(context_messages)
+        )
+
+    @staticmethod
+    def __encode_timestamp(timestamp: Optional[datetime]) -> Optional[str]:
+        """
+        Encodes a timestamp as fixed width ISO 8601 text, so that timestamps sort by their text.
+
+        Parameters:
+        - timestamp (Optional[datetime]): The timestamp.
+
+        Returns:
+        Optional[str]: The encoded timestamp, or None if no timestamp is given.
+        """
+        return None if timestamp is None else timestamp.isoformat(timespec="microseconds")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the tickets and messages of a JSON file into SQLite.")
+    parser.add_argument("--filepath", default="../data/awesome_tickets.json")
+    parser.add_argument("--database-path", default="../data/awesome_tickets.db")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    SqliteTicketBackend.import_json(args.filepath, args.database_path)
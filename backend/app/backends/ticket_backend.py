@@ -0,0 +1,262 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator, Optional, Union
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+
+
+class TicketBackend(ABC):
+    """
+    Storage of the tickets and messages behind `TicketRepository`.
+
+    A backend filters, paginates, counts and updates the stored tickets. Caching, serialization and the mapping of
+    missing tickets and messages to HTTP errors are left to the repository.
+    """
+
+    @abstractmethod
+    def find_tickets(
+        self,
+        page: int,
+        page_size: int,
+        with_count: bool,
+        **filter_arguments
+    ) -> dict[str, Union[int, list[Ticket]]]:
+        """
+        Filters the tickets and paginates them by offset, in their original order.
+
+        Parameters:
+        - page (int): Page number.
+        - page_size (int): Number of items per page.
+        - with_count (bool): Whether to count all matching tickets.
+        - **filter_arguments: Optional filters for author, message content, status and timestamp range.
+
+        Returns:
+        dict[str, Union[int, list[Ticket]]]: The page of tickets, and the total ticket count if requested.
+        """
+
+    @abstractmethod
+    def find_tickets_by_cursor(
+        self,
+        after: Optional[tuple[datetime, str]],
+        page_size: int,
+        **filter_arguments
+    ) -> list[Ticket]:
+        """
+        Filters the tickets and returns them in (timestamp, ID) order, starting after a key.
+
+        Parameters:
+        - after (Optional[tuple[datetime, str]]): Exclusive lower bound of the (timestamp, ID) key, or None.
+        - page_size (int): Maximum number of tickets to return.
+        - **filter_arguments: Optional filters for author, message content, status and timestamp range.
+
+        Returns:
+        list[Ticket]: The matching tickets.
+        """
+
+    @abstractmethod
+    def iter_ticket_batches(self, batch_size: int, **filter_arguments) -> Iterator[list[Ticket]]:
+        """
+        Filters the tickets in a single pass and returns them in batches, in their original order, e.g. to export
+        all matching tickets without holding them in memory.
+
+        The iterator may be advanced from different threads, one at a time, and stops early if the operation
+        advancing it is cancelled. Changes made while iterating may or may not be seen.
+
+        Parameters:
+        - batch_size (int): Maximum number of tickets per batch.
+        - **filter_arguments: Optional filters for author, message content, status and timestamp range.
+
+        Returns:
+        Iterator[list[Ticket]]: The batches of matching tickets.
+        """
+
+    @abstractmethod
+    def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
+        """
+        Gets a ticket by its ID.
+
+        Parameters:
+        - ticket_id (str): ID of the ticket.
+
+        Returns:
+        Optional[Ticket]: The ticket, or None if it does not exist.
+        """
+
+    @abstractmethod
+    def get_tickets_by_ids(self, ticket_ids: list[str]) -> dict[str, Ticket]:
+        """
+        Gets several tickets by their IDs.
+
+        Parameters:
+        - ticket_ids (list[str]): IDs of the tickets, without duplicates.
+
+        Returns:
+        dict[str, Ticket]: The existing tickets by their IDs, in the order of the given IDs.
+        """
+
+    @abstractmethod
+    def iter_tickets(self) -> Iterator[Ticket]:
+        """
+        Iterates over all tickets in their original order, e.g. to compare them with another generation of the data.
+
+        Returns:
+        Iterator[Ticket]: The tickets, as returned by `get_ticket`.
+        """
+
+    @abstractmethod
+    def get_messages_by_ids(self, message_ids: list[str]) -> dict[str, Message]:
+        """
+        Gets several messages by their IDs.
+
+        Parameters:
+        - message_ids (list[str]): IDs of the messages.
+
+        Returns:
+        dict[str, Message]: The existing messages by their IDs.
+        """
+
+    @abstractmethod
+    def get_thread(self, message_id: str, max_depth: int, max_size: int) -> tuple[list[str], bool]:
+        """
+        Collects the thread around a message: its reply chain in both directions, filled up with the messages of
+        the same discussion and then of the same channel. See `MessageGraph.get_thread`.
+
+        Parameters:
+        - message_id (str): ID of the message at the center of the thread.
+        - max_depth (int): Maximum number of reply edges between the message and the messages of its reply chain.
+        - max_size (int): Maximum number of messages in the thread, including the message itself.
+
+        Returns:
+        tuple[list[str], bool]: IDs of the messages of the thread, starting with the given message, and whether
+        the limits left out messages.
+        """
+
+    @abstractmethod
+    def get_counts(
+        self,
+        author: Optional[str] = None,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[Status, int]:
+        """
+        Counts the tickets per status, optionally only for an author and a time window.
+
+        Parameters:
+        - author (Optional[str]): Case-insensitive substring of the author name.
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the ticket timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the ticket timestamp.
+
+        Returns:
+        dict[Status, int]: Each status with at least one matching ticket and its ticket count.
+        """
+
+    @abstractmethod
+    def get_histogram(
+        self,
+        bucket: TimeBucket,
+        grouping: TicketGrouping,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[str, dict[int, int]]:
+        """
+        Counts the tickets per bucket of their timestamp and per status, author or channel, optionally only within
+        a time window.
+
+        Parameters:
+        - bucket (TimeBucket): The size of the time buckets.
+        - grouping (TicketGrouping): What to group the tickets by.
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the ticket timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the ticket timestamp.
+
+        Returns:
+        dict[str, dict[int, int]]: The non-zero ticket counts of each group by bucket number, see
+        `TimeBucketUtils.get_bucket`.
+        """
+
+    @abstractmethod
+    def get_sizes(self) -> dict[str, int]:
+        """
+        Counts the stored tickets and messages.
+
+        Returns:
+        dict[str, int]: The number of tickets and messages.
+        """
+
+    @abstractmethod
+    def set_statuses(self, tickets: list[Ticket], new_status: Status, ts_last_status_change: datetime):
+        """
+        Stores a new status for several tickets as a single change, and sets it on the given tickets.
+
+        Parameters:
+        - tickets (list[Ticket]): The tickets to update, as returned by this backend.
+        - new_status (Status): New status to set for the tickets.
+        - ts_last_status_change (datetime): Time of the status change.
+        """
+
+    @abstractmethod
+    def add(self, messages: list[Message], tickets: list[Ticket]):
+        """
+        Stores new messages and tickets one at a time, appending the tickets after the existing ones, and indexes
+        them incrementally.
+
+        Parameters:
+        - messages (list[Message]): The new messages, whose IDs are not stored yet.
+        - tickets (list[Ticket]): The new tickets, whose IDs are not stored yet, and whose messages are either
+          stored or among the new messages.
+        """
+
+    def hydrate(self, tickets: list[Ticket]) -> list[Ticket]:
+        """
+        Links tickets to their messages before they are returned with their messages.
+
+        Parameters:
+        - tickets (list[Ticket]): The tickets, as returned by this backend.
+
+        Returns:
+        list[Ticket]: The tickets with their messages, in the same order. Backends that load the messages
+        lazily return linked copies, other backends return the given tickets.
+        """
+        return tickets
+
+    def sync(self) -> Optional[list[str]]:
+        """
+        Picks up the status changes made by other processes since the last call.
+
+        Returns:
+        Optional[list[str]]: IDs of the changed tickets, or None if any ticket may have changed.
+        """
+        return []
+
+    def share_with_workers(self):
+        """
+        Prepares the backend to be used by worker processes forked after this call.
+        """
+
+    def is_shared_with_workers(self) -> bool:
+        """
+        Checks whether the backend shares its state with forked worker processes, which a single process then cannot
+        replace on its own.
+
+        Returns:
+        bool: True if `share_with_workers` has been called.
+        """
+        return False
+
+    def check_shared_with_workers(self) -> bool:
+        """
+        Checks that the state shared with the worker processes is still usable, e.g. after a worker exited while
+        changing it.
+
+        Returns:
+        bool: False if the shared state stays locked.
+        """
+        return True
+
+    def close(self):
+        """
+        Releases the resources of the backend, flushing pending writes to disk.
+        """
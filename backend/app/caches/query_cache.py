@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class QueryCache:
+
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_TTL = 60.0
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl: float = DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[Hashable, tuple[int, float, Any]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def get_or_compute(self, key: Hashable, generation: int, compute: Callable[[], Any]) -> Any:
+        """
+        Gets the cached result of a query, or computes and caches it.
+
+        A cached result is only used if it was computed in the same data generation and is younger than the TTL.
+        The least recently used results are evicted once the cache is full.
+
+        Parameters:
+        - key (Hashable): The normalized query.
+        - generation (int): The current generation of the data, bumped on every change.
+        - compute (Callable[[], Any]): Computes the result of the query.
+
+        Returns:
+        Any: The result of the query.
+        """
+        if self.max_size <= 0:
+            return compute()
+
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                entry_generation, created_at, result = entry
+
+                if entry_generation == generation and now - created_at < self.ttl:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+
+                del self.entries[key]
+
+                if entry_generation != generation:
+                    self.invalidations += 1
+                else:
+                    self.expirations += 1
+
+            self.misses += 1
+
+        result = compute()
+
+        with self.lock:
+            self.entries[key] = (generation, now, result)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return result
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get the counters of the cache, to help sizing it.
+
+        Returns:
+        dict[str, int]: The current size, the maximum size, and the hit, miss, eviction, invalidation and
+        expiration counts.
+        """
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations
+            }
@@ -0,0 +1,335 @@
+import asyncio
+import itertools
+import json
+import logging
+from collections import deque
+from typing import AsyncIterator, Callable, Optional
+
+from ..models.ticket import Ticket
+from ..models.enums.status import Status
+from ..exceptions.service_unavailable_exception import ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+
+class TicketEventSubscription:
+
+    def __init__(self, max_queue_size: int):
+        """
+        The pending events of a client of the hub.
+
+        Parameters:
+        - max_queue_size (int): Maximum number of pending status events, beyond which the client lags behind.
+        """
+        self.events: deque[bytes] = deque()
+        self.max_queue_size = max_queue_size
+        # Whether status events were dropped since the last delivery, so that the client has to reload the tickets
+        self.lagged = False
+        # Only the latest counts are delivered, so they never queue up
+        self.counts: Optional[bytes] = None
+        self.heartbeat = False
+        self.closed = False
+        self.wake = asyncio.Event()
+
+    def push(self, event: bytes) -> bool:
+        """
+        Queues a status event, dropping all pending ones if the queue is full.
+
+        Parameters:
+        - event (bytes): The encoded event.
+
+        Returns:
+        bool: False if the client lagged behind, True otherwise.
+        """
+        self.wake.set()
+
+        if len(self.events) >= self.max_queue_size:
+            self.events.clear()
+            self.lagged = True
+
+        if self.lagged:
+            return False
+
+        self.events.append(event)
+        return True
+
+    def drain(self) -> list[bytes]:
+        """
+        Takes the pending events, in the order they should be sent.
+
+        Returns:
+        list[bytes]: The encoded events.
+        """
+        self.wake.clear()
+        events = [TicketEventHub.encode_event("resync", {})] if self.lagged else list(self.events)
+
+        if self.counts is not None:
+            events.append(self.counts)
+
+        if not events and self.heartbeat:
+            events.append(TicketEventHub.HEARTBEAT)
+
+        self.events.clear()
+        self.lagged = False
+        self.counts = None
+        self.heartbeat = False
+
+        return events
+
+
+class TicketEventHub:
+
+    DEFAULT_MAX_QUEUE_SIZE = 100
+    DEFAULT_MAX_SUBSCRIBERS = 10000
+    DEFAULT_HEARTBEAT_INTERVAL = 15.0
+    DEFAULT_COUNTS_DELAY = 0.1
+    DEFAULT_POLL_INTERVAL = 1.0
+    # Time in milliseconds after which a disconnected client reconnects
+    RECONNECT_DELAY = 3000
+    HEARTBEAT = b": heartbeat\n\n"
+
+    def __init__(
+        self,
+        get_counts: Callable[[], dict[Status, int]],
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_subscribers: int = DEFAULT_MAX_SUBSCRIBERS,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        counts_delay: float = DEFAULT_COUNTS_DELAY,
+        poll: Optional[Callable[[], None]] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL
+    ):
+        """
+        Fans out ticket status changes and the updated ticket counts to the clients of a server-sent event stream.
+
+        Each event is encoded once and shared by all clients. Every client has a bounded queue of pending status
+        events: a client that cannot keep up loses its backlog and is told to reload the tickets instead, so a slow
+        client never holds more than the queue size in memory, nor slows down the others. The counts are computed
+        once per burst of changes, and a client only receives the latest ones. Idle clients wait on an event of their
+        own, and are only woken up by changes and by a shared heartbeat that keeps their connections open. The
+        heartbeat and the polling only run while there are clients.
+
+        Parameters:
+        - get_counts (Callable[[], dict[Status, int]]): Gets the ticket counts per status.
+        - max_queue_size (int): Maximum number of pending status events per client.
+        - max_subscribers (int): Maximum number of clients, beyond which new clients are rejected.
+        - heartbeat_interval (float): Time in seconds between two heartbeats.
+        - counts_delay (float): Time in seconds to wait for further changes before computing the counts.
+        - poll (Optional[Callable[[], None]]): Publishes the changes made by other processes, e.g. other workers, which
+          the hub is not notified of until they are applied.
+        - poll_interval (float): Time in seconds between two polls.
+        """
+        self.get_counts = get_counts
+        self.max_queue_size = max_queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_interval = heartbeat_interval
+        self.counts_delay = counts_delay
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.subscriptions: set[TicketEventSubscription] = set()
+        self.event_ids = itertools.count(1)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.tasks: list[asyncio.Task] = []
+        self.counts_scheduled = False
+        self.lagged_count = 0
+        self.closed = False
+
+    @staticmethod
+    def encode_event(event_type: str, data: dict, event_id: Optional[int] = None) -> bytes:
+        """
+        Encodes an event in the server-sent event format.
+
+        Parameters:
+        - event_type (str): The type of the event.
+        - data (dict): The data of the event, encoded as JSON.
+        - event_id (Optional[int]): The ID of the event, if any.
+
+        Returns:
+        bytes: The encoded event.
+        """
+        lines = [f"event: {event_type}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+
+        if event_id is not None:
+            lines.insert(0, f"id: {event_id}")
+
+        return ("\n".join(lines) + "\n\n").encode()
+
+    def publish(self, tickets: Optional[list[Ticket]]):
+        """
+        Publishes changed tickets to all clients, from any thread. Does nothing while there are no clients.
+
+        Parameters:
+        - tickets (Optional[list[Ticket]]): The changed tickets, or None if an unknown set of tickets changed, e.g.
+          after a reload, in which case the clients are told to reload the tickets.
+        """
+        if not self.subscriptions or self.loop is None:
+            return
+
+        if tickets is None:
+            event = self.encode_event("resync", {}, next(self.event_ids))
+        else:
+            event = self.encode_event("status", {
+                "tickets": [
+                    {
+                        "id": ticket.id,
+                        "status": ticket.status.value,
+                        "ts_last_status_change": (
+                            None if ticket.ts_last_status_change is None else ticket.ts_last_status_change.isoformat()
+                        )
+                    }
+                    for ticket in tickets
+                ]
+            }, next(self.event_ids))
+
+        try:
+            self.loop.call_soon_threadsafe(self.__broadcast, event)
+        except RuntimeError:
+            # The event loop is closed, e.g. while shutting down
+            pass
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Streams the events of a new client, starting with the current counts, until the client disconnects.
+
+        The client is only registered once the stream is iterated, so that a response that is never sent does not
+        leave it behind.
+
+        Returns:
+        AsyncIterator[bytes]: The encoded events.
+
+        Raises:
+        ServiceUnavailableException: If the maximum number of clients is reached.
+        """
+        subscription = self.subscribe()
+
+        try:
+            yield f"retry: {self.RECONNECT_DELAY}\n\n".encode()
+            yield self.encode_event("counts", await self.__get_counts())
+
+            while not subscription.closed:
+                await subscription.wake.wait()
+
+                for event in subscription.drain():
+                    yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    def check_capacity(self):
+        """
+        Checks that a new client can be registered, e.g. before sending the headers of its stream.
+
+        Raises:
+        ServiceUnavailableException: If the maximum number of clients is reached.
+        """
+        if self.closed:
+            raise ServiceUnavailableException("The server is shutting down.")
+
+        if len(self.subscriptions) >= self.max_subscribers:
+            raise ServiceUnavailableException("Too many clients are listening to the ticket events.")
+
+    def subscribe(self) -> TicketEventSubscription:
+        """
+        Registers a new client on the event loop of the caller.
+
+        Returns:
+        TicketEventSubscription: The pending events of the client.
+
+        Raises:
+        ServiceUnavailableException: If the maximum number of clients is reached.
+        """
+        self.check_capacity()
+        self.loop = asyncio.get_running_loop()
+        subscription = TicketEventSubscription(self.max_queue_size)
+        self.subscriptions.add(subscription)
+
+        if not self.tasks:
+            self.tasks.append(asyncio.create_task(self.__send_heartbeats()))
+
+            if self.poll is not None:
+                self.tasks.append(asyncio.create_task(self.__poll()))
+
+        return subscription
+
+    def unsubscribe(self, subscription: TicketEventSubscription):
+        """
+        Removes a client, stopping the heartbeats and the polling once the last one is gone.
+
+        Parameters:
+        - subscription (TicketEventSubscription): The pending events of the client.
+        """
+        self.subscriptions.discard(subscription)
+
+        if not self.subscriptions:
+            for task in self.tasks:
+                task.cancel()
+
+            self.tasks = []
+
+    def close(self):
+        """
+        Ends the streams of all clients once their pending events are sent, from any thread, e.g. when shutting down,
+        as the server waits for open streams to end. The clients reconnect to another server, or once it restarts.
+        """
+        self.closed = True
+
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.__close_subscriptions)
+            except RuntimeError:
+                pass
+
+    def __close_subscriptions(self):
+        for subscription in self.subscriptions:
+            subscription.closed = True
+            subscription.wake.set()
+
+    def __broadcast(self, event: bytes):
+        """
+        Queues a status event for all clients, and schedules the publication of the updated counts.
+        """
+        for subscription in self.subscriptions:
+            if not subscription.push(event):
+                self.lagged_count += 1
+
+        # A burst of changes, e.g. from a batch of requests, results in a single computation of the counts
+        if not self.counts_scheduled:
+            self.counts_scheduled = True
+            self.loop.call_later(self.counts_delay, lambda: asyncio.ensure_future(self.__publish_counts()))
+
+    async def __publish_counts(self):
+        self.counts_scheduled = False
+
+        if not self.subscriptions:
+            return
+
+        try:
+            counts = self.encode_event("counts", await self.__get_counts(), next(self.event_ids))
+        except Exception:
+            logger.exception("Failed to compute the ticket counts for the event stream")
+            return
+
+        for subscription in self.subscriptions:
+            subscription.counts = counts
+            subscription.wake.set()
+
+    async def __get_counts(self) -> dict[str, int]:
+        # The counts may be queried from a database, which must not block the event loop
+        counts = await asyncio.to_thread(self.get_counts)
+
+        return {status.value: count for status, count in counts.items()}
+
+    async def __send_heartbeats(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+
+            for subscription in self.subscriptions:
+                subscription.heartbeat = True
+                subscription.wake.set()
+
+    async def __poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+
+            try:
+                await asyncio.to_thread(self.poll)
+            except Exception:
+                logger.exception("Failed to poll the changes of other processes for the event stream")
@@ -0,0 +1,10 @@
+from fastapi import HTTPException, status as http_status
+
+
+class ServiceUnavailableException(HTTPException):
+
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail
+        )
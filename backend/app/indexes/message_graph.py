@@ -0,0 +1,154 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from ..models.message import Message
+
+
+class MessageGraph:
+
+    def __init__(self, messages: Iterable[Message], get_message: Callable[[str], Optional[Message]]):
+        """
+        Precomputes the links between messages: reply edges in both directions, and the timelines of the messages
+        of each discussion and each channel.
+
+        Parameters:
+        - messages (Iterable[Message]): The messages, or records with the same attributes.
+        - get_message (Callable[[str], Optional[Message]]): Gets a message or its record by its ID, or None if it
+          does not exist.
+        """
+        self.get_message = get_message
+        self.replies: dict[str, list[str]] = {}
+        self.timelines: dict[tuple[str, str], list[tuple[datetime, str]]] = {}
+
+        for message in messages:
+            self.add(message)
+
+    def add(self, message: Message):
+        """
+        Links a new message to the messages it replies to and shares a discussion or channel with.
+
+        Parameters:
+        - message (Message): The message, or a record with the same attributes.
+        """
+        if message.reference_msg_id is not None:
+            self.replies.setdefault(message.reference_msg_id, []).append(message.id)
+
+        for timeline_key in self.__get_timeline_keys(message):
+            insort(self.timelines.setdefault(timeline_key, []), (message.timestamp, message.id))
+
+    def get_thread(self, message_id: str, max_depth: int, max_size: int) -> tuple[list[str], bool]:
+        """
+        Collects the thread around a message from the precomputed links, without scanning the messages.
+
+        The thread starts with the reply chain: the messages reachable over reply edges in either direction, up to
+        `max_depth` edges away, closest first. It is then filled up with the messages of the same discussion, and
+        finally of the same channel, closest in time first.
+
+        Parameters:
+        - message_id (str): ID of the message at the center of the thread.
+        - max_depth (int): Maximum number of reply edges between the message and the messages of its reply chain.
+        - max_size (int): Maximum number of messages in the thread, including the message itself.
+
+        Returns:
+        tuple[list[str], bool]: IDs of the existing messages of the thread, starting with the given message, and
+        whether the limits left out messages.
+        """
+        message = self.get_message(message_id)
+
+        if message is None:
+            return [], False
+
+        thread = {message_id: None}
+        frontier = [message_id]
+
+        for _ in range(max_depth):
+            if not frontier:
+                break
+
+            # Messages at the same distance are taken in (timestamp, ID) order
+            frontier = sorted(
+                {neighbor_id for neighbor_id in self.__iter_reply_neighbors(frontier) if neighbor_id not in thread},
+                key=self.__get_timeline_entry
+            )
+
+            for neighbor_id in frontier:
+                if len(thread) == max_size:
+                    return list(thread), True
+
+                thread[neighbor_id] = None
+
+        truncated = any(neighbor_id not in thread for neighbor_id in self.__iter_reply_neighbors(frontier))
+
+        for timeline_key in self.__get_timeline_keys(message):
+            for neighbor_id in self.__iter_closest(timeline_key, message):
+                if neighbor_id not in thread:
+                    if len(thread) == max_size:
+                        return list(thread), True
+
+                    thread[neighbor_id] = None
+
+        return list(thread), truncated
+
+    def __get_timeline_entry(self, message_id: str) -> tuple[datetime, str]:
+        return self.get_message(message_id).timestamp, message_id
+
+    def __iter_reply_neighbors(self, message_ids: list[str]) -> Iterable[str]:
+        """
+        Iterates over the existing messages that the given messages reply to, or that reply to them.
+
+        Parameters:
+        - message_ids (list[str]): IDs of the messages.
+
+        Returns:
+        Iterable[str]: IDs of the neighboring messages.
+        """
+        for message_id in message_ids:
+            message = self.get_message(message_id)
+
+            if message.reference_msg_id is not None and self.get_message(message.reference_msg_id) is not None:
+                yield message.reference_msg_id
+
+            yield from self.replies.get(message_id, ())
+
+    def __iter_closest(self, timeline_key: tuple[str, str], message: Message) -> Iterable[str]:
+        """
+        Iterates over the messages of a timeline from the closest in time to a message to the farthest.
+
+        Parameters:
+        - timeline_key (tuple[str, str]): Key of the timeline.
+        - message (Message): The message.
+
+        Returns:
+        Iterable[str]: IDs of the messages of the timeline.
+        """
+        timeline = self.timelines[timeline_key]
+        after_index = bisect_left(timeline, (message.timestamp, message.id))
+        before_index = after_index - 1
+
+        while before_index >= 0 or after_index < len(timeline):
+            if after_index == len(timeline) or (
+                before_index >= 0
+                and message.timestamp - timeline[before_index][0] <= timeline[after_index][0] - message.timestamp
+            ):
+                yield timeline[before_index][1]
+                before_index -= 1
+            else:
+                yield timeline[after_index][1]
+                after_index += 1
+
+    @staticmethod
+    def __get_timeline_keys(message: Message) -> list[tuple[str, str]]:
+        """
+        Gets the keys of the timelines of a message: its discussion, if any, and its channel.
+
+        Parameters:
+        - message (Message): The message.
+
+        Returns:
+        list[tuple[str, str]]: The timeline keys, discussion first.
+        """
+        timeline_keys = [] if message.discussion_id is None else [("discussion", message.discussion_id)]
+        timeline_keys.append(("channel", message.channel_id))
+
+        return timeline_keys
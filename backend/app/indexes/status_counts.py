@@ -0,0 +1,215 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Callable, Optional
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from ..utils.cancellation_utils import CancellationUtils
+from .ticket_index import TicketIndex
+
+
+class FenwickTree:
+
+    def __init__(self, values: list[int]):
+        self.tree = [0] + values
+
+        for index in range(1, len(self.tree)):
+            parent = index + (index & -index)
+
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[index]
+
+    def add(self, index: int, delta: int):
+        """
+        Adds a delta to the value at an index.
+
+        Parameters:
+        - index (int): Zero-based index of the value.
+        - delta (int): The delta to add.
+        """
+        index += 1
+
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def append(self, value: int):
+        """
+        Appends a value after the existing ones.
+
+        Parameters:
+        - value (int): The value to append.
+        """
+        index = len(self.tree)
+
+        # The new node sums the values from its parent's range on, which are already summed by the existing nodes
+        self.tree.append(value + self.get_prefix_sum(index - 1) - self.get_prefix_sum(index - (index & -index)))
+
+    def get_prefix_sum(self, end: int) -> int:
+        """
+        Sums the values before an index.
+
+        Parameters:
+        - end (int): Zero-based, exclusive end of the prefix.
+
+        Returns:
+        int: The sum of the values in [0, end).
+        """
+        total = 0
+        # The index may already hold a new ticket that is not counted yet
+        end = min(end, len(self.tree) - 1)
+
+        while end > 0:
+            total += self.tree[end]
+            end -= end & -end
+
+        return total
+
+
+class StatusCounts:
+
+    def __init__(
+        self,
+        tickets: Mapping[str, Ticket],
+        index: TicketIndex,
+        get_message: Callable[[Ticket], Optional[Message]] = lambda ticket: ticket.msg
+    ):
+        self.tickets = tickets
+        self.index = index
+        self.get_message = get_message
+        # Every status has a count from the start, so reads never see the counter grow during a concurrent change
+        self.counts: Counter[Status] = Counter({status: 0 for status in Status})
+        self.author_timestamps: dict[str, dict[Status, list[datetime]]] = {}
+
+        # Walking the tickets in timestamp order keeps the per author timelines sorted without sorting them
+        for ticket_id in index.timestamp_ids:
+            ticket = tickets[ticket_id]
+            self.counts[ticket.status] += 1
+
+            message = get_message(ticket)
+
+            if message is not None:
+                author_timestamps = self.author_timestamps.setdefault(
+                    message.author.name.lower(), {status: [] for status in Status}
+                )
+                author_timestamps[ticket.status].append(ticket.timestamp)
+
+        self.__build_window_counts()
+
+    def __build_window_counts(self):
+        """
+        Ranks the tickets in (timestamp, ID) order, and builds the per status counts over these ranks.
+        """
+        ranks = {}
+        window_values = {status: [0] * len(self.index.timestamp_ids) for status in Status}
+
+        for rank, ticket_id in enumerate(self.index.timestamp_ids):
+            ranks[ticket_id] = rank
+            window_values[self.tickets[ticket_id].status][rank] = 1
+
+        self.ranks: dict[str, int] = ranks
+        self.window_counts = {status: FenwickTree(values) for status, values in window_values.items()}
+
+    def get_counts(
+        self,
+        author: Optional[str] = None,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[Status, int]:
+        """
+        Get the ticket counts per status from the maintained aggregates, optionally by author and time window.
+
+        Without filters, this takes constant time. A time window takes logarithmic time, and an author filter takes
+        time proportional to the number of distinct authors.
+
+        Parameters:
+        - author (Optional[str]): Case-insensitive substring of the author name.
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the ticket timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the ticket timestamp.
+
+        Returns:
+        dict[Status, int]: Each status with at least one matching ticket and its ticket count.
+        """
+        if author is not None:
+            author = author.lower()
+            counts = Counter()
+
+            for name, author_timestamps in CancellationUtils.iter_checked(self.author_timestamps.items()):
+                if author in name:
+                    for status, timestamps in author_timestamps.items():
+                        start_index = bisect_left(timestamps, timestamp_start) if timestamp_start else 0
+                        end_index = bisect_right(timestamps, timestamp_end) if timestamp_end else len(timestamps)
+                        counts[status] += max(end_index - start_index, 0)
+        elif timestamp_start is not None or timestamp_end is not None:
+            start_index, end_index = self.index.get_timestamp_range(timestamp_start, timestamp_end)
+            counts = {
+                status: window_counts.get_prefix_sum(end_index) - window_counts.get_prefix_sum(start_index)
+                for status, window_counts in self.window_counts.items()
+            }
+        else:
+            counts = self.counts
+
+        return {status: count for status, count in counts.items() if count > 0}
+
+    def add(self, ticket: Ticket, rank: int):
+        """
+        Counts a new ticket, after it has been added to the index.
+
+        Parameters:
+        - ticket (Ticket): The new ticket.
+        - rank (int): The rank of the ticket in (timestamp, ID) order, as returned by `TicketIndex.add`.
+        """
+        self.counts[ticket.status] += 1
+        message = self.get_message(ticket)
+
+        if message is not None:
+            author_name = message.author.name.lower()
+            author_timestamps = self.author_timestamps.get(author_name)
+
+            if author_timestamps is None:
+                # Counting by author iterates over the authors, so a new author is added to a copy
+                author_timestamps = {status: [] for status in Status}
+                self.author_timestamps = {**self.author_timestamps, author_name: author_timestamps}
+
+            insort(author_timestamps[ticket.status], ticket.timestamp)
+
+        if rank < len(self.ranks):
+            # A ticket older than the latest one shifts the ranks of all later tickets
+            self.__build_window_counts()
+            return
+
+        self.ranks[ticket.id] = rank
+
+        for status, window_counts in self.window_counts.items():
+            window_counts.append(1 if status == ticket.status else 0)
+
+    def update_status(self, ticket: Ticket, old_status: Status, new_status: Status):
+        """
+        Moves a ticket between the aggregates of two statuses after its status has changed.
+
+        Parameters:
+        - ticket (Ticket): The ticket.
+        - old_status (Status): Status of the ticket before the change.
+        - new_status (Status): Status of the ticket after the change.
+        """
+        if old_status == new_status:
+            return
+
+        self.counts[old_status] -= 1
+        self.counts[new_status] += 1
+
+        rank = self.ranks[ticket.id]
+        self.window_counts[old_status].add(rank, -1)
+        self.window_counts[new_status].add(rank, 1)
+
+        message = self.get_message(ticket)
+
+        if message is not None:
+            author_timestamps = self.author_timestamps[message.author.name.lower()]
+            old_timestamps = author_timestamps[old_status]
+
+            del old_timestamps[bisect_left(old_timestamps, ticket.timestamp)]
+            insort(author_timestamps[new_status], ticket.timestamp)
@@ -0,0 +1,83 @@
+from typing import Iterable, Optional
+
+
+class TextIndex:
+
+    NGRAM_SIZE = 3
+
+    def __init__(self, documents: Iterable[tuple[str, str]]):
+        self.postings: dict[str, set[str]] = {}
+
+        for document_id, text in documents:
+            self.add(document_id, text)
+
+    @classmethod
+    def get_ngrams(cls, text: str) -> set[str]:
+        """
+        Splits a text into its distinct, lowercase character n-grams.
+
+        Parameters:
+        - text (str): The text to split.
+
+        Returns:
+        set[str]: The distinct n-grams of the text, empty if the text is shorter than the n-gram size.
+        """
+        text = text.lower()
+        return {text[i:i + cls.NGRAM_SIZE] for i in range(len(text) - cls.NGRAM_SIZE + 1)}
+
+    def add(self, document_id: str, text: str):
+        """
+        Adds a document to the posting list of each of its n-grams.
+
+        Parameters:
+        - document_id (str): ID of the document.
+        - text (str): Text content of the document.
+        """
+        for ngram in self.get_ngrams(text):
+            self.postings.setdefault(ngram, set()).add(document_id)
+
+    def estimate(self, query: str) -> Optional[int]:
+        """
+        Estimates the number of candidates for a query from its rarest n-gram.
+
+        Parameters:
+        - query (str): The substring to search for.
+
+        Returns:
+        Optional[int]: An upper bound of the candidate count, or None if the query is too short to be indexed.
+        """
+        ngrams = self.get_ngrams(query)
+
+        if not ngrams:
+            return None
+
+        return min(len(self.postings.get(ngram, ())) for ngram in ngrams)
+
+    def search(self, query: str) -> Optional[set[str]]:
+        """
+        Intersects the posting lists of the query's n-grams, starting with the rarest one.
+
+        Every document containing the query is a candidate, but not every candidate contains the query
+        (its n-grams may appear in a different order), so the candidates still have to be verified.
+
+        Parameters:
+        - query (str): The substring to search for.
+
+        Returns:
+        Optional[set[str]]: IDs of the candidate documents, or None if the query is too short to be indexed.
+        """
+        ngrams = self.get_ngrams(query)
+
+        if not ngrams:
+            return None
+
+        postings = sorted((self.postings.get(ngram, set()) for ngram in ngrams), key=len)
+        candidates = set(postings[0])
+
+        for posting in postings[1:]:
+            if not candidates:
+                break
+
+            candidates.intersection_update(posting)
+
+        return candidates
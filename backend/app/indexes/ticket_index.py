@@ -0,0 +1,208 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from .text_index import TextIndex
+
+
+class TicketIndex:
+
+    def __init__(
+        self,
+        tickets: Iterable[Ticket],
+        get_message: Callable[[Ticket], Optional[Message]] = lambda ticket: ticket.msg
+    ):
+        """
+        Builds the secondary indexes over the tickets.
+
+        Parameters:
+        - tickets (Iterable[Ticket]): The tickets, in insertion order.
+        - get_message (Callable[[Ticket], Optional[Message]]): Gets the message of a ticket to index its author and
+          content, which defaults to the linked message.
+        """
+        self.positions: dict[str, int] = {}
+        self.status_index: dict[Status, set[str]] = {status: set() for status in Status}
+        self.author_index: dict[str, set[str]] = {}
+        self.content_index = TextIndex(())
+        timestamp_entries: list[tuple[datetime, str]] = []
+
+        for ticket in tickets:
+            self.positions[ticket.id] = len(self.positions)
+            self.status_index[ticket.status].add(ticket.id)
+            timestamp_entries.append((ticket.timestamp, ticket.id))
+
+            message = get_message(ticket)
+
+            if message is not None:
+                self.author_index.setdefault(message.author.name.lower(), set()).add(ticket.id)
+                self.content_index.add(ticket.id, message.content)
+
+        # Ties are broken by ID, which makes (timestamp, ID) a unique key for keyset pagination
+        timestamp_entries.sort()
+        self.timestamps: list[datetime] = [timestamp for timestamp, _ in timestamp_entries]
+        self.timestamp_ids: list[str] = [ticket_id for _, ticket_id in timestamp_entries]
+
+    def search(self, max_candidates: Optional[int] = None, **filter_arguments) -> Optional[list[str]]:
+        """
+        Plans and runs an index lookup for the given filters, driven by the most selective index.
+
+        The result is a superset of the matching tickets: predicates that are not used as the driving index,
+        as well as the candidates of the message content n-gram index, still have to be verified by the caller.
+
+        Parameters:
+        - max_candidates (Optional[int]): Skips the lookup if even the most selective index exceeds this size.
+        - **filter_arguments: Filtering criteria for author, message content, status, timestamp range.
+
+        Returns:
+        Optional[list[str]]: Candidate ticket IDs in insertion order, or None if no indexed filter is given
+        or the lookup is skipped.
+        """
+        lookups = [
+            lookup
+            for lookup in (
+                self.__lookup_status(filter_arguments.get("status")),
+                self.__lookup_author(filter_arguments.get("author")),
+                self.__lookup_msg_content(filter_arguments.get("msg_content")),
+                self.__lookup_timestamp(filter_arguments.get("timestamp_start"), filter_arguments.get("timestamp_end"))
+            )
+            if lookup is not None
+        ]
+
+        if not lookups:
+            return None
+
+        size, resolve = min(lookups, key=lambda lookup: lookup[0])
+
+        if max_candidates is not None and size > max_candidates:
+            return None
+
+        return sorted(resolve(), key=self.positions.__getitem__)
+
+    def get_timestamp_range(
+        self,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None,
+        after: Optional[tuple[datetime, str]] = None
+    ) -> tuple[int, int]:
+        """
+        Finds the range of the timestamp-sorted ticket IDs within the given bounds.
+
+        Parameters:
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the timestamp.
+        - after (Optional[tuple[datetime, str]]): Exclusive lower bound of the (timestamp, ID) key.
+
+        Returns:
+        tuple[int, int]: Start (inclusive) and end (exclusive) index into `timestamp_ids`.
+        """
+        start_index = 0 if timestamp_start is None else bisect_left(self.timestamps, timestamp_start)
+        end_index = len(self.timestamps) if timestamp_end is None else bisect_right(self.timestamps, timestamp_end)
+
+        if after is not None:
+            after_timestamp, after_id = after
+            after_index = bisect_left(self.timestamps, after_timestamp)
+
+            while (
+                after_index < len(self.timestamps)
+                and self.timestamps[after_index] == after_timestamp
+                and self.timestamp_ids[after_index] <= after_id
+            ):
+                after_index += 1
+
+            start_index = max(start_index, after_index)
+
+        return start_index, max(start_index, end_index)
+
+    def add(self, ticket: Ticket, message: Optional[Message]) -> int:
+        """
+        Indexes a new ticket after the existing ones.
+
+        Structures that lookups iterate over are replaced by updated copies instead of being changed in place, so
+        that concurrent lookups never see them change under their feet.
+
+        Parameters:
+        - ticket (Ticket): The new ticket.
+        - message (Optional[Message]): The message of the ticket, whose author and content are indexed.
+
+        Returns:
+        int: The rank of the ticket in (timestamp, ID) order.
+        """
+        self.positions[ticket.id] = len(self.positions)
+        self.status_index[ticket.status].add(ticket.id)
+
+        if message is not None:
+            author_name = message.author.name.lower()
+            author_ticket_ids = self.author_index.get(author_name)
+
+            if author_ticket_ids is None:
+                self.author_index = {**self.author_index, author_name: {ticket.id}}
+            else:
+                author_ticket_ids.add(ticket.id)
+
+            self.content_index.add(ticket.id, message.content)
+
+        if not self.timestamp_ids or (ticket.timestamp, ticket.id) > (self.timestamps[-1], self.timestamp_ids[-1]):
+            # New tickets usually come last, and the IDs grow first, so the timestamps never point past them
+            self.timestamp_ids.append(ticket.id)
+            self.timestamps.append(ticket.timestamp)
+
+            return len(self.timestamps) - 1
+
+        start_index = bisect_left(self.timestamps, ticket.timestamp)
+        end_index = bisect_right(self.timestamps, ticket.timestamp)
+        rank = bisect_left(self.timestamp_ids, ticket.id, start_index, end_index)
+
+        self.timestamp_ids = self.timestamp_ids[:rank] + [ticket.id] + self.timestamp_ids[rank:]
+        self.timestamps = self.timestamps[:rank] + [ticket.timestamp] + self.timestamps[rank:]
+
+        return rank
+
+    def update_status(self, ticket_id: str, old_status: Status, new_status: Status):
+        """
+        Moves a ticket between status buckets after its status has changed.
+
+        Parameters:
+        - ticket_id (str): ID of the ticket.
+        - old_status (Status): Status of the ticket before the change.
+        - new_status (Status): Status of the ticket after the change.
+        """
+        self.status_index[old_status].discard(ticket_id)
+        self.status_index[new_status].add(ticket_id)
+
+    def __lookup_status(self, statuses: Optional[list[Status]]) -> Optional[tuple[int, Callable[[], set[str]]]]:
+        if statuses is None:
+            return None
+
+        buckets = [self.status_index[status] for status in set(statuses)]
+        return sum(len(bucket) for bucket in buckets), lambda: set().union(*buckets)
+
+    def __lookup_author(self, author: Optional[str]) -> Optional[tuple[int, Callable[[], set[str]]]]:
+        if author is None:
+            return None
+
+        # Authors are matched by substring, so resolve the distinct names first, which are far fewer than tickets
+        author = author.lower()
+        buckets = [ticket_ids for name, ticket_ids in self.author_index.items() if author in name]
+        return sum(len(bucket) for bucket in buckets), lambda: set().union(*buckets)
+
+    def __lookup_msg_content(self, msg_content: Optional[str]) -> Optional[tuple[int, Callable[[], set[str]]]]:
+        if msg_content is None:
+            return None
+
+        # Queries shorter than an n-gram cannot be answered by the index and fall back to verification
+        estimate = self.content_index.estimate(msg_content)
+        return None if estimate is None else (estimate, lambda: self.content_index.search(msg_content))
+
+    def __lookup_timestamp(
+        self,
+        timestamp_start: Optional[datetime],
+        timestamp_end: Optional[datetime]
+    ) -> Optional[tuple[int, Callable[[], set[str]]]]:
+        if timestamp_start is None and timestamp_end is None:
+            return None
+
+        start_index, end_index = self.get_timestamp_range(timestamp_start, timestamp_end)
+        return end_index - start_index, lambda: set(self.timestamp_ids[start_index:end_index])
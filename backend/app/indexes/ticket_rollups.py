@@ -0,0 +1,200 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Iterator, Optional
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from ..utils.cancellation_utils import CancellationUtils
+from ..utils.time_bucket_utils import TimeBucketUtils
+from .ticket_index import TicketIndex
+
+
+class HourCounts:
+
+    __slots__ = ("hours", "counts")
+
+    def __init__(self):
+        """
+        The number of tickets of a group per hour, over the sorted hours in which the group has had tickets.
+        """
+        self.hours: list[int] = []
+        self.counts: dict[int, int] = {}
+
+    def add(self, hour: int, delta: int):
+        count = self.counts.get(hour)
+
+        if count is None:
+            # The count is set before the hour is inserted, so that readers never see an hour without its count
+            self.counts[hour] = delta
+            insort(self.hours, hour)
+        else:
+            self.counts[hour] = count + delta
+
+    def iter_range(self, first_hour: Optional[int], last_hour: Optional[int]) -> Iterator[tuple[int, int]]:
+        """
+        Iterates over the non-zero counts of a range of hours.
+
+        Parameters:
+        - first_hour (Optional[int]): The first hour of the range, or None for no lower bound.
+        - last_hour (Optional[int]): The last hour of the range, or None for no upper bound.
+
+        Returns:
+        Iterator[tuple[int, int]]: The hours and their counts, in ascending order.
+        """
+        start_index = 0 if first_hour is None else bisect_left(self.hours, first_hour)
+        end_index = len(self.hours) if last_hour is None else bisect_right(self.hours, last_hour)
+
+        for hour in self.hours[start_index:end_index]:
+            count = self.counts[hour]
+
+            if count:
+                yield hour, count
+
+
+class TicketRollups:
+
+    def __init__(
+        self,
+        tickets: Mapping[str, Ticket],
+        index: TicketIndex,
+        get_message: Callable[[Ticket], Optional[Message]] = lambda ticket: ticket.msg
+    ):
+        """
+        Counts the tickets per hour of their timestamp for every status, author and channel, so that histograms of
+        the tickets over time are summed from these counts instead of scanning the tickets.
+
+        Parameters:
+        - tickets (Mapping[str, Ticket]): The tickets by their IDs.
+        - index (TicketIndex): The index of the tickets, whose timestamp order finds the tickets of an hour.
+        - get_message (Callable[[Ticket], Optional[Message]]): Gets the message of a ticket, or its record.
+        """
+        self.tickets = tickets
+        self.index = index
+        self.get_message = get_message
+        self.groups: dict[TicketGrouping, dict[str, HourCounts]] = {grouping: {} for grouping in TicketGrouping}
+
+        # Walking the tickets in timestamp order appends the hours of every group in order
+        for ticket_id in index.timestamp_ids:
+            ticket = tickets[ticket_id]
+            hour = TimeBucketUtils.get_hour(ticket.timestamp)
+            message = get_message(ticket)
+
+            for grouping, groups in self.groups.items():
+                group = TimeBucketUtils.get_group(ticket, message, grouping)
+
+                if group is not None:
+                    groups.setdefault(group, HourCounts()).add(hour, 1)
+
+    def add(self, ticket: Ticket):
+        """
+        Counts a new ticket, after it has been added to the index.
+
+        Parameters:
+        - ticket (Ticket): The new ticket.
+        """
+        hour = TimeBucketUtils.get_hour(ticket.timestamp)
+        message = self.get_message(ticket)
+
+        for grouping in TicketGrouping:
+            self.__add(grouping, TimeBucketUtils.get_group(ticket, message, grouping), hour, 1)
+
+    def update_status(self, ticket: Ticket, old_status: Status, new_status: Status):
+        """
+        Moves a ticket between the counts of two statuses after its status has changed.
+
+        Parameters:
+        - ticket (Ticket): The ticket.
+        - old_status (Status): Status of the ticket before the change.
+        - new_status (Status): Status of the ticket after the change.
+        """
+        if old_status == new_status:
+            return
+
+        hour = TimeBucketUtils.get_hour(ticket.timestamp)
+        self.__add(TicketGrouping.STATUS, old_status.value, hour, -1)
+        self.__add(TicketGrouping.STATUS, new_status.value, hour, 1)
+
+    def __add(self, grouping: TicketGrouping, group: Optional[str], hour: int, delta: int):
+        if group is None:
+            return
+
+        hour_counts = self.groups[grouping].get(group)
+
+        if hour_counts is None:
+            # Histograms iterate over the groups, so a new group is added to a copy
+            hour_counts = HourCounts()
+            self.groups[grouping] = {**self.groups[grouping], group: hour_counts}
+
+        hour_counts.add(hour, delta)
+
+    def get_histogram(
+        self,
+        bucket: TimeBucket,
+        grouping: TicketGrouping,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[str, dict[int, int]]:
+        """
+        Counts the tickets per time bucket and group, optionally only within a time window.
+
+        The hours entirely within the window are summed from the hourly counts. The tickets of the hours cut by the
+        bounds of the window, at most two, are counted one by one.
+
+        Parameters:
+        - bucket (TimeBucket): The size of the time buckets.
+        - grouping (TicketGrouping): What to group the tickets by.
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the ticket timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the ticket timestamp.
+
+        Returns:
+        dict[str, dict[int, int]]: The non-zero ticket counts of each group by bucket number, see
+        `TimeBucketUtils.get_bucket`.
+        """
+        histogram: defaultdict[str, Counter[int]] = defaultdict(Counter)
+        first_hour = last_hour = None
+        partial_hours = []
+
+        if timestamp_start is not None:
+            first_hour = TimeBucketUtils.get_hour(timestamp_start)
+
+            if timestamp_start != TimeBucketUtils.get_hour_start(first_hour):
+                partial_hours.append(first_hour)
+                first_hour += 1
+
+        if timestamp_end is not None:
+            last_hour = TimeBucketUtils.get_hour(timestamp_end)
+
+            if last_hour not in partial_hours:
+                partial_hours.append(last_hour)
+
+            last_hour -= 1
+
+        if first_hour is None or last_hour is None or first_hour <= last_hour:
+            for group, hour_counts in CancellationUtils.iter_checked(self.groups[grouping].items()):
+                for hour, count in hour_counts.iter_range(first_hour, last_hour):
+                    histogram[group][TimeBucketUtils.get_bucket(hour, bucket)] += count
+
+        for hour in partial_hours:
+            hour_start = TimeBucketUtils.get_hour_start(hour)
+            start_index, end_index = self.index.get_timestamp_range(
+                hour_start if timestamp_start is None else max(timestamp_start, hour_start),
+                min(
+                    TimeBucketUtils.get_hour_start(hour + 1) - timedelta(microseconds=1),
+                    timestamp_end or datetime.max
+                )
+            )
+
+            for ticket_id in islice(self.index.timestamp_ids, start_index, end_index):
+                ticket = self.tickets[ticket_id]
+                group = TimeBucketUtils.get_group(ticket, self.get_message(ticket), grouping)
+
+                if group is not None:
+                    histogram[group][TimeBucketUtils.get_bucket(hour, bucket)] += 1
+
+        return {group: dict(counts) for group, counts in histogram.items()}
@@ -1,12 +1,59 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI, status as http_status
+from fastapi import FastAPI, Response, status as http_status
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routes.ticket_routes import router as ticket_router
+from .routes.ticket_routes import (
+    router as ticket_router, async_ticket_repository, ticket_event_hub, build_ticket_repository, BACKEND, DATA_FILEPATH,
+    RELOAD_INTERVAL, DELTA_FILEPATH, DELTA_INTERVAL
+)
+from .metrics.app_metrics import REGISTRY
+from .metrics.metrics_registry import MetricsRegistry
+from .metrics.sampling_profiler import SamplingProfiler
+from .middlewares.metrics_middleware import MetricsMiddleware
 
 API_PREFIX = "/api/v1"
+# Time in seconds given to running requests when shutting down, after which open event streams are cancelled
+GRACEFUL_SHUTDOWN_TIMEOUT = 5
+# Requests running longer than this many seconds are profiled, and their most sampled stacks logged (0 disables it)
+SLOW_REQUEST_THRESHOLD = float(os.environ.get("TICKETS_SLOW_REQUEST_THRESHOLD", 0))
+# Share of the requests watched by the profiler, to bound its overhead under heavy load
+PROFILE_SAMPLE_RATE = float(os.environ.get("TICKETS_PROFILE_SAMPLE_RATE", SamplingProfiler.DEFAULT_SAMPLE_RATE))
+
+profiler = (
+    SamplingProfiler(SLOW_REQUEST_THRESHOLD, sample_rate=PROFILE_SAMPLE_RATE) if SLOW_REQUEST_THRESHOLD > 0 else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+
+    if RELOAD_INTERVAL > 0 and BACKEND == "memory":
+        # Reload the tickets whenever a new export replaces the data file
+        tasks.append(asyncio.create_task(
+            async_ticket_repository.watch(DATA_FILEPATH, build_ticket_repository, RELOAD_INTERVAL)
+        ))
+
+    if DELTA_FILEPATH:
+        tasks.append(asyncio.create_task(async_ticket_repository.follow(DELTA_FILEPATH, DELTA_INTERVAL)))
 
-app = FastAPI()
+    yield
+
+    for task in tasks:
+        task.cancel()
+
+    # Finish the running requests and flush the pending status changes to disk before exiting
+    async_ticket_repository.close()
+
+    if profiler is not None:
+        profiler.close()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -14,6 +61,43 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, profiler=profiler)
+
+REGISTRY.gauge(
+    "tickets_dataset_size", "Number of stored tickets and messages.", ("kind",),
+    function=lambda: {(kind,): size for kind, size in async_ticket_repository.get_sizes().items()}
+)
+REGISTRY.gauge(
+    "tickets_status_count", "Number of tickets per status.", ("status",),
+    function=lambda: {
+        (status.value,): count for status, count in async_ticket_repository.repository.get_ticket_counts().items()
+    }
+)
+REGISTRY.gauge(
+    "tickets_pending_operations", "Number of ticket operations running or waiting for a worker thread.",
+    function=lambda: async_ticket_repository.pending
+)
+REGISTRY.gauge(
+    "tickets_event_subscribers", "Number of clients listening to the ticket events.",
+    function=lambda: len(ticket_event_hub.subscriptions)
+)
+REGISTRY.counter(
+    "tickets_event_lagged_total", "Number of status events not queued for clients that fell behind.",
+    function=lambda: ticket_event_hub.lagged_count
+)
+REGISTRY.gauge(
+    "tickets_query_cache_size", "Number of cached query results.",
+    function=lambda: async_ticket_repository.get_query_cache_stats()["size"]
+)
+REGISTRY.counter(
+    "tickets_query_cache_events_total",
+    "Number of hits, misses, evictions, invalidations and expirations of the query cache of the current generation.",
+    ("event",),
+    function=lambda: {
+        (event,): count for event, count in async_ticket_repository.get_query_cache_stats().items()
+        if event not in ("size", "max_size")
+    }
+)
 
 
 @app.get(
@@ -31,9 +115,29 @@ async def root():
     return "OK"
 
 
+@app.get(
+    "/metrics",
+    summary="Get the metrics of the service in the Prometheus text format.",
+    tags=["Metrics"],
+    response_model=str,
+    response_description="Request counts and latencies by route, the time spent in each stage of the ticket queries, "
+                         "the size of the dataset and the memory of the process.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Metrics successfully retrieved."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def get_metrics():
+    # Collecting the ticket counts may query the database
+    metrics = await asyncio.to_thread(REGISTRY.render)
+    return Response(metrics, status_code=http_status.HTTP_200_OK, media_type=MetricsRegistry.CONTENT_TYPE)
+
+
 # Routes
 app.include_router(ticket_router, prefix=f"{API_PREFIX}/tickets")
 
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=5001, reload=True)
+    uvicorn.run(
+        "app.main:app", host="0.0.0.0", port=5001, reload=True, timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT
+    )
@@ -0,0 +1,57 @@
+import os
+import resource
+import sys
+
+from .metrics_registry import MetricsRegistry
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# The peak resident memory is reported in KiB on Linux, and in bytes on macOS
+MAX_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def get_resident_memory() -> float:
+    """
+    Gets the current resident memory of the process, falling back to its peak where it is not available.
+
+    Returns:
+    float: The resident memory in bytes.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm_file:
+            return int(statm_file.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return get_peak_resident_memory()
+
+
+def get_peak_resident_memory() -> float:
+    """
+    Gets the peak resident memory of the process.
+
+    Returns:
+    float: The peak resident memory in bytes.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAX_RSS_UNIT
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Number of HTTP requests answered, by route and status code.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time to answer HTTP requests, by route.", ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = REGISTRY.gauge("http_requests_in_progress", "Number of HTTP requests being answered.")
+HTTP_SLOW_REQUESTS = REGISTRY.counter(
+    "http_slow_requests_total", "Number of HTTP requests profiled for exceeding the slow request threshold.", ("route",)
+)
+# Stages of the ticket queries: scanning the tickets for the filters, paginating by cursor, linking the tickets to
+# their messages, counting, resolving threads and serializing the responses
+STAGE_DURATION = REGISTRY.histogram(
+    "tickets_stage_duration_seconds", "Time spent in each stage of the ticket queries.", ("stage",)
+)
+
+REGISTRY.gauge("process_resident_memory_bytes", "Resident memory of the process.", function=get_resident_memory)
+REGISTRY.gauge(
+    "process_peak_resident_memory_bytes", "Peak resident memory of the process.", function=get_peak_resident_memory
+)
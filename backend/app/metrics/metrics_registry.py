@@ -0,0 +1,265 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
+LabelValues = tuple[str, ...]
+Samples = Union[float, dict[LabelValues, float]]
+
+
+class Metric:
+
+    TYPE = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        function: Optional[Callable[[], Samples]] = None
+    ):
+        """
+        A metric in the Prometheus text format, with a value per combination of label values.
+
+        Parameters:
+        - name (str): Name of the metric.
+        - documentation (str): Description of the metric.
+        - label_names (tuple[str, ...]): Names of the labels of the metric.
+        - function (Optional[Callable[[], Samples]]): Computes the value, or the values by label values, whenever
+          the metric is collected, instead of the values recorded so far, e.g. for counters kept by other objects.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.function = function
+        self.values: dict[LabelValues, float] = {}
+        self.lock = threading.Lock()
+
+    def collect(self) -> Iterator[str]:
+        """
+        Renders the metric in the Prometheus text format.
+
+        Returns:
+        Iterator[str]: The lines of the metric.
+        """
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.TYPE}"
+
+        for label_values, value in self.get_values().items():
+            yield f"{self.name}{self.format_labels(self.label_names, label_values)} {self.format_value(value)}"
+
+    def get_values(self) -> dict[LabelValues, float]:
+        """
+        Gets the current values of the metric.
+
+        Returns:
+        dict[LabelValues, float]: The values by label values.
+        """
+        if self.function is None:
+            with self.lock:
+                return dict(self.values)
+
+        values = self.function()
+
+        return values if isinstance(values, dict) else {(): values}
+
+    @staticmethod
+    def format_labels(label_names: tuple[str, ...], label_values: LabelValues) -> str:
+        if not label_names:
+            return ""
+
+        labels = ",".join(
+            f'{name}="{Metric.escape(value)}"' for name, value in zip(label_names, label_values)
+        )
+
+        return f"{{{labels}}}"
+
+    @staticmethod
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+    @staticmethod
+    def format_value(value: float) -> str:
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(Metric):
+
+    TYPE = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1):
+        """
+        Increments the counter.
+
+        Parameters:
+        - *label_values (str): The values of the labels, in the order of their names.
+        - amount (float): The non-negative amount to add.
+        """
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+
+    TYPE = "gauge"
+
+    def set(self, value: float, *label_values: str):
+        """
+        Sets the gauge to a value.
+
+        Parameters:
+        - value (float): The value.
+        - *label_values (str): The values of the labels, in the order of their names.
+        """
+        with self.lock:
+            self.values[label_values] = value
+
+    def inc(self, *label_values: str, amount: float = 1):
+        """
+        Increments the gauge, or decrements it by a negative amount.
+
+        Parameters:
+        - *label_values (str): The values of the labels, in the order of their names.
+        - amount (float): The amount to add.
+        """
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+
+class Histogram(Metric):
+
+    TYPE = "histogram"
+    # Latencies from half a millisecond to ten seconds
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        """
+        A histogram of observed values, e.g. latencies in seconds, with a count per bucket and their sum.
+
+        Parameters:
+        - name (str): Name of the metric.
+        - documentation (str): Description of the metric.
+        - label_names (tuple[str, ...]): Names of the labels of the metric.
+        - buckets (tuple[float, ...]): The ascending upper bounds of the buckets, without the +Inf bucket.
+        """
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+        # Per label values, the number of observations in each bucket (not cumulative) and their sum
+        self.observations: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        """
+        Records an observed value.
+
+        Parameters:
+        - value (float): The observed value.
+        - *label_values (str): The values of the labels, in the order of their names.
+        """
+        bucket_index = bisect_left(self.buckets, value)
+
+        with self.lock:
+            observations = self.observations.get(label_values)
+
+            if observations is None:
+                observations = self.observations[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+
+            observations[0][bucket_index] += 1
+            observations[1][0] += value
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """
+        Observes the time in seconds spent in a block.
+
+        Parameters:
+        - *label_values (str): The values of the labels, in the order of their names.
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.TYPE}"
+
+        with self.lock:
+            observations = {
+                label_values: (list(bucket_counts), total[0])
+                for label_values, (bucket_counts, total) in self.observations.items()
+            }
+
+        label_names = self.label_names + ("le",)
+
+        for label_values, (bucket_counts, total) in observations.items():
+            cumulative_count = 0
+
+            for upper_bound, bucket_count in zip(self.buckets + (math.inf,), bucket_counts):
+                cumulative_count += bucket_count
+                labels = self.format_labels(label_names, label_values + (self.format_value(upper_bound),))
+                yield f"{self.name}_bucket{labels} {cumulative_count}"
+
+            labels = self.format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {self.format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative_count}"
+
+
+class MetricsRegistry:
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        """
+        Collects metrics and renders them in the Prometheus text format.
+        """
+        self.metrics: dict[str, Metric] = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Registers a metric, replacing a metric of the same name.
+
+        Parameters:
+        - metric (Metric): The metric.
+
+        Returns:
+        Metric: The metric.
+        """
+        with self.lock:
+            self.metrics[metric.name] = metric
+
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = (), **kwargs) -> Counter:
+        return self.register(Counter(name, documentation, label_names, **kwargs))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...] = (), **kwargs) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names, **kwargs))
+
+    def histogram(self, name: str, documentation: str, label_names: tuple[str, ...] = (), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, **kwargs))
+
+    def render(self) -> str:
+        """
+        Renders all metrics in the Prometheus text format.
+
+        Returns:
+        str: The metrics.
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+
+        return "\n".join(line for metric in metrics for line in metric.collect()) + "\n"
@@ -0,0 +1,170 @@
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+
+    DEFAULT_INTERVAL = 0.005
+    DEFAULT_SAMPLE_RATE = 1.0
+    MAX_LOGGED_STACKS = 10
+    MAX_STACK_DEPTH = 64
+    # Innermost frames of threads waiting for work, whose stacks tell nothing about where the time goes
+    IDLE_FRAMES = {("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get"), ("thread.py", "_worker")}
+
+    def __init__(
+        self,
+        threshold: float,
+        interval: float = DEFAULT_INTERVAL,
+        sample_rate: float = DEFAULT_SAMPLE_RATE
+    ):
+        """
+        Profiles slow requests by sampling the stacks of all threads while they run past a threshold.
+
+        The sampling thread only wakes up while a profiled request is running, and only samples once one has been
+        running for longer than the threshold, so fast requests cost two dictionary updates. The stacks are sampled
+        from all threads, as the work of a request is spread over the event loop and the worker threads: the stacks
+        of a slow request include those of the requests running at the same time.
+
+        Parameters:
+        - threshold (float): Time in seconds after which a request is profiled.
+        - interval (float): Time in seconds between two samples.
+        - sample_rate (float): Share of the requests to profile, between 0 and 1.
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.request_ids = itertools.count()
+        # The start time and the sampled stacks of the running requests being profiled
+        self.requests: dict[int, tuple[float, Counter]] = {}
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start_request(self) -> Optional[int]:
+        """
+        Starts profiling a request if it is sampled.
+
+        Returns:
+        Optional[int]: ID of the profiled request, or None if it is not profiled.
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return None
+
+        request_id = next(self.request_ids)
+
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.__run, name="sampling-profiler", daemon=True)
+                self.thread.start()
+
+            self.requests[request_id] = (time.perf_counter(), Counter())
+            self.condition.notify()
+
+        return request_id
+
+    def finish_request(self, request_id: Optional[int], description: str) -> Optional[dict[str, Any]]:
+        """
+        Stops profiling a request, and logs its most sampled stacks if it was slow.
+
+        Parameters:
+        - request_id (Optional[int]): ID of the profiled request, or None if it is not profiled.
+        - description (str): Description of the request for the log, e.g. its method and route.
+
+        Returns:
+        Optional[dict[str, Any]]: The profile of the request if it was slow, with its description, duration and
+        the sample count of each collapsed stack (frames from the outermost, separated by semicolons).
+        """
+        if request_id is None:
+            return None
+
+        with self.condition:
+            start, stacks = self.requests.pop(request_id)
+
+        duration = time.perf_counter() - start
+
+        if duration < self.threshold:
+            return None
+
+        profile = {"request": description, "duration": duration, "stacks": dict(stacks.most_common())}
+        logger.warning(
+            "Slow request %s took %.3fs, most sampled stacks:\n%s",
+            description,
+            duration,
+            "\n".join(f"{count} {stack}" for stack, count in stacks.most_common(self.MAX_LOGGED_STACKS))
+            or "(none, the request finished before the first sample)"
+        )
+
+        return profile
+
+    def close(self):
+        """
+        Stops the sampling thread.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+        if self.thread is not None:
+            self.thread.join()
+
+    def __run(self):
+        """
+        Samples the stacks of all threads while a profiled request runs past the threshold, until closed.
+        """
+        while True:
+            with self.condition:
+                while not self.requests and not self.closed:
+                    self.condition.wait()
+
+                if self.closed:
+                    return
+
+            time.sleep(self.interval)
+            now = time.perf_counter()
+
+            with self.condition:
+                slow_stacks = [stacks for start, stacks in self.requests.values() if now - start >= self.threshold]
+
+            if not slow_stacks:
+                continue
+
+            sampled_stacks = [
+                self.__collapse_stack(frame)
+                for thread_id, frame in sys._current_frames().items()
+                if thread_id != threading.get_ident() and not self.__is_idle(frame)
+            ]
+
+            with self.condition:
+                for stacks in slow_stacks:
+                    stacks.update(sampled_stacks)
+
+    def __is_idle(self, frame: FrameType) -> bool:
+        return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in self.IDLE_FRAMES
+
+    def __collapse_stack(self, frame: Optional[FrameType]) -> str:
+        """
+        Collapses a stack into a single line, e.g. to aggregate samples or render flame graphs.
+
+        Parameters:
+        - frame (Optional[FrameType]): The innermost frame of the stack.
+
+        Returns:
+        str: The frames as `file:function:line` from the outermost, separated by semicolons.
+        """
+        frames = []
+
+        while frame is not None and len(frames) < self.MAX_STACK_DEPTH:
+            frames.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+
+        return ";".join(reversed(frames))
@@ -0,0 +1,63 @@
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..metrics.app_metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS, HTTP_SLOW_REQUESTS
+from ..metrics.sampling_profiler import SamplingProfiler
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+
+    def __init__(self, app: ASGIApp, profiler: Optional[SamplingProfiler] = None):
+        """
+        Counts and times the HTTP requests by route, and profiles the slow ones if a profiler is given.
+
+        The requests are labeled with the path template of their route, e.g. `/api/v1/tickets/{ticket_id}`, so that
+        the number of time series does not grow with the number of tickets. Being a plain ASGI middleware, it does
+        not buffer the responses.
+
+        Parameters:
+        - app (ASGIApp): The app to instrument.
+        - profiler (Optional[SamplingProfiler]): The profiler of slow requests, if any.
+        """
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_and_record_status(message: Message):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        request_id = None if self.profiler is None else self.profiler.start_request()
+        start = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.inc(amount=-1)
+
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+
+            HTTP_REQUESTS.inc(method, route_path, str(status_code))
+            HTTP_REQUEST_DURATION.observe(duration, method, route_path)
+
+            if request_id is not None and self.profiler.finish_request(request_id, f"{method} {route_path}"):
+                HTTP_SLOW_REQUESTS.inc(route_path)
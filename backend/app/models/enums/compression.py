@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Compression(str, Enum):
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
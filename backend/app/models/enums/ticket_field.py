@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class TicketField(str, Enum):
+
+    ID = "id"
+    MSG_ID = "msg_id"
+    MSG = "msg"
+    STATUS = "status"
+    RESOLVED_BY = "resolved_by"
+    TS_LAST_STATUS_CHANGE = "ts_last_status_change"
+    TIMESTAMP = "timestamp"
+    CONTEXT_MESSAGES = "context_messages"
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class TicketGrouping(str, Enum):
+
+    STATUS = "status"
+    AUTHOR = "author"
+    CHANNEL = "channel"
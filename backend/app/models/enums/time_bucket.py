@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class TimeBucket(str, Enum):
+
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
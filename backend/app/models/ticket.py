@@ -16,22 +16,26 @@ class Ticket(BaseObject):
     timestamp: datetime
     context_messages: list[str]
 
-    def filter(self, **kwargs) -> bool:
+    def filter(self, message: Optional[Message] = None, **kwargs) -> bool:
         """
         Filters the ticket based on the provided keyword arguments.
 
         Parameters:
+        - message (Optional[Message]): The message to match the author and message content against instead of
+          `msg`, e.g. while the ticket's message is not loaded.
         - **kwargs: Filtering criteria for author, message content, status, timestamp range.
 
         Returns:
         bool: True if the ticket passes all filters, False otherwise.
         """
+        msg = self.msg if message is None else message
+
         return all([
             kwargs.get('author') is None or (
-                self.msg is not None and kwargs.get('author').lower() in self.msg.author.name.lower()
+                msg is not None and kwargs.get('author').lower() in msg.author.name.lower()
             ),
             kwargs.get('msg_content') is None or (
-                self.msg is not None and kwargs.get('msg_content').lower() in self.msg.content.lower()
+                msg is not None and kwargs.get('msg_content').lower() in msg.content.lower()
             ),
             kwargs.get('status') is None or (
                 self.status in kwargs.get('status')
@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+MAX_TICKET_BATCH_SIZE = 1000
+
+
+class TicketBatch(BaseModel):
+
+    ticket_ids: list[str] = Field(min_length=1, max_length=MAX_TICKET_BATCH_SIZE)
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+from .ticket import Ticket
+from .message import Message
+
+
+class TicketDelta(BaseModel):
+
+    messages: list[Message] = []
+    tickets: list[Ticket] = []
@@ -0,0 +1,426 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, TypeVar, Union
+
+from fastapi import HTTPException
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.status import Status
+from ..models.enums.ticket_field import TicketField
+from ..models.enums.compression import Compression
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from ..serializers.ticket_serializer import TicketSerializer
+from ..storage.ticket_delta_log import TicketDeltaLog
+from ..utils.cancellation_utils import CancellationToken, CancellationUtils
+from ..utils.compression_utils import CompressionUtils
+from ..exceptions.bad_request_exception import BadRequestException
+from ..exceptions.generic_exception import GenericException
+from ..exceptions.service_unavailable_exception import ServiceUnavailableException
+from .ticket_repository import TicketRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTicketRepository:
+
+    T = TypeVar("T")
+
+    DEFAULT_MAX_WORKERS = 4
+    DEFAULT_MAX_PENDING = 64
+    DEFAULT_TIMEOUT = 10.0
+    DEFAULT_WATCH_INTERVAL = 10.0
+    DEFAULT_FOLLOW_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        repository: TicketRepository,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        timeout: Optional[float] = DEFAULT_TIMEOUT
+    ):
+        """
+        Gives the event loop non-blocking access to a ticket repository.
+
+        Filtering, counting and batch operations run in a bounded thread pool, so they do not stall the event loop.
+        Reads are cancelled when they exceed the timeout or the request is cancelled: the long running loops and
+        queries of the backends check for the cancellation and stop early. Cheap lookups by ID run inline.
+
+        Parameters:
+        - repository (TicketRepository): The repository to access.
+        - max_workers (int): Number of threads running repository operations.
+        - max_pending (int): Maximum number of operations running or waiting for a thread, beyond which new
+          operations are rejected instead of queueing up.
+        - timeout (Optional[float]): Time in seconds after which a read is cancelled, or None for no timeout.
+        """
+        self.repository = repository
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ticket-repository")
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self.reload_lock = threading.Lock()
+
+    @property
+    def serializer(self) -> TicketSerializer:
+        return self.repository.serializer
+
+    def close(self):
+        """
+        Stops the thread pool, dropping the operations that have not started yet, and closes the repository.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.repository.close()
+
+    async def reload(self, build: Callable[[], TicketRepository]) -> dict[str, int]:
+        """
+        Replaces the repository with a new generation, e.g. built from a new export of the data file.
+
+        The new generation is built in the background while the current one keeps serving requests, and the status
+        changes of the current generation are carried over to it before it is swapped in. Requests already running
+        against the current generation finish against it. See `TicketRepository.retire`.
+
+        Parameters:
+        - build (Callable[[], TicketRepository]): Builds the new generation of the repository.
+
+        Returns:
+        dict[str, int]: The number of tickets added, removed and updated by the new generation, and the number of
+        tickets whose status was carried over.
+
+        Raises:
+        BadRequestException: If the repository is shared with worker processes, which would keep the old data.
+        GenericException: If the new generation cannot be built, in which case the current one is kept.
+        """
+        if self.repository.backend.is_shared_with_workers():
+            raise BadRequestException("The tickets cannot be reloaded while they are shared with worker processes.")
+
+        # Reloading runs in its own thread, since it would hold a worker of the pool for the whole build
+        return await asyncio.to_thread(self.__reload, build)
+
+    def __reload(self, build: Callable[[], TicketRepository]) -> dict[str, int]:
+        """
+        Builds a new generation of the repository, and swaps it in. See `reload`.
+        """
+        with self.reload_lock:
+            repository = self.repository
+
+            try:
+                successor = build()
+            except Exception as exception:
+                logger.exception("Failed to build a new generation of the tickets, keeping the current one")
+                raise GenericException(f"The tickets could not be reloaded: {exception}") from exception
+
+            changes = repository.retire(successor)
+            self.repository = successor
+
+        repository.close()
+        change_counts = {change: len(ticket_ids) for change, ticket_ids in changes.items()}
+        logger.info("Reloaded the tickets: %s", change_counts)
+
+        return change_counts
+
+    async def watch(
+        self,
+        filepath: str,
+        build: Callable[[], TicketRepository],
+        interval: float = DEFAULT_WATCH_INTERVAL
+    ):
+        """
+        Reloads the repository whenever a file changes, until the task is cancelled.
+
+        The file is polled, and only reloaded once it has not changed between two polls, so that a file still being
+        written is not loaded. Failed reloads are logged, and retried on the next change of the file.
+
+        Parameters:
+        - filepath (str): The path to the file to watch, e.g. the data file.
+        - build (Callable[[], TicketRepository]): Builds the new generation of the repository.
+        - interval (float): Time in seconds between two polls of the file.
+        """
+        loaded_stat = self.__get_file_stat(filepath)
+        previous_stat = loaded_stat
+
+        while True:
+            await asyncio.sleep(interval)
+            current_stat = self.__get_file_stat(filepath)
+
+            if current_stat is not None and current_stat != loaded_stat and current_stat == previous_stat:
+                loaded_stat = current_stat
+
+                try:
+                    await self.reload(build)
+                except HTTPException:
+                    logger.warning("Failed to reload the tickets from %s", filepath)
+
+            previous_stat = current_stat
+
+    async def follow(self, filepath: str, interval: float = DEFAULT_FOLLOW_INTERVAL):
+        """
+        Ingests the new tickets and messages appended to a delta log, until the task is cancelled.
+
+        The whole log is ingested on the first poll, skipping the records that are already stored, and only the
+        appended lines afterwards. See `TicketRepository.ingest_log`.
+
+        Parameters:
+        - filepath (str): The path to the delta log.
+        - interval (float): Time in seconds between two polls of the log.
+        """
+        delta_log = TicketDeltaLog(filepath)
+
+        while True:
+            try:
+                counts = await asyncio.to_thread(self.__ingest_log, delta_log)
+            except BadRequestException as exception:
+                logger.warning("Stopped following delta log %s: %s", filepath, exception.detail)
+                return
+
+            if any(counts.values()):
+                logger.info("Ingested %s from %s", counts, filepath)
+
+            await asyncio.sleep(interval)
+
+    def __ingest_log(self, delta_log: TicketDeltaLog) -> dict[str, int]:
+        """
+        Ingests the lines appended to a delta log into the current generation of the repository. See `follow`.
+        """
+        # A reload builds the next generation from the whole log, and must not miss the lines ingested meanwhile
+        with self.reload_lock:
+            return self.repository.ingest_log(delta_log)
+
+    @staticmethod
+    def __get_file_stat(filepath: str) -> Optional[tuple[int, int]]:
+        try:
+            file_stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+
+        return file_stat.st_size, file_stat.st_mtime_ns
+
+    async def get_tickets(
+        self,
+        page: int,
+        page_size: int,
+        with_count: bool = True,
+        fields: Optional[list[TicketField]] = None,
+        **filter_arguments
+    ) -> dict[str, Union[int, list[Ticket]]]:
+        """
+        See `TicketRepository.get_tickets`.
+
+        Raises:
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        return await self.__run(
+            self.timeout, self.repository.get_tickets, page, page_size, with_count, fields, **filter_arguments
+        )
+
+    async def get_tickets_by_cursor(
+        self,
+        cursor: Optional[str],
+        page_size: int,
+        with_count: bool = True,
+        fields: Optional[list[TicketField]] = None,
+        **filter_arguments
+    ) -> dict[str, Union[int, Optional[str], list[Ticket]]]:
+        """
+        See `TicketRepository.get_tickets_by_cursor`.
+
+        Raises:
+        BadRequestException: If the cursor is malformed.
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        return await self.__run(
+            self.timeout, self.repository.get_tickets_by_cursor, cursor, page_size, with_count, fields,
+            **filter_arguments
+        )
+
+    async def get_ticket_counts(
+        self,
+        author: Optional[str] = None,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[Status, int]:
+        """
+        See `TicketRepository.get_ticket_counts`.
+
+        Raises:
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        return await self.__run(
+            self.timeout, self.repository.get_ticket_counts, author, timestamp_start, timestamp_end
+        )
+
+    async def get_ticket_histogram(
+        self,
+        bucket: TimeBucket,
+        grouping: TicketGrouping,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None,
+        max_groups: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        See `TicketRepository.get_ticket_histogram`.
+
+        Raises:
+        BadRequestException: If the histogram has too many buckets.
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        return await self.__run(
+            self.timeout, self.repository.get_ticket_histogram, bucket, grouping, timestamp_start, timestamp_end,
+            max_groups
+        )
+
+    async def get_tickets_by_ids(self, ticket_ids: list[str], with_context_messages: bool = False) -> dict[str, Any]:
+        """
+        See `TicketRepository.get_tickets_by_ids`.
+
+        Raises:
+        NotFoundException: If a context message of a ticket is not found.
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        return await self.__run(
+            self.timeout, self.repository.get_tickets_by_ids, ticket_ids, with_context_messages
+        )
+
+    async def get_ticket_thread(self, ticket_id: str, max_depth: int, max_size: int) -> dict[str, Any]:
+        """
+        See `TicketRepository.get_ticket_thread`.
+
+        Raises:
+        NotFoundException: If the ticket with the given ID is not found.
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        return await self.__run(self.timeout, self.repository.get_ticket_thread, ticket_id, max_depth, max_size)
+
+    async def export_tickets(
+        self,
+        with_context_messages: bool = False,
+        compression: Optional[Compression] = None,
+        **filter_arguments
+    ) -> AsyncIterator[bytes]:
+        """
+        See `TicketRepository.export_tickets`. The tickets are serialized and compressed a chunk at a time in the
+        thread pool, and each chunk is cancelled after the timeout. The first chunk is prepared before returning, so
+        that the export fails before its response starts if it is rejected.
+
+        Parameters:
+        - compression (Optional[Compression]): The compression of the chunks, or None for none.
+
+        Returns:
+        AsyncIterator[bytes]: The chunks.
+
+        Raises:
+        BadRequestException: If the compression is not available.
+        NotFoundException: If a context message of a ticket is not found.
+        ServiceUnavailableException: If the operation is rejected, times out or is cancelled.
+        """
+        CompressionUtils.check_available(compression)
+        chunks = CompressionUtils.compress(
+            self.repository.export_tickets(with_context_messages, **filter_arguments), compression
+        )
+        first_chunk = await self.__run(self.timeout, next, chunks, None)
+
+        return self.__iter_chunks(first_chunk, chunks)
+
+    async def __iter_chunks(self, chunk: Optional[bytes], chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        while chunk is not None:
+            yield chunk
+            chunk = await self.__run(self.timeout, next, chunks, None)
+
+    async def close_ticket(self, ticket_id: str) -> Ticket:
+        """
+        See `TicketRepository.close_ticket`. The change is never cancelled once it has started.
+
+        Raises:
+        ServiceUnavailableException: If the operation is rejected.
+        """
+        return await self.__run(None, self.repository.close_ticket, ticket_id)
+
+    async def remove_ticket(self, ticket_id: str) -> Ticket:
+        """
+        See `TicketRepository.remove_ticket`. The change is never cancelled once it has started.
+
+        Raises:
+        ServiceUnavailableException: If the operation is rejected.
+        """
+        return await self.__run(None, self.repository.remove_ticket, ticket_id)
+
+    async def close_tickets(self, ticket_ids: list[str]) -> dict[str, Any]:
+        """
+        See `TicketRepository.close_tickets`. The change is never cancelled once it has started.
+
+        Raises:
+        ServiceUnavailableException: If the operation is rejected.
+        """
+        return await self.__run(None, self.repository.close_tickets, ticket_ids)
+
+    async def remove_tickets(self, ticket_ids: list[str]) -> dict[str, Any]:
+        """
+        See `TicketRepository.remove_tickets`. The change is never cancelled once it has started.
+
+        Raises:
+        ServiceUnavailableException: If the operation is rejected.
+        """
+        return await self.__run(None, self.repository.remove_tickets, ticket_ids)
+
+    def get_query_cache_stats(self) -> dict[str, int]:
+        return self.repository.get_query_cache_stats()
+
+    def get_sizes(self) -> dict[str, int]:
+        return self.repository.get_sizes()
+
+    def get_version(self) -> tuple[str, datetime]:
+        return self.repository.get_version()
+
+    def get_ticket_version(self, ticket_id: str) -> tuple[str, datetime]:
+        return self.repository.get_ticket_version(ticket_id)
+
+    def get_ticket(self, ticket_id: str) -> Ticket:
+        return self.repository.get_ticket(ticket_id)
+
+    def get_ticket_context_messages(self, ticket_id: str) -> list[Message]:
+        return self.repository.get_ticket_context_messages(ticket_id)
+
+    async def __run(self, timeout: Optional[float], function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs a repository operation in the thread pool and waits for its result without blocking the event loop.
+
+        Parameters:
+        - timeout (Optional[float]): Time in seconds after which the operation is cancelled, or None to never
+          cancel it, not even when the request is cancelled.
+        - function (Callable[..., T]): The repository operation.
+        - *args, **kwargs: The arguments of the operation.
+
+        Returns:
+        T: The result of the operation.
+
+        Raises:
+        ServiceUnavailableException: If too many operations are pending, or the operation times out or is
+        cancelled.
+        """
+        if self.pending >= self.max_pending:
+            raise ServiceUnavailableException("Too many pending requests, please try again later.")
+
+        token = CancellationToken(timeout)
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(CancellationUtils.run, token, function, *args, **kwargs)
+        )
+        self.pending += 1
+
+        try:
+            if timeout is None:
+                return await asyncio.shield(future)
+
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise ServiceUnavailableException(f"The request did not finish within {timeout} seconds.")
+        finally:
+            # Also stops the operation if the request was cancelled, e.g. because the client disconnected
+            if timeout is not None:
+                token.cancel()
+
+            self.pending -= 1
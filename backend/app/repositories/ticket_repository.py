@@ -1,51 +1,690 @@
-from datetime import datetime
-from collections import Counter
-from typing import Union
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
 
 from ..models.ticket import Ticket
 from ..models.message import Message
 from ..models.enums.status import Status
-from ..utils.data_utils import DataUtils
-from ..utils.list_utils import ListUtils
+from ..models.enums.ticket_field import TicketField
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from ..backends.ticket_backend import TicketBackend
+from ..backends.memory_ticket_backend import MemoryTicketBackend
+from ..storage.ticket_delta_log import TicketDeltaLog
+from ..caches.query_cache import QueryCache
+from ..serializers.ticket_serializer import TicketSerializer
+from ..metrics.app_metrics import STAGE_DURATION
+from ..utils.cursor_utils import CursorUtils
+from ..utils.time_bucket_utils import TimeBucketUtils
+from ..utils.datetime_utils import DatetimeUtils
+from ..exceptions.bad_request_exception import BadRequestException
 from ..exceptions.not_found_exception import NotFoundException
 
+logger = logging.getLogger(__name__)
+
 
 class TicketRepository:
 
-    def __init__(self, filepath: str):
-        self.data = DataUtils.read_and_validate_data(filepath, [Ticket, Message], ["tickets", "messages"])
+    EXPORT_BATCH_SIZE = 1000
+    # Bounds the size of a histogram, e.g. hourly buckets over years of tickets
+    MAX_HISTOGRAM_BUCKETS = 10000
+
+    def __init__(
+        self,
+        filepath: Optional[str] = None,
+        use_snapshot: bool = True,
+        cache_size: int = QueryCache.DEFAULT_MAX_SIZE,
+        cache_ttl: float = QueryCache.DEFAULT_TTL,
+        status_log_path: Optional[str] = None,
+        lazy_messages: bool = False,
+        backend: Optional[TicketBackend] = None
+    ):
+        """
+        Serves the tickets of a storage backend, caching query results and serialized tickets.
+
+        Parameters:
+        - filepath (Optional[str]): The path to the JSON file loaded by the default in-memory backend.
+        - use_snapshot (bool): Whether the in-memory backend loads the data from a snapshot when it is up to date.
+        - cache_size (int): Maximum number of cached query results.
+        - cache_ttl (float): Time in seconds after which a cached query result expires.
+        - status_log_path (Optional[str]): The path to the status log of the in-memory backend, if any.
+        - lazy_messages (bool): Whether the in-memory backend links tickets to their messages only when needed.
+        - backend (Optional[TicketBackend]): The backend to use instead of the in-memory backend.
+        """
+        self.backend = backend or MemoryTicketBackend(filepath, use_snapshot, status_log_path, lazy_messages)
+        self.lock = threading.Lock()
+        # Held by status changes, so that a retiring generation hands over all of them to its successor
+        self.write_lock = threading.RLock()
+        self.successor: Optional[TicketRepository] = None
+        # Called with the tickets whose status changed or that were added, or with None if an unknown set changed
+        self.listeners: list[Callable[[Optional[list[Ticket]]], None]] = []
+
+        # Bumped on every status change, which invalidates all cached query results
+        self.generation = 0
+        # Tells the versions of this generation of the repository apart from those of others, as they start over
+        self.epoch = uuid.uuid4().hex[:12]
+        self.last_modified = datetime.now(timezone.utc)
+        # The generation and time of the last change of each ticket, and of the tickets that have not changed since
+        self.ticket_versions: dict[str, tuple[int, datetime]] = {}
+        self.default_ticket_version = (self.generation, self.last_modified)
+        self.query_cache = QueryCache(max_size=cache_size, ttl=cache_ttl)
+        self.serializer = TicketSerializer()
+
+    def close(self):
+        """
+        Flushes the pending status changes to disk and releases the backend.
+        """
+        self.backend.close()
+
+    def ingest(self, messages: list[Message], tickets: list[Ticket]) -> dict[str, int]:
+        """
+        Adds new messages and tickets, which are indexed incrementally and appended after the existing tickets.
+
+        Messages and tickets whose IDs are already stored are skipped, so that the same records can be ingested
+        again, e.g. when a log of new records is replayed.
+
+        Parameters:
+        - messages (list[Message]): The new messages.
+        - tickets (list[Ticket]): The new tickets, whose messages are either stored or among the new messages.
+
+        Returns:
+        dict[str, int]: The number of messages and tickets that were added.
+
+        Raises:
+        BadRequestException: If the tickets are shared with worker processes, which cannot see new tickets.
+        NotFoundException: If the message of a ticket is not found, in which case nothing is added.
+        """
+        with self.write_lock:
+            if self.successor is not None:
+                return self.successor.ingest(messages, tickets)
+
+            stored_message_ids = self.backend.get_messages_by_ids(
+                [message.id for message in messages] + [ticket.msg_id for ticket in tickets]
+            ).keys()
+            stored_ticket_ids = self.backend.get_tickets_by_ids([ticket.id for ticket in tickets]).keys()
+
+            # Records repeated within the same batch are only added once
+            new_messages = {}
+            new_tickets = {}
+
+            for message in messages:
+                if message.id not in stored_message_ids:
+                    new_messages.setdefault(message.id, message)
+
+            for ticket in tickets:
+                if ticket.id not in stored_ticket_ids:
+                    new_tickets.setdefault(ticket.id, ticket)
+
+                    if ticket.msg_id not in stored_message_ids and ticket.msg_id not in new_messages:
+                        raise NotFoundException("message", ticket.msg_id)
+
+            if (new_messages or new_tickets) and self.backend.is_shared_with_workers():
+                raise BadRequestException("Tickets cannot be added while they are shared with worker processes.")
+
+            self.backend.add(list(new_messages.values()), list(new_tickets.values()))
+
+            if new_tickets:
+                with self.lock:
+                    self.__bump_generation(new_tickets.keys())
+
+                self.notify(list(new_tickets.values()))
+
+        return {"messages": len(new_messages), "tickets": len(new_tickets)}
+
+    def ingest_log(self, delta_log: TicketDeltaLog) -> dict[str, int]:
+        """
+        Ingests the lines appended to a log of new records since it was last read. See `ingest`.
+
+        Lines with a ticket whose message is not found are logged and skipped.
+
+        Parameters:
+        - delta_log (TicketDeltaLog): The log.
+
+        Returns:
+        dict[str, int]: The number of messages and tickets that were added.
+
+        Raises:
+        BadRequestException: If the tickets are shared with worker processes, which cannot see new tickets.
+        """
+        counts = {"messages": 0, "tickets": 0}
+
+        for delta in delta_log.read():
+            try:
+                delta_counts = self.ingest(delta.messages, delta.tickets)
+            except NotFoundException as exception:
+                logger.warning("Skipping record of delta log %s: %s", delta_log.path, exception.detail)
+                continue
+
+            for data_key, count in delta_counts.items():
+                counts[data_key] += count
+
+        return counts
+
+    def retire(self, successor: "TicketRepository") -> dict[str, list[str]]:
+        """
+        Hands over to the next generation of the repository, e.g. built from a new export of the data file.
+
+        The status changes of this generation are carried over to the successor, unless the successor holds a later
+        change of the same ticket. Afterwards, status changes of requests still running against this generation are
+        forwarded to the successor, while their reads keep being answered from this generation.
+
+        Parameters:
+        - successor (TicketRepository): The next generation, which is not serving requests yet.
+
+        Returns:
+        dict[str, list[str]]: The IDs of the tickets that were added, removed and updated by the successor, and
+        of the tickets whose status was carried over.
+        """
+        self.__sync()
+        successor.__sync()
+
+        # The contents are compared before blocking the status changes, which only need to be compared afterwards
+        successor_tickets = {ticket.id: ticket for ticket in successor.backend.iter_tickets()}
+        ticket_ids = set()
+        updated_ticket_ids = []
+
+        for ticket in self.backend.iter_tickets():
+            ticket_ids.add(ticket.id)
+            successor_ticket = successor_tickets.get(ticket.id)
+
+            if successor_ticket is not None and self.__get_content(ticket) != self.__get_content(successor_ticket):
+                updated_ticket_ids.append(ticket.id)
+
+        with self.write_lock:
+            self.__sync()
+            changes = defaultdict(list)
+
+            for ticket in self.backend.iter_tickets():
+                successor_ticket = successor_tickets.get(ticket.id)
+
+                if successor_ticket is not None and DatetimeUtils.is_later(
+                    ticket.ts_last_status_change, successor_ticket.ts_last_status_change
+                ):
+                    changes[ticket.status, ticket.ts_last_status_change].append(successor_ticket)
+
+            # Changes made at the same time, e.g. by a batch request, are carried over as a single change
+            for (status, ts_last_status_change), tickets in changes.items():
+                successor.backend.set_statuses(tickets, status, ts_last_status_change)
+
+            successor.listeners.extend(self.listeners)
+            self.successor = successor
+
+        # The contents of any ticket may have changed
+        successor.notify(None)
+
+        return {
+            "added": [ticket_id for ticket_id in successor_tickets if ticket_id not in ticket_ids],
+            "removed": [ticket_id for ticket_id in ticket_ids if ticket_id not in successor_tickets],
+            "updated": updated_ticket_ids,
+            "carried_over": [ticket.id for tickets in changes.values() for ticket in tickets]
+        }
+
+    @staticmethod
+    def __get_content(ticket: Ticket) -> tuple:
+        """
+        Gets the values of a ticket that come from the data file, i.e. all but its status.
+
+        Parameters:
+        - ticket (Ticket): The ticket.
+
+        Returns:
+        tuple: The values of the ticket's fields, except for its status and the time of its last status change.
+        """
+        return tuple(
+            getattr(ticket, name) for name in Ticket.model_fields if name not in ("status", "ts_last_status_change")
+        )
+
+    def __sync(self):
+        """
+        Applies the status changes made by other processes since the last synchronization.
+        """
+        changed_ticket_ids = self.backend.sync()
+
+        if changed_ticket_ids == []:
+            return
 
-        # Set message attribute for each ticket
-        for ticket_id, ticket in self.data["tickets"].items():
-            self.data["tickets"][ticket_id].msg = self.__get_message(ticket.msg_id)
+        with self.lock:
+            if changed_ticket_ids is None:
+                self.serializer.clear()
+            else:
+                for ticket_id in changed_ticket_ids:
+                    self.serializer.invalidate(ticket_id)
 
-    def get_tickets(self, page: int, page_size: int, **filter_arguments) -> dict[str, Union[int, list[Ticket]]]:
+            self.__bump_generation(changed_ticket_ids)
+
+        # An unknown set of changes, e.g. a commit to the database, may be a change of this process
+        if self.listeners and changed_ticket_ids is not None:
+            self.notify(list(self.backend.get_tickets_by_ids(changed_ticket_ids).values()))
+
+    def __bump_generation(self, ticket_ids: Optional[Iterable[str]]):
+        """
+        Records a change of the tickets while holding the lock, which invalidates all cached query results and the
+        versions of the changed tickets.
+
+        Parameters:
+        - ticket_ids (Optional[Iterable[str]]): The IDs of the changed tickets, or None if an unknown set changed.
+        """
+        self.generation += 1
+        self.last_modified = datetime.now(timezone.utc)
+        version = (self.generation, self.last_modified)
+
+        if ticket_ids is None:
+            self.ticket_versions = {}
+            self.default_ticket_version = version
+        else:
+            for ticket_id in ticket_ids:
+                self.ticket_versions[ticket_id] = version
+
+    def get_version(self) -> tuple[str, datetime]:
+        """
+        Gets the version of the tickets, which changes with every change of any ticket, e.g. to tell whether a
+        client's copy of a query result is still up to date without running the query again.
+
+        Returns:
+        tuple[str, datetime]: The version, and the time of the last change, or of the creation of the repository.
+        """
+        self.__sync()
+
+        with self.lock:
+            return f"{self.epoch}-{self.generation}", self.last_modified
+
+    def get_ticket_version(self, ticket_id: str) -> tuple[str, datetime]:
+        """
+        Gets the version of a ticket, which changes with its status but not with the changes of other tickets.
+
+        Parameters:
+        - ticket_id (str): ID of the ticket.
+
+        Returns:
+        tuple[str, datetime]: The version, and the time of the last change of the ticket, or of the creation of the
+        repository.
+
+        Raises:
+        NotFoundException: If the ticket with the given ID is not found.
+        """
+        self.__find_ticket(ticket_id)
+
+        with self.lock:
+            generation, last_modified = self.ticket_versions.get(ticket_id, self.default_ticket_version)
+
+        return f"{self.epoch}-{generation}", last_modified
+
+    def sync(self):
+        """
+        Applies the status changes made by other processes, and notifies the listeners of them, without a query.
+        """
+        self.__sync()
+
+    def notify(self, tickets: Optional[list[Ticket]]):
+        """
+        Notifies the listeners of changed tickets, e.g. to push them to the clients.
+
+        Parameters:
+        - tickets (Optional[list[Ticket]]): The tickets whose status changed or that were added, or None if an
+          unknown set of tickets changed.
+        """
+        for listener in self.listeners:
+            try:
+                listener(tickets)
+            except Exception:
+                logger.exception("Failed to notify a listener of changed tickets")
+
+    def get_tickets(
+        self,
+        page: int,
+        page_size: int,
+        with_count: bool = True,
+        fields: Optional[list[TicketField]] = None,
+        **filter_arguments
+    ) -> dict[str, Union[int, list[Ticket]]]:
         """
         Get paginated response of tickets with optional filters.
 
         Parameters:
         - page (int): Page number.
         - page_size (int): Number of items per page.
+        - with_count (bool): Whether to count all matching tickets. Otherwise, the filtering stops at the end of the
+          requested page and the total ticket count is omitted.
+        - fields (Optional[list[TicketField]]): The ticket fields the caller needs, or None for all fields. The
+          tickets are only linked to their messages if the message is needed.
         - **filter_arguments: Optional filters for tickets.
 
         Returns:
         dict[str, Union[int, list[Ticket]]]: Paginated list of tickets along with the total ticket count.
         """
-        tickets_filtered = [ticket for ticket in self.data["tickets"].values() if ticket.filter(**filter_arguments)]
+        self.__sync()
+        filter_arguments = self.__normalize_filter_arguments(filter_arguments)
+        with_messages = self.__needs_messages(fields)
+
+        return self.query_cache.get_or_compute(
+            ("tickets", page, page_size, with_count, with_messages, self.__get_filter_key(filter_arguments)),
+            self.generation,
+            lambda: self.__hydrate_page(
+                self.__find_tickets(page, page_size, with_count, **filter_arguments), with_messages
+            )
+        )
+
+    def get_tickets_by_cursor(
+        self,
+        cursor: Optional[str],
+        page_size: int,
+        with_count: bool = True,
+        fields: Optional[list[TicketField]] = None,
+        **filter_arguments
+    ) -> dict[str, Union[int, Optional[str], list[Ticket]]]:
+        """
+        Get a page of tickets ordered by timestamp and ID, starting after a cursor, with optional filters.
+
+        Unlike the offset pagination, the cost of a page does not grow with its depth: the backend walks the tickets
+        in (timestamp, ID) order from the cursor, and the filtering stops as soon as the page is full.
+
+        Parameters:
+        - cursor (Optional[str]): The cursor returned with the previous page, or None for the first page.
+        - page_size (int): Number of items per page.
+        - with_count (bool): Whether to include the total count of matching tickets, which requires a full pass.
+        - fields (Optional[list[TicketField]]): The ticket fields the caller needs, or None for all fields.
+        - **filter_arguments: Optional filters for tickets.
+
+        Returns:
+        dict[str, Union[int, Optional[str], list[Ticket]]]: The page of tickets, the cursor of the next page
+        (None if it is the last one), and the total ticket count if requested.
+
+        Raises:
+        BadRequestException: If the cursor is malformed.
+        """
+        self.__sync()
+        filter_arguments = self.__normalize_filter_arguments(filter_arguments)
+        with_messages = self.__needs_messages(fields)
+
+        return self.query_cache.get_or_compute(
+            (
+                "tickets_by_cursor", cursor, page_size, with_count, with_messages,
+                self.__get_filter_key(filter_arguments)
+            ),
+            self.generation,
+            lambda: self.__hydrate_page(
+                self.__find_tickets_by_cursor(cursor, page_size, with_count, **filter_arguments), with_messages
+            )
+        )
+
+    def __find_tickets(
+        self,
+        page: int,
+        page_size: int,
+        with_count: bool,
+        **filter_arguments
+    ) -> dict[str, Union[int, list[Ticket]]]:
+        """
+        Filters and paginates the tickets by offset, bypassing the query cache. See `get_tickets`.
+        """
+        with STAGE_DURATION.time("scan"):
+            return self.backend.find_tickets(page, page_size, with_count, **filter_arguments)
+
+    def __find_tickets_by_cursor(
+        self,
+        cursor: Optional[str],
+        page_size: int,
+        with_count: bool,
+        **filter_arguments
+    ) -> dict[str, Union[int, Optional[str], list[Ticket]]]:
+        """
+        Filters and paginates the tickets by cursor, bypassing the query cache. See `get_tickets_by_cursor`.
+        """
+        after = None if cursor is None else CursorUtils.decode_cursor(cursor)
+
+        with STAGE_DURATION.time("scan"):
+            tickets = self.backend.find_tickets_by_cursor(after, page_size + 1, **filter_arguments)
+
+        with STAGE_DURATION.time("paginate"):
+            has_next_page = 0 < page_size < len(tickets)
+            tickets = tickets[:page_size]
+            next_cursor = CursorUtils.encode_cursor(tickets[-1].timestamp, tickets[-1].id) if has_next_page else None
+
+        response = {"tickets": tickets, "next_cursor": next_cursor}
+
+        if with_count:
+            response["ticket_count"] = self.get_tickets(0, 0, **filter_arguments)["ticket_count"]
+
+        return response
+
+    @staticmethod
+    def __needs_messages(fields: Optional[list[TicketField]]) -> bool:
+        """
+        Checks whether the tickets have to be linked to their messages for the requested fields.
+
+        Parameters:
+        - fields (Optional[list[TicketField]]): The requested ticket fields, or None for all fields.
+
+        Returns:
+        bool: True if the message of each ticket is needed.
+        """
+        return fields is None or TicketField.MSG in fields
+
+    def __hydrate_page(self, page: dict[str, Any], with_messages: bool) -> dict[str, Any]:
+        """
+        Links the tickets of a page to their messages if needed.
+
+        Parameters:
+        - page (dict[str, Any]): The page, with its tickets under "tickets".
+        - with_messages (bool): Whether the messages are needed.
+
+        Returns:
+        dict[str, Any]: The page.
+        """
+        if with_messages:
+            with STAGE_DURATION.time("hydrate"):
+                page["tickets"] = self.backend.hydrate(page["tickets"])
+
+        return page
+
+    def export_tickets(
+        self,
+        with_context_messages: bool = False,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        **filter_arguments
+    ) -> Iterator[bytes]:
+        """
+        Streams all tickets matching the filters as newline-delimited JSON, in their original order.
+
+        The tickets are filtered in a single pass and serialized a batch at a time, so the memory used does not grow
+        with the number of matching tickets, and the query cache is left alone. The iterator may be advanced from
+        different threads, one at a time.
+
+        Parameters:
+        - with_context_messages (bool): Whether to include the context messages of each ticket.
+        - batch_size (int): Number of tickets serialized into each chunk.
+        - **filter_arguments: Optional filters for tickets.
+
+        Returns:
+        Iterator[bytes]: Chunks of JSON lines, one per batch of tickets.
+
+        Raises:
+        NotFoundException: If a context message of a ticket is not found.
+        """
+        self.__sync()
+        batches = self.backend.iter_ticket_batches(batch_size, **self.__normalize_filter_arguments(filter_arguments))
+
+        while True:
+            with STAGE_DURATION.time("scan"):
+                tickets = next(batches, None)
+
+            if tickets is None:
+                return
+
+            with STAGE_DURATION.time("hydrate"):
+                tickets = self.backend.hydrate(tickets)
+
+            context_messages = None
+
+            if with_context_messages:
+                messages = self.__get_messages(
+                    [message_id for ticket in tickets for message_id in ticket.context_messages]
+                )
+                context_messages = []
+                offset = 0
+
+                # The messages of all tickets of the batch are looked up at once, in the order of the tickets
+                for ticket in tickets:
+                    context_messages.append(messages[offset:offset + len(ticket.context_messages)])
+                    offset += len(ticket.context_messages)
+
+            yield self.serializer.dump_lines(tickets, context_messages)
+
+    def get_ticket_counts(
+        self,
+        author: Optional[str] = None,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None
+    ) -> dict[Status, int]:
+        """
+        Get ticket counts per each status, optionally only for an author and a time window.
+
+        Parameters:
+        - author (Optional[str]): Case-insensitive substring of the author name.
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the ticket timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the ticket timestamp.
+
+        Returns:
+        dict[Status, int]: A dictionary containing each status and their respective ticket counts.
+        """
+        self.__sync()
+
+        with STAGE_DURATION.time("count"):
+            return self.backend.get_counts(
+                author, DatetimeUtils.to_utc(timestamp_start), DatetimeUtils.to_utc(timestamp_end)
+            )
+
+    def get_ticket_histogram(
+        self,
+        bucket: TimeBucket,
+        grouping: TicketGrouping,
+        timestamp_start: Optional[datetime] = None,
+        timestamp_end: Optional[datetime] = None,
+        max_groups: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        Get the ticket counts per time bucket and per status, author or channel, optionally only within a time window.
+
+        Parameters:
+        - bucket (TimeBucket): The size of the time buckets.
+        - grouping (TicketGrouping): What to group the tickets by.
+        - timestamp_start (Optional[datetime]): Inclusive lower bound of the ticket timestamp.
+        - timestamp_end (Optional[datetime]): Inclusive upper bound of the ticket timestamp.
+        - max_groups (Optional[int]): Maximum number of groups, keeping those with the most tickets, or None for all.
+
+        Returns:
+        dict[str, Any]: The starts of the buckets, from the first to the last of the window or of the tickets, the
+        ticket counts of each group per bucket, and whether groups were left out.
+
+        Raises:
+        BadRequestException: If the histogram has too many buckets.
+        """
+        self.__sync()
+        timestamp_start = DatetimeUtils.to_utc(timestamp_start)
+        timestamp_end = DatetimeUtils.to_utc(timestamp_end)
+
+        with STAGE_DURATION.time("aggregate"):
+            histogram = self.backend.get_histogram(bucket, grouping, timestamp_start, timestamp_end)
+
+        totals = {group: sum(counts.values()) for group, counts in histogram.items()}
+        groups = sorted(totals, key=lambda group: (-totals[group], group))
+        truncated = max_groups is not None and len(groups) > max_groups
+
+        if truncated:
+            groups = groups[:max_groups]
+
+        bucket_numbers = [bucket_number for counts in histogram.values() for bucket_number in counts]
+        first_bucket = (
+            TimeBucketUtils.get_bucket(TimeBucketUtils.get_hour(timestamp_start), bucket)
+            if timestamp_start is not None else min(bucket_numbers, default=0)
+        )
+        last_bucket = (
+            TimeBucketUtils.get_bucket(TimeBucketUtils.get_hour(timestamp_end), bucket)
+            if timestamp_end is not None else max(bucket_numbers, default=-1)
+        )
+
+        if last_bucket - first_bucket + 1 > self.MAX_HISTOGRAM_BUCKETS:
+            raise BadRequestException(
+                f"The histogram would have more than {self.MAX_HISTOGRAM_BUCKETS} buckets, "
+                f"use larger buckets or a shorter time window."
+            )
+
+        bucket_range = range(first_bucket, last_bucket + 1)
 
         return {
-            "ticket_count": len(tickets_filtered),
-            "tickets": ListUtils.get_paginated_list(lst=tickets_filtered, page=page, page_size=page_size)
+            "bucket": bucket,
+            "group_by": grouping,
+            "buckets": [TimeBucketUtils.get_bucket_start(bucket_number, bucket) for bucket_number in bucket_range],
+            "series": {
+                group: [histogram[group].get(bucket_number, 0) for bucket_number in bucket_range] for group in groups
+            },
+            "truncated": truncated
         }
 
-    def get_ticket_counts(self) -> dict[Status, int]:
+    def get_sizes(self) -> dict[str, int]:
         """
-        Get ticket counts per each status.
+        Get the number of stored tickets and messages.
 
         Returns:
-        dict[Status, int]: A dictionary containing each status and their respective ticket counts.
+        dict[str, int]: The number of tickets and messages.
+        """
+        self.__sync()
+
+        return self.backend.get_sizes()
+
+    def get_query_cache_stats(self) -> dict[str, int]:
         """
-        return Counter(ticket.status for ticket in self.data["tickets"].values())
+        Get the counters of the query cache.
+
+        Returns:
+        dict[str, int]: The size, maximum size, and hit, miss, eviction, invalidation and expiration counts.
+        """
+        return self.query_cache.get_stats()
+
+    @staticmethod
+    def __normalize_filter_arguments(filter_arguments: dict[str, Any]) -> dict[str, Any]:
+        """
+        Converts the bounds of the time window to UTC without a time zone, so that they compare with the ticket
+        timestamps in every backend and share their cache keys with the same bounds given in UTC.
+
+        Parameters:
+        - filter_arguments (dict[str, Any]): Filters for tickets.
+
+        Returns:
+        dict[str, Any]: The filters with the converted bounds.
+        """
+        return {
+            name: DatetimeUtils.to_utc(value) if name in ("timestamp_start", "timestamp_end") else value
+            for name, value in filter_arguments.items()
+        }
+
+    @staticmethod
+    def __get_filter_key(filter_arguments: dict[str, Any]) -> tuple:
+        """
+        Normalizes the filter arguments into a cache key, so that equivalent filters share their results.
+
+        Parameters:
+        - filter_arguments (dict[str, Any]): Filters for tickets.
+
+        Returns:
+        tuple: The normalized filters, sorted by name.
+        """
+        normalized_arguments = {}
+
+        for name, value in filter_arguments.items():
+            if name in ("author", "msg_content") and value is not None:
+                # Both filters are case-insensitive
+                value = value.lower()
+            elif name == "status" and value is not None:
+                # The status filter is a membership test, so neither order nor duplicates matter
+                value = tuple(sorted(set(value)))
+
+            normalized_arguments[name] = value
+
+        return tuple(sorted(normalized_arguments.items()))
 
     def get_ticket(self, ticket_id: str) -> Ticket:
         """
@@ -60,28 +699,49 @@ class TicketRepository:
         Raises:
         NotFoundException: If the ticket with the given ID is not found.
         """
-        if ticket_id not in self.data["tickets"]:
+        return self.backend.hydrate([self.__find_ticket(ticket_id)])[0]
+
+    def __find_ticket(self, ticket_id: str) -> Ticket:
+        """
+        Get a ticket by its ID as stored by the backend, which may not be linked to its message.
+
+        Parameters:
+        - ticket_id (str): ID of the ticket.
+
+        Returns:
+        Ticket: The ticket with the given ID.
+
+        Raises:
+        NotFoundException: If the ticket with the given ID is not found.
+        """
+        self.__sync()
+        ticket = self.backend.get_ticket(ticket_id)
+
+        if ticket is None:
             raise NotFoundException("ticket", ticket_id)
 
-        return self.data["tickets"][ticket_id]
+        return ticket
 
-    def __get_message(self, message_id: str) -> Message:
+    def __get_messages(self, message_ids: list[str]) -> list[Message]:
         """
-        Get a message by its ID.
+        Get several messages by their IDs.
 
         Parameters:
-        - message_id (str): ID of the message.
+        - message_ids (list[str]): IDs of the messages.
 
         Returns:
-        Message: The message with the given ID.
+        list[Message]: The messages with the given IDs, in the same order.
 
         Raises:
-        NotFoundException: If the message with the given ID is not found.
+        NotFoundException: If a message with one of the given IDs is not found.
         """
-        if message_id not in self.data["messages"]:
-            raise NotFoundException("message", message_id)
+        messages = self.backend.get_messages_by_ids(message_ids)
+
+        for message_id in message_ids:
+            if message_id not in messages:
+                raise NotFoundException("message", message_id)
 
-        return self.data["messages"][message_id]
+        return [messages[message_id] for message_id in message_ids]
 
     def get_ticket_context_messages(self, ticket_id: str) -> list[Message]:
         """
@@ -93,12 +753,61 @@ class TicketRepository:
         Returns:
         list[Message]: Context messages associated with the ticket with the given ID.
         """
-        ticket = self.get_ticket(ticket_id)
+        ticket = self.__find_ticket(ticket_id)
 
-        return [
-            self.__get_message(message_id)
-            for message_id in ticket.context_messages
-        ]
+        return self.__get_messages(ticket.context_messages)
+
+    def get_ticket_thread(self, ticket_id: str, max_depth: int, max_size: int) -> dict[str, Any]:
+        """
+        Get the thread around the message of a ticket: its reply chain, filled up with the messages of the same
+        discussion and channel closest in time. See `TicketBackend.get_thread`.
+
+        Parameters:
+        - ticket_id (str): ID of the ticket.
+        - max_depth (int): Maximum number of reply edges between the message of the ticket and the messages of its
+          reply chain.
+        - max_size (int): Maximum number of messages in the thread, including the message of the ticket.
+
+        Returns:
+        dict[str, Any]: The messages of the thread ordered by timestamp, and whether the limits left out messages.
+
+        Raises:
+        NotFoundException: If the ticket with the given ID is not found.
+        """
+        ticket = self.__find_ticket(ticket_id)
+        with STAGE_DURATION.time("thread"):
+            message_ids, truncated = self.backend.get_thread(ticket.msg_id, max_depth, max_size)
+        messages = sorted(self.__get_messages(message_ids), key=lambda message: (message.timestamp, message.id))
+
+        return {"messages": messages, "truncated": truncated}
+
+    def get_tickets_by_ids(self, ticket_ids: list[str], with_context_messages: bool = False) -> dict[str, Any]:
+        """
+        Get several tickets by their IDs, optionally with their context messages.
+
+        Parameters:
+        - ticket_ids (list[str]): IDs of the tickets.
+        - with_context_messages (bool): Whether to include the context messages of each ticket.
+
+        Returns:
+        dict[str, Any]: The tickets by their IDs, their context messages by ticket ID if requested, and the IDs
+        of the tickets that were not found.
+
+        Raises:
+        NotFoundException: If a context message of a ticket is not found.
+        """
+        self.__sync()
+
+        tickets, not_found_ticket_ids = self.__find_tickets_by_ids(ticket_ids)
+        response = {"tickets": self.__hydrate_tickets(tickets), "not_found": not_found_ticket_ids}
+
+        if with_context_messages:
+            response["context_messages"] = {
+                ticket_id: self.__get_messages(ticket.context_messages)
+                for ticket_id, ticket in tickets.items()
+            }
+
+        return response
 
     def __update_ticket_status(self, ticket_id: str, new_status: Status) -> Ticket:
         """
@@ -111,12 +820,81 @@ class TicketRepository:
         Returns:
         Ticket: The updated ticket response after setting its status.
         """
-        ticket = self.get_ticket(ticket_id)
+        with self.write_lock:
+            if self.successor is not None:
+                return self.successor.__update_ticket_status(ticket_id, new_status)
 
-        ticket.status = new_status
-        ticket.ts_last_status_change = datetime.now()
+            ticket = self.__find_ticket(ticket_id)
+            self.__set_ticket_statuses([ticket], new_status)
 
-        return ticket
+        return self.backend.hydrate([ticket])[0]
+
+    def __update_ticket_statuses(self, ticket_ids: list[str], new_status: Status) -> dict[str, Any]:
+        """
+        Update the status of several tickets at once.
+
+        Parameters:
+        - ticket_ids (list[str]): IDs of the tickets.
+        - new_status (Status): New status to set for the tickets.
+
+        Returns:
+        dict[str, Any]: The updated tickets by their IDs, and the IDs of the tickets that were not found.
+        """
+        with self.write_lock:
+            if self.successor is not None:
+                return self.successor.__update_ticket_statuses(ticket_ids, new_status)
+
+            self.__sync()
+
+            tickets, not_found_ticket_ids = self.__find_tickets_by_ids(ticket_ids)
+            self.__set_ticket_statuses(list(tickets.values()), new_status)
+
+        return {"tickets": self.__hydrate_tickets(tickets), "not_found": not_found_ticket_ids}
+
+    def __find_tickets_by_ids(self, ticket_ids: list[str]) -> tuple[dict[str, Ticket], list[str]]:
+        """
+        Looks up several tickets by their IDs, ignoring duplicate IDs.
+
+        Parameters:
+        - ticket_ids (list[str]): IDs of the tickets.
+
+        Returns:
+        tuple[dict[str, Ticket], list[str]]: The found tickets by their IDs, and the IDs that were not found.
+        """
+        ticket_ids = list(dict.fromkeys(ticket_ids))
+        tickets = self.backend.get_tickets_by_ids(ticket_ids)
+
+        return tickets, [ticket_id for ticket_id in ticket_ids if ticket_id not in tickets]
+
+    def __hydrate_tickets(self, tickets: dict[str, Ticket]) -> dict[str, Ticket]:
+        """
+        Links tickets to their messages.
+
+        Parameters:
+        - tickets (dict[str, Ticket]): The tickets by their IDs.
+
+        Returns:
+        dict[str, Ticket]: The tickets with their messages by their IDs.
+        """
+        return dict(zip(tickets.keys(), self.backend.hydrate(list(tickets.values()))))
+
+    def __set_ticket_statuses(self, tickets: list[Ticket], new_status: Status):
+        """
+        Sets the status of several tickets as a single change in the backend.
+
+        Parameters:
+        - tickets (list[Ticket]): The tickets to update.
+        - new_status (Status): New status to set for the tickets.
+        """
+        self.backend.set_statuses(tickets, new_status, datetime.now())
+
+        with self.lock:
+            for ticket in tickets:
+                self.serializer.invalidate(ticket.id)
+
+            self.__bump_generation([ticket.id for ticket in tickets])
+
+        self.notify(tickets)
 
     def close_ticket(self, ticket_id: str) -> Ticket:
         """
@@ -141,3 +919,27 @@ class TicketRepository:
         Ticket: The updated ticket with the 'REMOVED' status.
         """
         return self.__update_ticket_status(ticket_id, Status.REMOVED)
+
+    def close_tickets(self, ticket_ids: list[str]) -> dict[str, Any]:
+        """
+        Closes several tickets at once by updating their status to 'CLOSED'.
+
+        Parameters:
+        - ticket_ids (list[str]): The unique identifiers of the tickets.
+
+        Returns:
+        dict[str, Any]: The updated tickets by their IDs, and the IDs of the tickets that were not found.
+        """
+        return self.__update_ticket_statuses(ticket_ids, Status.CLOSED)
+
+    def remove_tickets(self, ticket_ids: list[str]) -> dict[str, Any]:
+        """
+        Removes several tickets at once by updating their status to 'REMOVED'.
+
+        Parameters:
+        - ticket_ids (list[str]): The unique identifiers of the tickets.
+
+        Returns:
+        dict[str, Any]: The updated tickets by their IDs, and the IDs of the tickets that were not found.
+        """
+        return self.__update_ticket_statuses(ticket_ids, Status.REMOVED)
@@ -1,74 +1,379 @@
+import os
 from datetime import datetime
-from typing import Optional, Union
-from fastapi import APIRouter, Query, Depends, status as http_status
-from fastapi.responses import JSONResponse
+from typing import Any, Optional, Union
+from fastapi import APIRouter, Query, Depends, Request, status as http_status
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from ..repositories.ticket_repository import TicketRepository
+from ..repositories.async_ticket_repository import AsyncTicketRepository
+from ..backends.sqlite_ticket_backend import SqliteTicketBackend
+from ..storage.ticket_delta_log import TicketDeltaLog
+from ..events.ticket_event_hub import TicketEventHub
 from ..models.ticket import Ticket
 from ..models.message import Message
+from ..models.ticket_batch import TicketBatch
 from ..models.enums.status import Status
+from ..models.enums.ticket_field import TicketField
+from ..models.enums.compression import Compression
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from ..utils.compression_utils import CompressionUtils
+from ..utils.http_cache_utils import HttpCacheUtils
+from ..exceptions.bad_request_exception import BadRequestException
 
 DEFAULT_PAGE = 0
 DEFAULT_PAGE_SIZE = 20
+DEFAULT_THREAD_MAX_DEPTH = 10
+MAX_THREAD_MAX_DEPTH = 100
+DEFAULT_THREAD_MAX_SIZE = 50
+MAX_THREAD_MAX_SIZE = 1000
+DEFAULT_HISTOGRAM_MAX_GROUPS = 20
+MAX_HISTOGRAM_MAX_GROUPS = 1000
+JSON_MEDIA_TYPE = "application/json"
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+TIMESTAMP_BOUND_DESCRIPTION = (
+    "Inclusive bound of the ticket timestamp, which is in UTC. A bound with a time zone is converted to UTC."
+)
+DATA_FILEPATH = os.environ.get("TICKETS_DATA_FILEPATH", "../data/awesome_tickets.json")
+# An empty path disables the status log, so status changes only last until the app stops
+STATUS_LOG_FILEPATH = os.environ.get("TICKETS_STATUS_LOG_FILEPATH", DATA_FILEPATH + ".wal")
+# Either "memory" to load the JSON file into memory, or "sqlite" to serve the database created by the importer
+BACKEND = os.environ.get("TICKETS_BACKEND", "memory")
+DATABASE_FILEPATH = os.environ.get("TICKETS_DATABASE_FILEPATH", os.path.splitext(DATA_FILEPATH)[0] + ".db")
+# Lazily linking tickets to their messages speeds up the start of the memory backend and keeps the tickets slim
+LAZY_MESSAGES = os.environ.get("TICKETS_LAZY_MESSAGES", "false").lower() in ("1", "true")
+# Filtering and counting run in a pool of threads, and are cancelled after the timeout (0 disables the timeout)
+REQUEST_TIMEOUT = float(os.environ.get("TICKETS_REQUEST_TIMEOUT", AsyncTicketRepository.DEFAULT_TIMEOUT))
+WORKER_THREADS = int(os.environ.get("TICKETS_WORKER_THREADS", AsyncTicketRepository.DEFAULT_MAX_WORKERS))
+# Time in seconds between two checks of the data file for a new export to reload (0 disables the checks)
+RELOAD_INTERVAL = float(os.environ.get("TICKETS_RELOAD_INTERVAL", 0))
+# New tickets and messages appended to the delta log are ingested while running (an empty path disables the log)
+DELTA_FILEPATH = os.environ.get("TICKETS_DELTA_FILEPATH", os.path.splitext(DATA_FILEPATH)[0] + ".delta.jsonl")
+DELTA_INTERVAL = float(os.environ.get("TICKETS_DELTA_INTERVAL", AsyncTicketRepository.DEFAULT_FOLLOW_INTERVAL))
+# Clients of the event stream beyond this number are rejected, and each holds at most this many pending events
+EVENTS_MAX_SUBSCRIBERS = int(os.environ.get("TICKETS_EVENTS_MAX_SUBSCRIBERS", TicketEventHub.DEFAULT_MAX_SUBSCRIBERS))
+EVENTS_QUEUE_SIZE = int(os.environ.get("TICKETS_EVENTS_QUEUE_SIZE", TicketEventHub.DEFAULT_MAX_QUEUE_SIZE))
+# Time in seconds between two heartbeats, which keep idle event streams open through proxies
+EVENTS_HEARTBEAT_INTERVAL = float(
+    os.environ.get("TICKETS_EVENTS_HEARTBEAT_INTERVAL", TicketEventHub.DEFAULT_HEARTBEAT_INTERVAL)
+)
+
+
+def build_ticket_repository() -> TicketRepository:
+    """
+    Builds a generation of the ticket repository from the configured data file or database, and the delta log.
+
+    Returns:
+    TicketRepository: The ticket repository.
+    """
+    repository = TicketRepository(
+        filepath=DATA_FILEPATH,
+        status_log_path=STATUS_LOG_FILEPATH or None,
+        lazy_messages=LAZY_MESSAGES,
+        backend=SqliteTicketBackend(DATABASE_FILEPATH) if BACKEND == "sqlite" else None
+    )
+
+    if DELTA_FILEPATH:
+        repository.ingest_log(TicketDeltaLog(DELTA_FILEPATH))
+
+    return repository
+
+
+def build_cached_json_response(request: Request, body: bytes, version: str, last_modified: datetime) -> Response:
+    """
+    Builds a JSON response that clients can revalidate, compressed if it is large and the client accepts it.
+
+    Parameters:
+    - request (Request): The request.
+    - body (bytes): The serialized JSON.
+    - version (str): The version of the response, see `TicketRepository.get_version`.
+    - last_modified (datetime): The time of the last change of the response's content.
+
+    Returns:
+    Response: The response.
+    """
+    headers = HttpCacheUtils.get_headers(version, last_modified)
+    compression = None
+
+    if len(body) >= CompressionUtils.MIN_RESPONSE_SIZE:
+        compression = CompressionUtils.get_accepted_compression(request.headers.get("Accept-Encoding"))
+
+    if compression is not None:
+        body = b"".join(CompressionUtils.compress([body], compression))
+        headers["Content-Encoding"] = compression.value
+
+    return Response(body, status_code=http_status.HTTP_200_OK, media_type=JSON_MEDIA_TYPE, headers=headers)
+
 
 router = APIRouter()
-ticket_repository = TicketRepository(filepath="../data/awesome_tickets.json")
+ticket_repository = build_ticket_repository()
+async_ticket_repository = AsyncTicketRepository(
+    ticket_repository,
+    max_workers=WORKER_THREADS,
+    timeout=REQUEST_TIMEOUT or None
+)
+ticket_event_hub = TicketEventHub(
+    lambda: async_ticket_repository.repository.get_ticket_counts(),
+    max_queue_size=EVENTS_QUEUE_SIZE,
+    max_subscribers=EVENTS_MAX_SUBSCRIBERS,
+    heartbeat_interval=EVENTS_HEARTBEAT_INTERVAL,
+    # Status changes of other workers are only seen by this process once they are applied
+    poll=(lambda: async_ticket_repository.repository.sync()) if BACKEND == "memory" else None
+)
+# The listeners are handed over to the next generation on reload
+ticket_repository.listeners.append(ticket_event_hub.publish)
 
 
 @router.get(
     "/",
     summary="Get paginated list of tickets with optional filters, including the total ticket count.",
+    description=(
+        "Tickets are paginated by offset (`page`) in their original order by default. "
+        "Passing a `cursor` switches to keyset pagination ordered by timestamp and ID: "
+        "an empty cursor returns the first page, and each page returns the `next_cursor` to pass for the next one. "
+        "Set `with_count` to false to skip counting all matching tickets. "
+        "Pass `fields` to only include these fields of each ticket, e.g. without its `msg`. "
+        "Responses carry an `ETag` and a `Last-Modified` date, which change with any change of the tickets: "
+        "requests passing them in `If-None-Match` or `If-Modified-Since` get 304 Not Modified while they are current."
+    ),
     tags=["Tickets"],
-    response_model=dict[str, Union[int, list[Ticket]]],
+    response_model=dict[str, Union[int, Optional[str], list[Ticket]]],
     response_description="A paginated list of filtered tickets with the total ticket count.",
     responses={
         http_status.HTTP_200_OK: {"description": "Tickets successfully retrieved."},
+        http_status.HTTP_304_NOT_MODIFIED: {"description": "Tickets unchanged since the client's copy."},
+        http_status.HTTP_400_BAD_REQUEST: {"description": "Invalid cursor."},
         http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests, or timed out."},
         http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
     }
 )
 async def get_tickets(
+    request: Request,
     page: int = Query(default=DEFAULT_PAGE, ge=0),
     page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=0),
+    cursor: Optional[str] = None,
+    with_count: bool = True,
     author: Optional[str] = None,
     msg_content: Optional[str] = None,
     status: Optional[list[Status]] = Query(None),
-    timestamp_start: Optional[datetime] = None,
-    timestamp_end: Optional[datetime] = None,
-    repository: TicketRepository = Depends(lambda: ticket_repository)
+    timestamp_start: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    timestamp_end: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    fields: Optional[list[TicketField]] = Query(None),
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
 ):
-    tickets = repository.get_tickets(
-        page,
-        page_size,
-        author=author,
-        msg_content=msg_content,
-        status=status,
-        timestamp_start=timestamp_start,
-        timestamp_end=timestamp_end
-    )
+    # The version is taken before the query, so that a change made in between at worst invalidates the response
+    version, last_modified = repository.get_version()
+
+    if HttpCacheUtils.is_not_modified(request.headers, version, last_modified):
+        return Response(
+            status_code=http_status.HTTP_304_NOT_MODIFIED, headers=HttpCacheUtils.get_headers(version, last_modified)
+        )
+
+    filter_arguments = {
+        "author": author,
+        "msg_content": msg_content,
+        "status": status,
+        "timestamp_start": timestamp_start,
+        "timestamp_end": timestamp_end
+    }
 
-    return JSONResponse(jsonable_encoder(tickets), status_code=http_status.HTTP_200_OK)
+    if cursor is not None:
+        tickets = await repository.get_tickets_by_cursor(
+            cursor or None, page_size, with_count, fields, **filter_arguments
+        )
+    else:
+        tickets = await repository.get_tickets(page, page_size, with_count, fields, **filter_arguments)
+
+    return build_cached_json_response(
+        request, repository.serializer.dump_page(tickets, fields), version, last_modified
+    )
 
 
 @router.get(
     "/counts",
-    summary="Get ticket counts per each status.",
+    summary="Get ticket counts per each status, optionally by author and time window.",
     tags=["Tickets"],
     response_model=dict[Status, int],
     response_description="A dictionary containing each status and their respective ticket counts.",
     responses={
         http_status.HTTP_200_OK: {"description": "Ticket counts successfully retrieved."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests, or timed out."},
         http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
     }
 )
 async def get_ticket_counts(
-    repository: TicketRepository = Depends(lambda: ticket_repository)
+    author: Optional[str] = None,
+    timestamp_start: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    timestamp_end: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
 ):
-    ticket_counts = repository.get_ticket_counts()
+    ticket_counts = await repository.get_ticket_counts(author, timestamp_start, timestamp_end)
     return JSONResponse(ticket_counts, status_code=http_status.HTTP_200_OK)
 
 
+@router.get(
+    "/analytics",
+    summary="Get ticket counts per time bucket and per status, author or channel, optionally within a time window.",
+    description=(
+        "Counts the tickets per `bucket` of their timestamp (hour, day or week starting on Monday), grouped by "
+        "`group_by`. The `buckets` are the starts of all buckets from the first to the last of the time window, or "
+        "of the tickets if the window is open, and each series of the `series` holds the ticket counts of a group per "
+        "bucket. Only the `max_groups` groups with the most tickets are included, and `truncated` tells whether "
+        "others were left out."
+    ),
+    tags=["Tickets"],
+    response_model=dict[str, Any],
+    response_description="The bucket starts and the ticket counts of each group per bucket.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Ticket histogram successfully retrieved."},
+        http_status.HTTP_400_BAD_REQUEST: {"description": "Too many buckets."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests, or timed out."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def get_ticket_histogram(
+    bucket: TimeBucket = TimeBucket.DAY,
+    group_by: TicketGrouping = TicketGrouping.STATUS,
+    timestamp_start: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    timestamp_end: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    max_groups: int = Query(default=DEFAULT_HISTOGRAM_MAX_GROUPS, ge=1, le=MAX_HISTOGRAM_MAX_GROUPS),
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    histogram = await repository.get_ticket_histogram(bucket, group_by, timestamp_start, timestamp_end, max_groups)
+    return JSONResponse(jsonable_encoder(histogram), status_code=http_status.HTTP_200_OK)
+
+
+@router.get(
+    "/events",
+    summary="Stream ticket status changes and ticket counts as server-sent events.",
+    description=(
+        "Sends a `counts` event with the ticket counts per status first, then a `status` event with the ID, status "
+        "and time of the last status change of the tickets whose status changes or that are added, each followed "
+        "by a `counts` event once the changes settle. A `resync` event tells the client to reload the tickets, "
+        "e.g. after a reload of the data file, or after it fell too far behind to be sent the missed changes."
+    ),
+    tags=["Tickets"],
+    response_class=StreamingResponse,
+    response_description="An endless stream of server-sent events.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Event stream opened.", "content": {EVENT_STREAM_MEDIA_TYPE: {}}},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many clients are listening to the events."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def stream_ticket_events(
+    hub: TicketEventHub = Depends(lambda: ticket_event_hub)
+):
+    hub.check_capacity()
+    return StreamingResponse(
+        hub.stream(),
+        status_code=http_status.HTTP_200_OK,
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        # Keep proxies from caching the stream or buffering the events
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get(
+    "/export",
+    summary="Export all tickets matching the filters as newline-delimited JSON.",
+    description=(
+        "Streams every matching ticket in its original order, one JSON object per line, filtered in a single pass "
+        "instead of page by page. Set `with_context_messages` to get one `{\"ticket\", \"context_messages\"}` object "
+        "per line instead. Pass `compression` to compress the stream with gzip, or with zstd where it is available; "
+        "the compression is announced in the `Content-Encoding` header."
+    ),
+    tags=["Tickets"],
+    response_class=StreamingResponse,
+    response_description="The matching tickets as newline-delimited JSON.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Export started.", "content": {NDJSON_MEDIA_TYPE: {}}},
+        http_status.HTTP_400_BAD_REQUEST: {"description": "Compression not available."},
+        http_status.HTTP_404_NOT_FOUND: {"description": "Context message not found."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests, or timed out."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def export_tickets(
+    author: Optional[str] = None,
+    msg_content: Optional[str] = None,
+    status: Optional[list[Status]] = Query(None),
+    timestamp_start: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    timestamp_end: Optional[datetime] = Query(None, description=TIMESTAMP_BOUND_DESCRIPTION),
+    with_context_messages: bool = False,
+    compression: Optional[Compression] = None,
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    chunks = await repository.export_tickets(
+        with_context_messages,
+        compression,
+        author=author,
+        msg_content=msg_content,
+        status=status,
+        timestamp_start=timestamp_start,
+        timestamp_end=timestamp_end
+    )
+    headers = {"Content-Disposition": 'attachment; filename="tickets.ndjson"'}
+
+    if compression is not None:
+        headers["Content-Encoding"] = compression.value
+
+    return StreamingResponse(
+        chunks, status_code=http_status.HTTP_200_OK, media_type=NDJSON_MEDIA_TYPE, headers=headers
+    )
+
+
+@router.get(
+    "/cache/stats",
+    summary="Get the counters of the ticket query cache.",
+    tags=["Tickets"],
+    response_model=dict[str, int],
+    response_description="The size of the query cache and its hit, miss, eviction, invalidation and expiration counts.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Query cache counters successfully retrieved."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def get_query_cache_stats(
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    query_cache_stats = repository.get_query_cache_stats()
+    return JSONResponse(query_cache_stats, status_code=http_status.HTTP_200_OK)
+
+
+@router.post(
+    "/reload",
+    summary="Reload the tickets from the data file without downtime.",
+    description=(
+        "The new tickets are loaded in the background, and swapped in once the status changes made so far have been "
+        "carried over to them. Requests running in the meantime are answered from the current tickets."
+    ),
+    tags=["Tickets"],
+    response_model=dict[str, int],
+    response_description="The number of tickets added, removed and updated by the reload, and the number of tickets "
+                         "whose status was carried over.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Tickets successfully reloaded."},
+        http_status.HTTP_400_BAD_REQUEST: {"description": "Tickets cannot be reloaded by this server."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Data file could not be loaded."}
+    }
+)
+async def reload_tickets(
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    if BACKEND == "sqlite":
+        raise BadRequestException("Only the tickets of the memory backend can be reloaded.")
+
+    ticket_changes = await repository.reload(build_ticket_repository)
+    return JSONResponse(ticket_changes, status_code=http_status.HTTP_200_OK)
+
+
 @router.get(
     "/{ticket_id}",
     summary="Get a ticket by its ID.",
@@ -77,17 +382,26 @@ async def get_ticket_counts(
     response_description="A ticket with the given ID.",
     responses={
         http_status.HTTP_200_OK: {"description": "Ticket successfully retrieved."},
+        http_status.HTTP_304_NOT_MODIFIED: {"description": "Ticket unchanged since the client's copy."},
         http_status.HTTP_404_NOT_FOUND: {"description": "Ticket not found."},
         http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
         http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
     }
 )
 async def get_ticket(
+    request: Request,
     ticket_id: str,
-    repository: TicketRepository = Depends(lambda: ticket_repository)
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
 ):
+    version, last_modified = repository.get_ticket_version(ticket_id)
+
+    if HttpCacheUtils.is_not_modified(request.headers, version, last_modified):
+        return Response(
+            status_code=http_status.HTTP_304_NOT_MODIFIED, headers=HttpCacheUtils.get_headers(version, last_modified)
+        )
+
     ticket = repository.get_ticket(ticket_id)
-    return JSONResponse(jsonable_encoder(ticket), status_code=http_status.HTTP_200_OK)
+    return build_cached_json_response(request, repository.serializer.dump_ticket(ticket), version, last_modified)
 
 
 @router.get(
@@ -98,17 +412,61 @@ async def get_ticket(
     response_description="Context messages associated with the ticket with the given ID.",
     responses={
         http_status.HTTP_200_OK: {"description": "Context messages successfully retrieved."},
+        http_status.HTTP_304_NOT_MODIFIED: {"description": "Ticket unchanged since the client's copy."},
         http_status.HTTP_404_NOT_FOUND: {"description": "Ticket or message not found."},
         http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
         http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
     }
 )
 async def get_ticket_context_messages(
+    request: Request,
     ticket_id: str,
-    repository: TicketRepository = Depends(lambda: ticket_repository)
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
 ):
+    version, last_modified = repository.get_ticket_version(ticket_id)
+
+    if HttpCacheUtils.is_not_modified(request.headers, version, last_modified):
+        return Response(
+            status_code=http_status.HTTP_304_NOT_MODIFIED, headers=HttpCacheUtils.get_headers(version, last_modified)
+        )
+
     ticket_context_messages = repository.get_ticket_context_messages(ticket_id)
-    return JSONResponse(jsonable_encoder(ticket_context_messages), status_code=http_status.HTTP_200_OK)
+    return build_cached_json_response(
+        request, repository.serializer.dump_messages(ticket_context_messages), version, last_modified
+    )
+
+
+@router.get(
+    "/{ticket_id}/thread",
+    summary="Get the thread around the message of a ticket.",
+    description=(
+        "The thread holds the messages linked to the message of the ticket by replies, up to `max_depth` replies "
+        "away, filled up with the messages of the same discussion and then of the same channel closest in time, "
+        "up to `max_size` messages in total. `truncated` tells whether the limits left out messages."
+    ),
+    tags=["Tickets"],
+    response_model=dict[str, Union[bool, list[Message]]],
+    response_description="The messages of the thread ordered by timestamp, and whether the limits left out messages.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Thread successfully retrieved."},
+        http_status.HTTP_404_NOT_FOUND: {"description": "Ticket not found."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests, or timed out."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def get_ticket_thread(
+    ticket_id: str,
+    max_depth: int = Query(default=DEFAULT_THREAD_MAX_DEPTH, ge=0, le=MAX_THREAD_MAX_DEPTH),
+    max_size: int = Query(default=DEFAULT_THREAD_MAX_SIZE, ge=1, le=MAX_THREAD_MAX_SIZE),
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    ticket_thread = await repository.get_ticket_thread(ticket_id, max_depth, max_size)
+    return Response(
+        repository.serializer.dump_page(ticket_thread),
+        status_code=http_status.HTTP_200_OK,
+        media_type=JSON_MEDIA_TYPE
+    )
 
 
 @router.put(
@@ -121,15 +479,20 @@ async def get_ticket_context_messages(
         http_status.HTTP_200_OK: {"description": "Ticket successfully closed."},
         http_status.HTTP_404_NOT_FOUND: {"description": "Ticket not found."},
         http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests."},
         http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
     }
 )
 async def close_ticket(
     ticket_id: str,
-    repository: TicketRepository = Depends(lambda: ticket_repository)
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
 ):
-    ticket = repository.close_ticket(ticket_id)
-    return JSONResponse(jsonable_encoder(ticket), status_code=http_status.HTTP_200_OK)
+    ticket = await repository.close_ticket(ticket_id)
+    return Response(
+        repository.serializer.dump_ticket(ticket),
+        status_code=http_status.HTTP_200_OK,
+        media_type=JSON_MEDIA_TYPE
+    )
 
 
 @router.delete(
@@ -142,12 +505,97 @@ async def close_ticket(
         http_status.HTTP_200_OK: {"description": "Ticket successfully removed."},
         http_status.HTTP_404_NOT_FOUND: {"description": "Ticket not found."},
         http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests."},
         http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
     }
 )
 async def remove_ticket(
     ticket_id: str,
-    repository: TicketRepository = Depends(lambda: ticket_repository)
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    ticket = await repository.remove_ticket(ticket_id)
+    return Response(
+        repository.serializer.dump_ticket(ticket),
+        status_code=http_status.HTTP_200_OK,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+@router.post(
+    "/batch",
+    summary="Get several tickets by their IDs, optionally with their context messages.",
+    tags=["Tickets"],
+    response_model=dict[str, Union[dict[str, Ticket], dict[str, list[Message]], list[str]]],
+    response_description="The tickets by their IDs, their context messages by ticket ID if requested, "
+                         "and the IDs of the tickets that were not found.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Tickets successfully retrieved."},
+        http_status.HTTP_404_NOT_FOUND: {"description": "Context message not found."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests, or timed out."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def get_tickets_by_ids(
+    ticket_batch: TicketBatch,
+    with_context_messages: bool = False,
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
 ):
-    ticket = repository.remove_ticket(ticket_id)
-    return JSONResponse(jsonable_encoder(ticket), status_code=http_status.HTTP_200_OK)
+    tickets = await repository.get_tickets_by_ids(ticket_batch.ticket_ids, with_context_messages)
+    return Response(
+        repository.serializer.dump_page(tickets),
+        status_code=http_status.HTTP_200_OK,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+@router.post(
+    "/batch/close",
+    summary="Close several tickets by their IDs.",
+    tags=["Tickets"],
+    response_model=dict[str, Union[dict[str, Ticket], list[str]]],
+    response_description="The updated tickets by their IDs after setting their status to closed, "
+                         "and the IDs of the tickets that were not found.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Tickets successfully closed."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def close_tickets(
+    ticket_batch: TicketBatch,
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    tickets = await repository.close_tickets(ticket_batch.ticket_ids)
+    return Response(
+        repository.serializer.dump_page(tickets),
+        status_code=http_status.HTTP_200_OK,
+        media_type=JSON_MEDIA_TYPE
+    )
+
+
+@router.post(
+    "/batch/remove",
+    summary="Remove several tickets by their IDs.",
+    tags=["Tickets"],
+    response_model=dict[str, Union[dict[str, Ticket], list[str]]],
+    response_description="The updated tickets by their IDs after setting their status to removed, "
+                         "and the IDs of the tickets that were not found.",
+    responses={
+        http_status.HTTP_200_OK: {"description": "Tickets successfully removed."},
+        http_status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error in request."},
+        http_status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Too many pending requests."},
+        http_status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal Server Error."}
+    }
+)
+async def remove_tickets(
+    ticket_batch: TicketBatch,
+    repository: AsyncTicketRepository = Depends(lambda: async_ticket_repository)
+):
+    tickets = await repository.remove_tickets(ticket_batch.ticket_ids)
+    return Response(
+        repository.serializer.dump_page(tickets),
+        status_code=http_status.HTTP_200_OK,
+        media_type=JSON_MEDIA_TYPE
+    )
@@ -0,0 +1,177 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from pydantic import TypeAdapter
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.ticket_field import TicketField
+from ..metrics.app_metrics import STAGE_DURATION
+
+
+class TicketSerializer:
+
+    DEFAULT_MAX_SIZE = 100000
+
+    TICKET_ADAPTER = TypeAdapter(Ticket)
+    MESSAGE_ADAPTER = TypeAdapter(Message)
+    MESSAGES_ADAPTER = TypeAdapter(list[Message])
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.cache: OrderedDict[str, bytes] = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped by invalidations, so that bytes dumped from a ticket that changed in the meantime are not cached
+        self.ticket_versions: dict[str, int] = {}
+        self.clear_count = 0
+
+    def dump_ticket(self, ticket: Ticket) -> bytes:
+        """
+        Serializes a ticket to JSON with pydantic-core, reusing the bytes of earlier calls until it is invalidated.
+
+        The ticket is serialized outside the lock, so its bytes are only cached if it has not been invalidated in the
+        meantime, as they may hold the state from before the change.
+
+        Parameters:
+        - ticket (Ticket): The ticket to serialize.
+
+        Returns:
+        bytes: The ticket as UTF-8 encoded JSON.
+        """
+        with self.lock:
+            ticket_json = self.cache.get(ticket.id)
+
+            if ticket_json is not None:
+                self.cache.move_to_end(ticket.id)
+                return ticket_json
+
+            version = (self.clear_count, self.ticket_versions.get(ticket.id, 0))
+
+        ticket_json = self.TICKET_ADAPTER.dump_json(ticket)
+
+        with self.lock:
+            if version != (self.clear_count, self.ticket_versions.get(ticket.id, 0)):
+                return ticket_json
+
+            self.cache[ticket.id] = ticket_json
+
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+
+        return ticket_json
+
+    def dump_tickets(self, tickets: Iterable[Ticket]) -> bytes:
+        """
+        Serializes a list of tickets to a JSON array from their cached bytes.
+
+        Parameters:
+        - tickets (Iterable[Ticket]): The tickets to serialize.
+
+        Returns:
+        bytes: The tickets as a UTF-8 encoded JSON array.
+        """
+        return b"[" + b",".join(self.dump_ticket(ticket) for ticket in tickets) + b"]"
+
+    def dump_page(self, page: dict[str, Any], fields: Optional[list[TicketField]] = None) -> bytes:
+        """
+        Serializes a response of tickets, e.g. a page as returned by `TicketRepository.get_tickets`, to JSON.
+
+        Tickets and messages nested in lists and dictionaries are serialized with pydantic-core, tickets from their
+        cached bytes, and any other value with the standard JSON encoder.
+
+        Parameters:
+        - page (dict[str, Any]): The response to serialize.
+        - fields (Optional[list[TicketField]]): The fields to include in each ticket, or None for all fields.
+          Projected tickets are not cached.
+
+        Returns:
+        bytes: The response as a UTF-8 encoded JSON object.
+        """
+        with STAGE_DURATION.time("serialize"):
+            return self.__dump_value(page, None if fields is None else {field.value for field in fields})
+
+    def dump_lines(self, tickets: list[Ticket], context_messages: Optional[list[list[Message]]] = None) -> bytes:
+        """
+        Serializes tickets to newline-delimited JSON, one ticket per line.
+
+        Cached bytes are reused, but tickets are not added to the cache, so that exporting many tickets does not
+        evict the tickets of the pages being served.
+
+        Parameters:
+        - tickets (list[Ticket]): The tickets to serialize.
+        - context_messages (Optional[list[list[Message]]]): The context messages of each ticket, in which case each
+          line is an object with the `ticket` and its `context_messages`.
+
+        Returns:
+        bytes: The tickets as UTF-8 encoded JSON lines, each ending with a newline.
+        """
+        with STAGE_DURATION.time("serialize"):
+            with self.lock:
+                cached_tickets_json = [self.cache.get(ticket.id) for ticket in tickets]
+
+            tickets_json = [
+                self.TICKET_ADAPTER.dump_json(ticket) if ticket_json is None else ticket_json
+                for ticket, ticket_json in zip(tickets, cached_tickets_json)
+            ]
+
+            if context_messages is None:
+                return b"".join(ticket_json + b"\n" for ticket_json in tickets_json)
+
+            return b"".join(
+                b'{"ticket":' + ticket_json + b',"context_messages":' + self.MESSAGES_ADAPTER.dump_json(messages)
+                + b"}\n"
+                for ticket_json, messages in zip(tickets_json, context_messages)
+            )
+
+    def dump_messages(self, messages: list[Message]) -> bytes:
+        """
+        Serializes a list of messages to a JSON array with pydantic-core.
+
+        Parameters:
+        - messages (list[Message]): The messages to serialize.
+
+        Returns:
+        bytes: The messages as a UTF-8 encoded JSON array.
+        """
+        with STAGE_DURATION.time("serialize"):
+            return self.MESSAGES_ADAPTER.dump_json(messages)
+
+    def __dump_value(self, value: Any, fields: Optional[set[str]] = None) -> bytes:
+        if isinstance(value, Ticket):
+            return self.dump_ticket(value) if fields is None else self.TICKET_ADAPTER.dump_json(value, include=fields)
+
+        if isinstance(value, Message):
+            return self.MESSAGE_ADAPTER.dump_json(value)
+
+        if isinstance(value, dict):
+            return b"{" + b",".join(
+                json.dumps(key, ensure_ascii=False).encode() + b":" + self.__dump_value(item, fields)
+                for key, item in value.items()
+            ) + b"}"
+
+        if isinstance(value, (list, tuple)):
+            return b"[" + b",".join(self.__dump_value(item, fields) for item in value) + b"]"
+
+        return json.dumps(value, ensure_ascii=False).encode()
+
+    def invalidate(self, ticket_id: str):
+        """
+        Drops the cached bytes of a ticket, e.g. after its status has changed.
+
+        Parameters:
+        - ticket_id (str): ID of the ticket.
+        """
+        with self.lock:
+            self.cache.pop(ticket_id, None)
+            self.ticket_versions[ticket_id] = self.ticket_versions.get(ticket_id, 0) + 1
+
+    def clear(self):
+        """
+        Drops the cached bytes of all tickets, e.g. after an unknown set of tickets has changed.
+        """
+        with self.lock:
+            self.cache.clear()
+            self.ticket_versions.clear()
+            self.clear_count += 1
@@ -0,0 +1,112 @@
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+
+import uvicorn
+
+from .main import app, GRACEFUL_SHUTDOWN_TIMEOUT
+from .routes.ticket_routes import ticket_repository, ticket_event_hub
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 5001
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class TicketServer(uvicorn.Server):
+
+    def handle_exit(self, sig: int, frame):
+        # Open event streams would otherwise keep the server waiting until the graceful shutdown times out
+        ticket_event_hub.close()
+        super().handle_exit(sig, frame)
+
+
+def serve(host: str, port: int, workers: int):
+    """
+    Serves the app from several worker processes forked from a supervisor that loaded the dataset.
+
+    The dataset is loaded and indexed once in the supervisor process instead of once per worker. The forked workers
+    start out sharing its memory pages copy-on-write, but every page holding an object they read is copied once its
+    reference count changes, so the share shrinks as they serve tickets (see `benchmarks.worker_memory_benchmark`).
+    With the in-memory backend, status changes are published to all workers through a status overlay in shared
+    memory. Workers that exit unexpectedly are replaced.
+
+    Parameters:
+    - host (str): The host to bind to.
+    - port (int): The port to bind to.
+    - workers (int): The number of worker processes.
+    """
+    config = uvicorn.Config(app, host=host, port=port, timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT)
+    ticket_repository.backend.share_with_workers()
+
+    # asyncio only disables Nagle's algorithm on the connections of sockets created with an explicit TCP protocol,
+    # without which responses written in several parts wait for the delayed acknowledgement of the client
+    listening_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listening_socket.bind((host, port))
+    listening_socket.listen(config.backlog)
+
+    # Keep the garbage collector from writing to the pages of loaded objects the workers never read, which would
+    # copy them in every worker on its first full collection
+    gc.freeze()
+
+    worker_pids = set()
+    shutting_down = False
+
+    def spawn_worker():
+        pid = os.fork()
+
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            TicketServer(config).run(sockets=[listening_socket])
+            os._exit(0)
+
+        worker_pids.add(pid)
+
+    def shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+
+        for worker_pid in worker_pids:
+            try:
+                os.kill(worker_pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for _ in range(workers):
+        spawn_worker()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    logger.info("Started %d workers on %s:%d", workers, host, port)
+
+    while worker_pids:
+        pid, _ = os.wait()
+        worker_pids.discard(pid)
+
+        if not shutting_down:
+            logger.warning("Worker %d exited unexpectedly, starting a new one", pid)
+
+            # The kernel releases the locks of the exited worker, so the shared state only stays locked if another
+            # worker is stuck while holding it
+            if not ticket_repository.backend.check_shared_with_workers():
+                logger.error("The state shared with the workers is still locked after worker %d exited", pid)
+
+            spawn_worker()
+
+    listening_socket.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the app with multiple workers sharing one dataset.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers)
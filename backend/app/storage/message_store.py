@@ -0,0 +1,123 @@
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Iterator, Optional
+
+from ..models.author import Author
+from ..models.message import Message
+
+
+class MessageRecord:
+
+    __slots__ = (
+        "id", "channel_id", "parent_channel_id", "community_server_id", "timestamp", "has_attachment",
+        "reference_msg_id", "timestamp_insert", "discussion_id", "content", "msg_url", "author"
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+    def to_message(self) -> Message:
+        """
+        Builds the pydantic message of the record without validating it again.
+
+        Returns:
+        Message: The message with the record's values, sharing the interned author.
+        """
+        return Message.model_construct(**{name: getattr(self, name) for name in self.__slots__})
+
+
+class MessageStore(MutableMapping):
+
+    INTERNED_FIELDS = ("channel_id", "parent_channel_id", "community_server_id", "discussion_id", "msg_url")
+
+    def __init__(self):
+        self.records: dict[str, MessageRecord] = {}
+        self.authors: dict[tuple, Author] = {}
+        self.strings: dict[str, str] = {}
+
+    def __getitem__(self, message_id: str) -> Message:
+        return self.records[message_id].to_message()
+
+    def get_record(self, message_id: str) -> MessageRecord:
+        """
+        Gets the compact record of a message, which has the same attributes as the message without building it.
+
+        Parameters:
+        - message_id (str): ID of the message.
+
+        Returns:
+        MessageRecord: The record of the message.
+
+        Raises:
+        KeyError: If the message is not found.
+        """
+        return self.records[message_id]
+
+    def find_record(self, message_id: str) -> Optional[MessageRecord]:
+        """
+        Gets the compact record of a message if it exists. See `get_record`.
+
+        Parameters:
+        - message_id (str): ID of the message.
+
+        Returns:
+        Optional[MessageRecord]: The record of the message, or None if it is not found.
+        """
+        return self.records.get(message_id)
+
+    def iter_records(self) -> Iterator[MessageRecord]:
+        """
+        Iterates over the compact records of all messages, without building the messages.
+
+        Returns:
+        Iterator[MessageRecord]: The records, in insertion order.
+        """
+        return iter(self.records.values())
+
+    def head(self, count: int) -> "MessageStore":
+        """
+        Copies the first messages of the store, e.g. to keep only the messages loaded from a file. The records and
+        interned values are shared with the copy, so copying takes time proportional to the number of messages only.
+
+        Parameters:
+        - count (int): The number of messages to copy, in insertion order.
+
+        Returns:
+        MessageStore: The new store.
+        """
+        message_store = MessageStore()
+        message_store.records = dict(islice(self.records.items(), count))
+        message_store.authors = dict(self.authors)
+        message_store.strings = dict(self.strings)
+
+        return message_store
+
+    def __setitem__(self, message_id: str, message: Message):
+        # The fields of a model are its instance dictionary, which is copied so that the message is left unchanged
+        values = dict(message.__dict__)
+
+        for name in self.INTERNED_FIELDS:
+            values[name] = self.__intern_string(values[name])
+
+        values["author"] = self.__intern_author(message.author)
+        self.records[message_id] = MessageRecord(**values)
+
+    def __delitem__(self, message_id: str):
+        del self.records[message_id]
+
+    def __contains__(self, message_id: object) -> bool:
+        return message_id in self.records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __intern_string(self, value: Optional[str]) -> Optional[str]:
+        return None if value is None else self.strings.setdefault(value, value)
+
+    def __intern_author(self, author: Author) -> Author:
+        # Authors are interned by value, since the same author may have changed e.g. their nickname over time
+        return self.authors.setdefault(tuple(author.__dict__.values()), author)
@@ -0,0 +1,213 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+from ..models.enums.status import Status
+from ..utils.datetime_utils import DatetimeUtils
+
+logger = logging.getLogger(__name__)
+
+
+class StatusLog:
+
+    DEFAULT_FSYNC_INTERVAL = 0.05
+    DEFAULT_COMPACTION_INTERVAL = 3600.0
+    LOCK_SUFFIX = ".lock"
+
+    def __init__(
+        self,
+        path: str,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        compaction_interval: float = DEFAULT_COMPACTION_INTERVAL
+    ):
+        """
+        Opens an append-only log of ticket status changes, shared by all processes using the same path.
+
+        Appended changes are written to the file right away, so they survive a crash of the process, and are
+        flushed to disk by a background thread at most `fsync_interval` seconds later, in one fsync per batch.
+
+        Parameters:
+        - path (str): The path to the log file.
+        - fsync_interval (float): Maximum delay in seconds before appended changes are flushed to disk.
+        - compaction_interval (float): Minimum delay in seconds between two compactions of the log.
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.compaction_interval = compaction_interval
+        self.lock = threading.Lock()
+        self.pid: Optional[int] = None
+        self.file_descriptor: Optional[int] = None
+        self.lock_file_descriptor: Optional[int] = None
+        self.lock_file_pid: Optional[int] = None
+        self.unsynced = False
+        self.appended_count = 0
+        self.compacted_at = time.monotonic()
+
+    def append(self, changes: list[tuple[str, Status, datetime]]):
+        """
+        Appends status changes to the log in a single write.
+
+        Parameters:
+        - changes (list[tuple[str, Status, datetime]]): The ticket ID, new status and time of each status change.
+        """
+        records = "".join(
+            json.dumps({"id": ticket_id, "status": status.value, "ts": ts_last_status_change.isoformat()}) + "\n"
+            for ticket_id, status, ts_last_status_change in changes
+        ).encode()
+
+        with self.lock, self.__lock_file(fcntl.LOCK_SH):
+            file_descriptor = self.__get_file_descriptor()
+
+            while records:
+                records = records[os.write(file_descriptor, records):]
+
+            self.unsynced = True
+            self.appended_count += len(changes)
+
+    def read(self) -> Iterator[tuple[str, Status, datetime]]:
+        """
+        Reads all status changes from the log, in the order they were appended.
+
+        A torn last record, left by a crash in the middle of a write, is skipped.
+
+        Returns:
+        Iterator[tuple[str, Status, datetime]]: The ticket ID, new status and time of each status change.
+        """
+        try:
+            log_file = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+
+        with log_file:
+            for line in log_file:
+                try:
+                    record = json.loads(line)
+                    yield record["id"], Status(record["status"]), datetime.fromisoformat(record["ts"])
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Skipping malformed record in status log %s: %r", self.path, line)
+
+    def needs_compaction(self) -> bool:
+        """
+        Checks whether changes have been appended and the compaction interval has passed since the last compaction.
+
+        Returns:
+        bool: True if the log should be compacted.
+        """
+        return self.appended_count > 0 and time.monotonic() - self.compacted_at >= self.compaction_interval
+
+    def compact(self):
+        """
+        Rewrites the log with only the latest change of each ticket, bounding its size by the changed tickets.
+
+        Processes append their changes in any order, so the latest change of a ticket is the one with the latest
+        time, the first one appended among equal times, which is the one a replay ends up with. Since every record
+        holds the absolute status of a ticket, replaying the compacted log yields the same state.
+        Appends of all processes are blocked while the log is rewritten, and reopen the new file afterwards.
+        """
+        with self.lock, self.__lock_file(fcntl.LOCK_EX):
+            self.compacted_at = time.monotonic()
+            self.appended_count = 0
+            latest_changes = {}
+
+            for ticket_id, status, ts_last_status_change in self.read():
+                if ticket_id not in latest_changes or DatetimeUtils.is_later(
+                    ts_last_status_change, latest_changes[ticket_id][2]
+                ):
+                    latest_changes[ticket_id] = (ticket_id, status, ts_last_status_change)
+
+            temporary_path = self.path + ".compact"
+
+            with open(temporary_path, "w", encoding="utf-8") as log_file:
+                for ticket_id, status, ts_last_status_change in latest_changes.values():
+                    log_file.write(json.dumps({
+                        "id": ticket_id, "status": status.value, "ts": ts_last_status_change.isoformat()
+                    }) + "\n")
+
+                log_file.flush()
+                os.fsync(log_file.fileno())
+
+            os.replace(temporary_path, self.path)
+            self.__close_file_descriptor()
+
+    def sync(self):
+        """
+        Flushes the appended changes to disk.
+        """
+        with self.lock:
+            if self.unsynced and self.file_descriptor is not None and self.pid == os.getpid():
+                os.fsync(self.file_descriptor)
+                self.unsynced = False
+
+    def close(self):
+        """
+        Flushes the appended changes to disk and closes the log file.
+        """
+        self.sync()
+
+        with self.lock:
+            self.__close_file_descriptor()
+
+    def __get_file_descriptor(self) -> int:
+        # Forked processes need their own descriptor, and the file may have been replaced by a compaction
+        if self.pid != os.getpid() or self.file_descriptor is None or self.__is_replaced():
+            self.__close_file_descriptor()
+            self.file_descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+            # Terminate a torn last record, so that it does not swallow the next one
+            with open(self.path, "rb") as log_file:
+                size = log_file.seek(0, os.SEEK_END)
+
+                if size > 0:
+                    log_file.seek(size - 1)
+
+                    if log_file.read(1) != b"\n":
+                        os.write(self.file_descriptor, b"\n")
+
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                threading.Thread(target=self.__sync_periodically, daemon=True).start()
+
+        return self.file_descriptor
+
+    def __is_replaced(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self.file_descriptor).st_ino
+        except FileNotFoundError:
+            return True
+
+    def __close_file_descriptor(self):
+        if self.file_descriptor is not None and self.pid == os.getpid():
+            if self.unsynced:
+                os.fsync(self.file_descriptor)
+                self.unsynced = False
+
+            os.close(self.file_descriptor)
+
+        self.file_descriptor = None
+
+    def __sync_periodically(self):
+        pid = os.getpid()
+
+        while self.pid == pid:
+            time.sleep(self.fsync_interval)
+            self.sync()
+
+    @contextmanager
+    def __lock_file(self, operation: int):
+        # A descriptor inherited from the parent process would share its locks, so each process opens its own
+        if self.lock_file_pid != os.getpid():
+            self.lock_file_descriptor = os.open(self.path + self.LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+            self.lock_file_pid = os.getpid()
+
+        fcntl.flock(self.lock_file_descriptor, operation)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(self.lock_file_descriptor, fcntl.LOCK_UN)
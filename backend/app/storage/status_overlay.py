@@ -0,0 +1,190 @@
+import fcntl
+import functools
+import mmap
+import os
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from ..models.enums.status import Status
+
+
+class StatusOverlay:
+
+    DEFAULT_LOG_CAPACITY = 4096
+    DEFAULT_LOCK_CHECK_TIMEOUT = 1.0
+    EPOCH = datetime(1970, 1, 1)
+    NO_TIMESTAMP = -(1 << 63)
+    STATUSES = list(Status)
+
+    def __init__(self, statuses: list[Status], log_capacity: int = DEFAULT_LOG_CAPACITY):
+        """
+        Creates an overlay of ticket statuses in anonymous shared memory, which is shared with forked processes.
+
+        Layout: the generation counter, a ring log of the changed ticket positions per generation, the last status
+        change timestamps in microseconds since the epoch, and the status codes of all tickets.
+
+        Parameters:
+        - statuses (list[Status]): The current status of each ticket, by ticket position.
+        - log_capacity (int): Number of changes a process can lag behind before it has to rescan all tickets.
+        """
+        self.size = len(statuses)
+        self.log_capacity = log_capacity
+        self.buffer = mmap.mmap(-1, 8 * (1 + log_capacity + self.size) + self.size)
+        # The processes exclude each other with a record lock on a shared file, which the kernel releases when its
+        # holder exits, so a process dying while writing does not leave the others blocked
+        self.lock_file = tempfile.TemporaryFile()
+        # Record locks are held per process, so the threads of a process also take a lock of their own
+        self.lock = threading.Lock()
+        os.register_at_fork(after_in_child=functools.partial(self.__reset_lock_after_fork, weakref.ref(self)))
+
+        view = memoryview(self.buffer)
+        log_end = 8 * (1 + log_capacity)
+        timestamps_end = log_end + 8 * self.size
+
+        self.header = view[:8].cast("q")
+        self.log = view[8:log_end].cast("q")
+        self.timestamps = view[log_end:timestamps_end].cast("q")
+        self.statuses = view[timestamps_end:]
+
+        for position, status in enumerate(statuses):
+            self.statuses[position] = self.STATUSES.index(status)
+            self.timestamps[position] = self.NO_TIMESTAMP
+
+    @property
+    def generation(self) -> int:
+        return self.header[0]
+
+    def write(self, position: int, status: Status, ts_last_status_change: datetime) -> int:
+        """
+        Records a status change of a ticket and publishes it to all processes.
+
+        Parameters:
+        - position (int): Position of the ticket.
+        - status (Status): New status of the ticket.
+        - ts_last_status_change (datetime): Time of the status change, as a naive datetime.
+
+        Returns:
+        int: The generation of the change.
+        """
+        return self.write_many([(position, status, ts_last_status_change)])
+
+    def write_many(self, changes: list[tuple[int, Status, datetime]]) -> int:
+        """
+        Records the status changes of several tickets and publishes them to all processes at once.
+
+        Parameters:
+        - changes (list[tuple[int, Status, datetime]]): The position, new status and time of the status change
+          (as a naive datetime) of each ticket.
+
+        Returns:
+        int: The generation of the last change.
+        """
+        with self.__lock():
+            generation = self.header[0]
+
+            for position, status, ts_last_status_change in changes:
+                generation += 1
+
+                self.statuses[position] = self.STATUSES.index(status)
+                self.timestamps[position] = (ts_last_status_change - self.EPOCH) // timedelta(microseconds=1)
+                self.log[generation % self.log_capacity] = position
+
+            # The generation is published last, so readers never see it before the changes themselves
+            self.header[0] = generation
+
+        return generation
+
+    def read(self, position: int) -> tuple[Status, Optional[datetime]]:
+        """
+        Reads the status of a ticket.
+
+        Parameters:
+        - position (int): Position of the ticket.
+
+        Returns:
+        tuple[Status, Optional[datetime]]: The status of the ticket and the time of its last change through the
+        overlay, if any.
+        """
+        status = self.STATUSES[self.statuses[position]]
+        timestamp = self.timestamps[position]
+
+        if timestamp == self.NO_TIMESTAMP:
+            return status, None
+
+        return status, self.EPOCH + timedelta(microseconds=timestamp)
+
+    def read_changes(self, since_generation: int) -> tuple[int, Optional[list[int]]]:
+        """
+        Gets the positions of the tickets changed after a generation.
+
+        Parameters:
+        - since_generation (int): The last generation the caller has applied.
+
+        Returns:
+        tuple[int, Optional[list[int]]]: The current generation and the changed positions, or None instead of the
+        positions if the changes have already been overwritten in the log and all tickets have to be rescanned.
+        """
+        if self.header[0] == since_generation:
+            return since_generation, []
+
+        with self.__lock():
+            generation = self.header[0]
+
+            if generation - since_generation > self.log_capacity:
+                return generation, None
+
+            positions = [
+                self.log[change_generation % self.log_capacity]
+                for change_generation in range(since_generation + 1, generation + 1)
+            ]
+
+        return generation, list(dict.fromkeys(positions))
+
+    def check_lock(self, timeout: float = DEFAULT_LOCK_CHECK_TIMEOUT) -> bool:
+        """
+        Checks that no process holds the lock of the overlay for long, e.g. after a process exited unexpectedly.
+
+        Parameters:
+        - timeout (float): Time in seconds to wait for the lock.
+
+        Returns:
+        bool: True if the lock could be taken within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+
+        with self.lock:
+            while True:
+                try:
+                    fcntl.lockf(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        return False
+
+                    time.sleep(0.01)
+                    continue
+
+                fcntl.lockf(self.lock_file, fcntl.LOCK_UN)
+                return True
+
+    @contextmanager
+    def __lock(self) -> Iterator[None]:
+        with self.lock:
+            fcntl.lockf(self.lock_file, fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def __reset_lock_after_fork(overlay_reference: weakref.ref):
+        # A thread of the parent process may have held the lock while forking, and it is never released in the child
+        overlay = overlay_reference()
+
+        if overlay is not None:
+            overlay.lock = threading.Lock()
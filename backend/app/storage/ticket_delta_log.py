@@ -0,0 +1,64 @@
+import logging
+import os
+from typing import Iterator, Optional
+
+from pydantic import ValidationError
+
+from ..models.ticket_delta import TicketDelta
+
+logger = logging.getLogger(__name__)
+
+
+class TicketDeltaLog:
+
+    def __init__(self, path: str):
+        """
+        Follows a log of new tickets and messages, which another process appends to as they arrive.
+
+        Each line of the log is a JSON object with the new "messages" and "tickets", in the same format as the data
+        file. Lines are read once they are complete, so a line that is still being written is read on a later call.
+
+        Parameters:
+        - path (str): The path to the log file.
+        """
+        self.path = path
+        self.offset = 0
+        self.inode: Optional[int] = None
+
+    def read(self) -> Iterator[TicketDelta]:
+        """
+        Reads the lines appended to the log since the last call, starting over if the log has been replaced.
+
+        Malformed lines are logged and skipped.
+
+        Returns:
+        Iterator[TicketDelta]: The new tickets and messages of each line, in the order they were appended.
+        """
+        try:
+            log_file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+
+        with log_file:
+            log_stat = os.fstat(log_file.fileno())
+
+            # A replaced or truncated log is read from its start
+            if log_stat.st_ino != self.inode or log_stat.st_size < self.offset:
+                self.inode = log_stat.st_ino
+                self.offset = 0
+
+            log_file.seek(self.offset)
+
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    break
+
+                self.offset += len(line)
+
+                if not line.strip():
+                    continue
+
+                try:
+                    yield TicketDelta.model_validate_json(line)
+                except ValidationError:
+                    logger.warning("Skipping malformed record in delta log %s: %r", self.path, line)
@@ -0,0 +1,100 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from ..exceptions.service_unavailable_exception import ServiceUnavailableException
+
+
+class CancellationToken:
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Signals a running operation to stop, either on request or once its deadline has passed.
+
+        Parameters:
+        - timeout (Optional[float]): Time in seconds after which the operation is cancelled, or None for no deadline.
+        """
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+
+class CancellationUtils:
+
+    T = TypeVar("T")
+
+    CHECK_INTERVAL = 1024
+    TOKEN: ContextVar[Optional[CancellationToken]] = ContextVar("cancellation_token", default=None)
+
+    @staticmethod
+    def run(token: CancellationToken, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs a function with a cancellation token, which the long running loops it calls check periodically.
+
+        Parameters:
+        - token (CancellationToken): The token of the operation.
+        - function (Callable[..., T]): The function to run.
+        - *args, **kwargs: The arguments of the function.
+
+        Returns:
+        T: The result of the function.
+        """
+        reset_token = CancellationUtils.TOKEN.set(token)
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            CancellationUtils.TOKEN.reset(reset_token)
+
+    @staticmethod
+    def is_cancelled() -> bool:
+        """
+        Checks whether the current operation has been cancelled.
+
+        Returns:
+        bool: True if the token of the current operation is cancelled, False if it is not or there is none.
+        """
+        token = CancellationUtils.TOKEN.get()
+
+        return token is not None and token.is_cancelled()
+
+    @staticmethod
+    def check():
+        """
+        Stops the current operation if it has been cancelled.
+
+        Raises:
+        ServiceUnavailableException: If the current operation has been cancelled.
+        """
+        if CancellationUtils.is_cancelled():
+            raise ServiceUnavailableException("The request was cancelled or timed out.")
+
+    @staticmethod
+    def iter_checked(items: Iterable[T], interval: int = CHECK_INTERVAL) -> Iterator[T]:
+        """
+        Iterates over items, checking every few items whether the current operation has been cancelled.
+
+        Parameters:
+        - items (Iterable[T]): The items.
+        - interval (int): Number of items between two checks.
+
+        Returns:
+        Iterator[T]: The items.
+
+        Raises:
+        ServiceUnavailableException: If the current operation has been cancelled.
+        """
+        if CancellationUtils.TOKEN.get() is None:
+            yield from items
+            return
+
+        for index, item in enumerate(items):
+            if index % interval == 0:
+                CancellationUtils.check()
+
+            yield item
@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from ..exceptions.bad_request_exception import BadRequestException
+
+
+class CursorUtils:
+
+    @staticmethod
+    def encode_cursor(timestamp: datetime, identifier: str) -> str:
+        """
+        Encodes a (timestamp, ID) key into an opaque cursor.
+
+        Parameters:
+        - timestamp (datetime): Timestamp of the last item of a page.
+        - identifier (str): ID of the last item of a page.
+
+        Returns:
+        str: A URL-safe cursor pointing after the given key.
+        """
+        key = json.dumps([timestamp.isoformat(), identifier], separators=(",", ":"))
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, str]:
+        """
+        Decodes an opaque cursor into its (timestamp, ID) key.
+
+        Parameters:
+        - cursor (str): A cursor returned by `encode_cursor`.
+
+        Returns:
+        tuple[datetime, str]: The timestamp and ID of the key.
+
+        Raises:
+        BadRequestException: If the cursor is malformed.
+        """
+        try:
+            timestamp, identifier = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return datetime.fromisoformat(timestamp), str(identifier)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise BadRequestException(f"Invalid cursor {cursor}.")
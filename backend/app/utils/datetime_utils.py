@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class DatetimeUtils:
+
+    @staticmethod
+    def to_utc(timestamp: Optional[datetime]) -> Optional[datetime]:
+        """
+        Converts a timestamp with a time zone to UTC without a time zone, which is how the tickets store their
+        timestamps. Timestamps with and without a time zone can then be compared with each other.
+
+        Parameters:
+        - timestamp (Optional[datetime]): The timestamp, either with a time zone or in UTC.
+
+        Returns:
+        Optional[datetime]: The timestamp in UTC without a time zone, or None if no timestamp is given.
+        """
+        if timestamp is None or timestamp.tzinfo is None:
+            return timestamp
+
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+    @staticmethod
+    def is_later(timestamp: Optional[datetime], other_timestamp: Optional[datetime]) -> bool:
+        """
+        Checks whether a timestamp is later than another one, where a missing timestamp is earlier than any other.
+
+        Parameters:
+        - timestamp (Optional[datetime]): The timestamp.
+        - other_timestamp (Optional[datetime]): The timestamp to compare it to.
+
+        Returns:
+        bool: True if the timestamp is given and later than the other timestamp.
+        """
+        if timestamp is None:
+            return False
+
+        return other_timestamp is None or (
+            DatetimeUtils.to_utc(timestamp) > DatetimeUtils.to_utc(other_timestamp)
+        )
@@ -0,0 +1,83 @@
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+class HttpCacheUtils:
+
+    @staticmethod
+    def get_etag(version: str) -> str:
+        """
+        Gets the entity tag of a version of a response.
+
+        Parameters:
+        - version (str): The version, e.g. of the tickets the response was built from.
+
+        Returns:
+        str: A weak entity tag, as the same content may be sent compressed or not.
+        """
+        return f'W/"{version}"'
+
+    @staticmethod
+    def get_headers(version: str, last_modified: datetime) -> dict[str, str]:
+        """
+        Gets the headers that let clients and proxies revalidate their copy of a response instead of downloading it
+        again.
+
+        Parameters:
+        - version (str): The version of the response.
+        - last_modified (datetime): The time of the last change of the response's content.
+
+        Returns:
+        dict[str, str]: The validators of the response, and its caching directives.
+        """
+        return {
+            "ETag": HttpCacheUtils.get_etag(version),
+            "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+            # The tickets change at any time, so a copy is only reused once the server confirms it is up to date
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding"
+        }
+
+    @staticmethod
+    def is_not_modified(request_headers: Mapping[str, str], version: str, last_modified: datetime) -> bool:
+        """
+        Evaluates the conditions of a GET request against the current version of the response.
+
+        `If-None-Match` takes precedence over `If-Modified-Since`, as entity tags change with every change while
+        dates only have a resolution of one second.
+
+        Parameters:
+        - request_headers (Mapping[str, str]): The headers of the request, with case-insensitive names.
+        - version (str): The current version of the response.
+        - last_modified (datetime): The time of the last change of the response's content.
+
+        Returns:
+        bool: True if the client's copy is up to date, and it is to be answered with 304 Not Modified.
+        """
+        if_none_match = request_headers.get("If-None-Match")
+
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+
+            # Entity tags are compared weakly, i.e. regardless of their W/ prefix
+            entity_tags = {entity_tag.strip().removeprefix("W/") for entity_tag in if_none_match.split(",")}
+
+            return HttpCacheUtils.get_etag(version).removeprefix("W/") in entity_tags
+
+        if_modified_since = request_headers.get("If-Modified-Since")
+
+        if if_modified_since is None:
+            return False
+
+        try:
+            modified_since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            # Invalid dates are ignored
+            return False
+
+        if modified_since.tzinfo is None:
+            modified_since = modified_since.replace(tzinfo=timezone.utc)
+
+        return last_modified.replace(microsecond=0) <= modified_since
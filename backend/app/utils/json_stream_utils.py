@@ -0,0 +1,288 @@
+import json
+import re
+from typing import Any, Callable, Iterator, Optional, TextIO, TypeVar
+
+
+class JsonStreamUtils:
+
+    T = TypeVar("T")
+
+    CHUNK_SIZE = 1 << 20
+
+    @staticmethod
+    def iter_array_items(
+        filepath: str,
+        array_keys: set[str],
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[tuple[str, Any]]:
+        """
+        Streams the items of the given top-level arrays of a JSON object file one at a time.
+
+        Only a bounded window of the raw text is kept in memory, so the whole document is never parsed at once.
+        Values under other top-level keys are decoded and discarded.
+
+        Parameters:
+        - filepath (str): The path to the JSON file.
+        - array_keys (set[str]): Top-level keys whose array items are streamed.
+        - chunk_size (int): Number of characters read from the file at a time.
+
+        Returns:
+        Iterator[tuple[str, Any]]: Pairs of the top-level key and the decoded array item, in file order.
+
+        Raises:
+        KeyError: If one of the given keys is missing from the JSON object.
+        ValueError: If the file is not a JSON object or a streamed key does not hold an array.
+        """
+        return JsonStreamUtils.__iter_arrays(filepath, array_keys, chunk_size, _JsonStreamReader.iter_items)
+
+    @staticmethod
+    def iter_array_chunks(
+        filepath: str,
+        array_keys: set[str],
+        min_chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Streams the raw text of the items of the given top-level arrays of a JSON object file, a few items at a time,
+        without decoding most of them, so that the items are decoded a chunk at a time.
+
+        Parameters:
+        - filepath (str): The path to the JSON file.
+        - array_keys (set[str]): Top-level keys whose array items are streamed.
+        - min_chunk_size (int): Number of characters of items after which a chunk ends at the next item.
+
+        Returns:
+        Iterator[tuple[str, str]]: Pairs of the top-level key and the comma-separated text of consecutive array items,
+        which decodes as a JSON array once enclosed in brackets, in file order.
+
+        Raises:
+        KeyError: If one of the given keys is missing from the JSON object.
+        ValueError: If the file is not a JSON object or a streamed key does not hold an array.
+        """
+        return JsonStreamUtils.__iter_arrays(
+            filepath, array_keys, min_chunk_size, lambda reader: reader.iter_item_chunks(min_chunk_size)
+        )
+
+    @staticmethod
+    def __iter_arrays(
+        filepath: str,
+        array_keys: set[str],
+        chunk_size: int,
+        read_array: Callable[["_JsonStreamReader"], Iterator[T]]
+    ) -> Iterator[tuple[str, T]]:
+        """
+        Streams the given top-level arrays of a JSON object file, reading each array with the given function once
+        its opening bracket is consumed.
+        """
+        found_keys = set()
+
+        with open(filepath, encoding="utf-8") as json_file:
+            reader = _JsonStreamReader(json_file, chunk_size)
+            reader.expect("{")
+
+            while reader.peek() != "}":
+                key = reader.decode()
+                reader.expect(":")
+
+                if key in array_keys:
+                    found_keys.add(key)
+                    reader.expect("[")
+
+                    for value in read_array(reader):
+                        yield key, value
+                else:
+                    reader.decode()
+
+                if reader.expect(",", "}") == "}":
+                    break
+
+        missing_keys = array_keys - found_keys
+
+        if missing_keys:
+            raise KeyError(min(missing_keys))
+
+
+class _JsonStreamReader:
+
+    WHITESPACE = " \t\n\r"
+    # The characters continuing a number, which never follow any other value
+    NUMBER_CHARACTERS = "0123456789.eE+-"
+    # Two objects of an array, up to the first character of the key of the second one. The quote cannot close a
+    # string, as a closing quote is never followed by such a character, so a match is never within a string
+    OBJECT_BOUNDARY = re.compile(r'(\})[ \t\n\r]*,[ \t\n\r]*(\{)[ \t\n\r]*"[^,:}\] \t\n\r]')
+    # The bytes other than brackets and quotes, which do not tell where values start and end
+    NON_STRUCTURAL_BYTES = bytes(byte for byte in range(256) if byte not in b'{}[]"')
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def peek(self) -> str:
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in self.WHITESPACE:
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.__read(self.chunk_size):
+                raise ValueError("Unexpected end of JSON input.")
+
+    def expect(self, *characters: str) -> str:
+        character = self.peek()
+
+        if character not in characters:
+            raise ValueError(f"Expected one of {characters} at offset {self.position}, found {character!r}.")
+
+        self.position += 1
+        return character
+
+    def iter_items(self) -> Iterator[Any]:
+        """
+        Decodes the items of an array, after its opening bracket, up to its closing bracket.
+        """
+        if self.peek() == "]":
+            self.expect("]")
+            return
+
+        while True:
+            yield self.decode()
+
+            if self.expect(",", "]") == "]":
+                return
+
+    def iter_item_chunks(self, min_chunk_size: int) -> Iterator[str]:
+        """
+        Reads the raw text of the items of an array in chunks, after its opening bracket, up to its closing bracket.
+
+        A chunk usually ends at the first boundary between two objects after the minimum size, found without decoding
+        the items. The text up to the boundary is checked to hold whole items of the array, by matching its brackets
+        once its strings are removed. Where that fails, e.g. at the end of the array or for items other than objects,
+        the items are decoded one at a time instead.
+        """
+        if self.peek() == "]":
+            self.expect("]")
+            return
+
+        while True:
+            chunk = self.__read_item_chunk(min_chunk_size)
+
+            if chunk is not None:
+                yield chunk
+                continue
+
+            texts = []
+            size = 0
+
+            while size < min_chunk_size:
+                texts.append(self.decode_text())
+                size += len(texts[-1])
+
+                if self.expect(",", "]") == "]":
+                    yield ",".join(texts)
+                    return
+
+            yield ",".join(texts)
+
+    def __read_item_chunk(self, min_chunk_size: int) -> Optional[str]:
+        """
+        Reads the text of the items up to the first boundary between two objects after the minimum size. The boundary
+        is only searched for up to twice the minimum size, so that an array without any is not read all at once.
+
+        Returns:
+        Optional[str]: The text of the items, or None if no boundary is found or the text holds more than items.
+        """
+        self.peek()
+
+        while len(self.buffer) - self.position < 2 * min_chunk_size:
+            if not self.__read(max(self.chunk_size, 2 * min_chunk_size - len(self.buffer) + self.position)):
+                break
+
+        match = self.OBJECT_BOUNDARY.search(
+            self.buffer, self.position + min_chunk_size, self.position + 2 * min_chunk_size
+        )
+
+        if match is None:
+            return None
+
+        text = self.buffer[self.position:match.end(1)]
+
+        if not self.__has_whole_values(text):
+            return None
+
+        self.position = match.start(2)
+        return text
+
+    def __has_whole_values(self, text: str) -> bool:
+        """
+        Checks that a text starting at a value contains whole values, by removing its strings and then its containers
+        from the innermost, which leaves brackets behind if the text leaves its container.
+        """
+        if "\\" in text:
+            # Backslashes are only found within strings: without the escaped backslashes and quotes, the remaining
+            # quotes start and end strings
+            text = text.replace("\\\\", "").replace('\\"', "")
+
+        structure = text.encode().translate(None, self.NON_STRUCTURAL_BYTES)
+        # Most strings contain no brackets and are left empty, so removing empty strings leaves quotes behind only if
+        # some strings contain brackets
+        brackets = structure.replace(b'""', b"")
+
+        if b'"' in brackets:
+            brackets = b"".join(structure.split(b'"')[::2])
+
+        while True:
+            remaining = brackets.replace(b"{}", b"").replace(b"[]", b"")
+
+            if len(remaining) == len(brackets):
+                return not remaining
+
+            brackets = remaining
+
+    def decode(self) -> Any:
+        return self.__decode()[0]
+
+    def decode_text(self) -> str:
+        """
+        Decodes the next value and returns its raw text.
+        """
+        return self.__decode(with_text=True)[1]
+
+    def __decode(self, with_text: bool = False) -> tuple[Any, Optional[str]]:
+        self.peek()
+        read_size = self.chunk_size
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+
+                # A value touching the end of the buffer (e.g. a number) may continue in the next chunk, as may a
+                # number cut before its fraction or exponent
+                if (end < len(self.buffer) and self.buffer[end] not in self.NUMBER_CHARACTERS) or self.eof:
+                    text = self.buffer[self.position:end] if with_text else None
+                    self.position = end
+                    return value, text
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+
+            # Grow the read size so that values larger than a chunk are not re-decoded once per chunk
+            self.__read(read_size)
+            read_size *= 2
+
+    def __read(self, size: int) -> bool:
+        if self.eof:
+            return False
+
+        # Drop the consumed prefix before appending, which bounds the buffer to the current value
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+
+        chunk = self.file.read(size)
+        self.buffer += chunk
+        self.eof = len(chunk) < size
+
+        return bool(chunk)
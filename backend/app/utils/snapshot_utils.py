@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotUtils:
+
+    T = TypeVar("T")
+
+    FORMAT_VERSION = 2
+    SNAPSHOT_SUFFIX = ".snapshot"
+    HASH_CHUNK_SIZE = 1 << 20
+
+    @staticmethod
+    def load_or_build(filepath: str, build: Callable[[], T], snapshot_path: Optional[str] = None) -> T:
+        """
+        Loads the data compiled from a source file from its snapshot, or builds it and writes a new snapshot.
+
+        A snapshot is reused as is if the size and modification time of the source file match. If only the
+        modification time differs, the snapshot is still reused when the content hash matches, and rewritten with
+        the new modification time. Otherwise, the data is rebuilt from the source file.
+
+        Parameters:
+        - filepath (str): The path to the source file.
+        - build (Callable[[], T]): Builds the data from the source file, e.g. by parsing and validating it.
+        - snapshot_path (Optional[str]): The path to the snapshot file, next to the source file by default.
+
+        Returns:
+        T: The data, either loaded from the snapshot or freshly built.
+        """
+        snapshot_path = snapshot_path or filepath + SnapshotUtils.SNAPSHOT_SUFFIX
+        source_stat = os.stat(filepath)
+        source_key = {"version": SnapshotUtils.FORMAT_VERSION, "size": source_stat.st_size}
+
+        header = SnapshotUtils.__read_header(snapshot_path)
+
+        if header is not None and all(header.get(key) == value for key, value in source_key.items()):
+            try:
+                if header["mtime_ns"] == source_stat.st_mtime_ns:
+                    return SnapshotUtils.__read_payload(snapshot_path)
+
+                source_hash = SnapshotUtils.get_file_hash(filepath)
+
+                if header["sha256"] == source_hash:
+                    data = SnapshotUtils.__read_payload(snapshot_path)
+                    SnapshotUtils.write(snapshot_path, data, {
+                        **source_key, "mtime_ns": source_stat.st_mtime_ns, "sha256": source_hash
+                    })
+                    return data
+            except Exception:
+                # A truncated or otherwise corrupted snapshot is replaced by a fresh one
+                logger.warning("Ignoring unreadable snapshot %s", snapshot_path, exc_info=True)
+
+        logger.info("Building snapshot %s from %s", snapshot_path, filepath)
+
+        data = build()
+        SnapshotUtils.write(snapshot_path, data, {
+            **source_key, "mtime_ns": source_stat.st_mtime_ns, "sha256": SnapshotUtils.get_file_hash(filepath)
+        })
+
+        return data
+
+    @staticmethod
+    def rewrite(filepath: str, data: Any, snapshot_path: Optional[str] = None) -> bool:
+        """
+        Replaces the data of an up-to-date snapshot, e.g. to compact changes made since it was built into it.
+
+        Parameters:
+        - filepath (str): The path to the source file.
+        - data (Any): The data to store.
+        - snapshot_path (Optional[str]): The path to the snapshot file, next to the source file by default.
+
+        Returns:
+        bool: True if the snapshot was rewritten, False if it is missing or the source file has changed since.
+        """
+        snapshot_path = snapshot_path or filepath + SnapshotUtils.SNAPSHOT_SUFFIX
+        source_stat = os.stat(filepath)
+        header = SnapshotUtils.__read_header(snapshot_path)
+
+        if header is None or header.get("version") != SnapshotUtils.FORMAT_VERSION or (
+            header.get("size"), header.get("mtime_ns")
+        ) != (source_stat.st_size, source_stat.st_mtime_ns):
+            return False
+
+        SnapshotUtils.write(snapshot_path, data, header)
+        return True
+
+    @staticmethod
+    def write(snapshot_path: str, data: Any, header: dict[str, Any]):
+        """
+        Atomically writes a snapshot, so that concurrent readers never see a partially written file.
+
+        Failing to write the snapshot is not fatal: it is logged, and the next start builds the data again.
+
+        Parameters:
+        - snapshot_path (str): The path to the snapshot file.
+        - data (Any): The data to store.
+        - header (dict[str, Any]): The header identifying the source file the data was built from.
+        """
+        try:
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(snapshot_path)), suffix=SnapshotUtils.SNAPSHOT_SUFFIX
+            )
+
+            try:
+                with os.fdopen(file_descriptor, "wb") as snapshot_file:
+                    pickle.dump(header, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(data, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+                os.replace(temporary_path, snapshot_path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+        except OSError:
+            logger.warning("Could not write snapshot %s", snapshot_path, exc_info=True)
+
+    @staticmethod
+    def get_file_hash(filepath: str) -> str:
+        """
+        Computes the SHA-256 hash of a file without reading it into memory at once.
+
+        Parameters:
+        - filepath (str): The path to the file.
+
+        Returns:
+        str: The hexadecimal SHA-256 digest of the file content.
+        """
+        file_hash = hashlib.sha256()
+
+        with open(filepath, "rb") as file:
+            while chunk := file.read(SnapshotUtils.HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def __read_header(snapshot_path: str) -> Optional[dict[str, Any]]:
+        try:
+            with open(snapshot_path, "rb") as snapshot_file:
+                header = pickle.load(snapshot_file)
+                return header if isinstance(header, dict) else None
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Ignoring unreadable snapshot %s", snapshot_path, exc_info=True)
+            return None
+
+    @staticmethod
+    def __read_payload(snapshot_path: str) -> Any:
+        with open(snapshot_path, "rb") as snapshot_file:
+            pickle.load(snapshot_file)
+            return pickle.load(snapshot_file)
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..models.ticket import Ticket
+from ..models.message import Message
+from ..models.enums.time_bucket import TimeBucket
+from ..models.enums.ticket_grouping import TicketGrouping
+from .datetime_utils import DatetimeUtils
+
+
+class TimeBucketUtils:
+
+    EPOCH = datetime(1970, 1, 1)
+    BUCKET_HOURS = {TimeBucket.HOUR: 1, TimeBucket.DAY: 24, TimeBucket.WEEK: 7 * 24}
+    # Weeks start on Monday, three days before the epoch, which was a Thursday
+    BUCKET_OFFSET_HOURS = {TimeBucket.HOUR: 0, TimeBucket.DAY: 0, TimeBucket.WEEK: 3 * 24}
+
+    @staticmethod
+    def get_hour(timestamp: datetime) -> int:
+        """
+        Numbers the hour of a timestamp in UTC.
+
+        Parameters:
+        - timestamp (datetime): The timestamp.
+
+        Returns:
+        int: The number of whole hours since the epoch.
+        """
+        return (DatetimeUtils.to_utc(timestamp) - TimeBucketUtils.EPOCH) // timedelta(hours=1)
+
+    @staticmethod
+    def get_hour_start(hour: int) -> datetime:
+        return TimeBucketUtils.EPOCH + timedelta(hours=hour)
+
+    @staticmethod
+    def get_bucket(hour: int, bucket: TimeBucket) -> int:
+        """
+        Numbers the bucket an hour falls into.
+
+        Parameters:
+        - hour (int): The number of the hour, as returned by `get_hour`.
+        - bucket (TimeBucket): The size of the buckets.
+
+        Returns:
+        int: The number of the bucket since the epoch.
+        """
+        return (hour + TimeBucketUtils.BUCKET_OFFSET_HOURS[bucket]) // TimeBucketUtils.BUCKET_HOURS[bucket]
+
+    @staticmethod
+    def get_bucket_start(bucket_number: int, bucket: TimeBucket) -> datetime:
+        """
+        Gets the start of a bucket.
+
+        Parameters:
+        - bucket_number (int): The number of the bucket, as returned by `get_bucket`.
+        - bucket (TimeBucket): The size of the buckets.
+
+        Returns:
+        datetime: The start of the bucket.
+        """
+        return TimeBucketUtils.get_hour_start(
+            bucket_number * TimeBucketUtils.BUCKET_HOURS[bucket] - TimeBucketUtils.BUCKET_OFFSET_HOURS[bucket]
+        )
+
+    @staticmethod
+    def get_group(ticket: Ticket, message: Optional[Message], grouping: TicketGrouping) -> Optional[str]:
+        """
+        Gets the group of a ticket.
+
+        Parameters:
+        - ticket (Ticket): The ticket.
+        - message (Optional[Message]): The message of the ticket, or its record.
+        - grouping (TicketGrouping): What to group the tickets by.
+
+        Returns:
+        Optional[str]: The status, author name or channel ID of the ticket, or None if its message is missing.
+        """
+        if grouping == TicketGrouping.STATUS:
+            return ticket.status.value
+
+        if message is None:
+            return None
+
+        return message.author.name if grouping == TicketGrouping.AUTHOR else message.channel_id
@@ -0,0 +1,131 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+from typing import Any, Optional
+
+RESULTS_DIRECTORY = "benchmarks/results"
+
+
+def get_commit() -> str:
+    """
+    Gets the short hash of the checked out commit, marked as dirty if the working tree has changes.
+
+    Returns:
+    str: The commit, or "unknown" outside of a git repository.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return f"{commit}-dirty" if changes else commit
+
+
+def flatten_results(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """
+    Flattens nested results to metrics named by their path, e.g. `get_tickets.author.median_ms`.
+
+    Parameters:
+    - results (dict[str, Any]): The nested results.
+    - prefix (str): The path of the results.
+
+    Returns:
+    dict[str, float]: The numeric metrics by their path.
+    """
+    metrics = {}
+
+    for key, value in results.items():
+        if isinstance(value, dict):
+            metrics.update(flatten_results(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[f"{prefix}{key}"] = value
+
+    return metrics
+
+
+def save_results(
+    name: str,
+    results: dict[str, Any],
+    parameters: dict[str, Any],
+    directory: str = RESULTS_DIRECTORY
+) -> str:
+    """
+    Saves the results of a benchmark along with the commit and environment they were measured on.
+
+    Parameters:
+    - name (str): Name of the benchmark.
+    - results (dict[str, Any]): The results.
+    - parameters (dict[str, Any]): The parameters of the benchmark, e.g. the dataset size.
+    - directory (str): The directory to save the results in.
+
+    Returns:
+    str: The path to the saved results, named after the benchmark and the commit.
+    """
+    commit = get_commit()
+    path = os.path.join(directory, f"{name}-{commit}.json")
+    os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump({
+            "name": name,
+            "commit": commit,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": parameters,
+            "results": results
+        }, results_file, indent=2)
+
+    return path
+
+
+def compare_results(path: str, results: dict[str, Any]) -> list[tuple[str, Optional[float], float, Optional[float]]]:
+    """
+    Compares results with the saved results of another run, e.g. of an earlier commit.
+
+    Parameters:
+    - path (str): The path to the saved results to compare with.
+    - results (dict[str, Any]): The current results.
+
+    Returns:
+    list[tuple[str, Optional[float], float, Optional[float]]]: Each current metric with its saved value, its
+    current value and the relative change in percent, without saved value and change if it was not measured.
+    """
+    with open(path, encoding="utf-8") as results_file:
+        baseline = flatten_results(json.load(results_file)["results"])
+
+    comparison = []
+
+    for metric, value in flatten_results(results).items():
+        baseline_value = baseline.get(metric)
+        change = None if not baseline_value else (value - baseline_value) / baseline_value * 100
+        comparison.append((metric, baseline_value, value, change))
+
+    return comparison
+
+
+def print_results(results: dict[str, Any], baseline_path: Optional[str] = None):
+    """
+    Prints the metrics of the results, next to the saved results of another run if given.
+
+    Parameters:
+    - results (dict[str, Any]): The results.
+    - baseline_path (Optional[str]): The path to the saved results to compare with.
+    """
+    if baseline_path is None:
+        for metric, value in flatten_results(results).items():
+            print(f"{metric:50} {value:12.3f}")
+
+        return
+
+    for metric, baseline_value, value, change in compare_results(baseline_path, results):
+        baseline_column = "-" if baseline_value is None else f"{baseline_value:.3f}"
+        change_column = "" if change is None else f"{change:+.1f}%"
+        print(f"{metric:50} {baseline_column:>12} {value:12.3f} {change_column:>9}")
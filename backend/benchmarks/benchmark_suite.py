@@ -0,0 +1,203 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+from typing import Any, Callable
+
+from app.models.ticket import Ticket
+from app.models.message import Message
+from app.models.enums.status import Status
+from app.models.enums.compression import Compression
+from app.repositories.ticket_repository import TicketRepository
+from app.serializers.ticket_serializer import TicketSerializer
+from app.storage.message_store import MessageStore
+from app.utils.data_utils import DataUtils
+from app.utils.compression_utils import CompressionUtils
+from .benchmark_results import save_results, print_results
+from .data_generator import DEFAULT_TICKET_COUNT, generate_dataset
+
+DEFAULT_REPEAT = 20
+DEFAULT_PAGE_SIZE = 20
+
+
+def measure(function: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """
+    Measures the latency of a function over several runs.
+
+    Parameters:
+    - function (Callable[[], Any]): The function to measure.
+    - repeat (int): Number of runs.
+
+    Returns:
+    dict[str, float]: The median and minimum latency in milliseconds.
+    """
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return {"median_ms": statistics.median(durations), "min_ms": min(durations)}
+
+
+def benchmark_load(filepath: str) -> dict[str, float]:
+    """
+    Measures the time to load a dataset, and the peak memory while loading it, in a fresh process, as well as the
+    time to read and validate its tickets and messages alone, before they are linked and indexed.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+
+    Returns:
+    dict[str, float]: The load and validation times in seconds, and the growth of the peak resident memory in MiB.
+    """
+    # A spawned process starts from a small heap, so its peak memory is not inflated by the benchmark itself
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_load, [filepath])
+
+
+def _load(filepath: str) -> dict[str, float]:
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    TicketRepository(filepath=filepath, use_snapshot=False)
+    load_s = time.perf_counter() - start
+    # The peak resident memory is reported in KiB on Linux
+    peak_rss_mib = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024
+
+    # Validated after the load, so that the validated data does not add up to the peak memory of the load
+    start = time.perf_counter()
+    DataUtils.read_and_validate_data(
+        filepath, [Ticket, Message], ["tickets", "messages"], containers={"messages": MessageStore()}
+    )
+    validate_s = time.perf_counter() - start
+
+    return {"load_s": load_s, "validate_s": validate_s, "peak_rss_mib": peak_rss_mib}
+
+
+def get_filter_arguments(repository: TicketRepository) -> dict[str, dict[str, Any]]:
+    """
+    Picks filters that match some of the tickets of a dataset: the author and the first word of the message of
+    the first ticket, and the middle tenth of the time range of the tickets.
+
+    Parameters:
+    - repository (TicketRepository): The repository to pick the filters for.
+
+    Returns:
+    dict[str, dict[str, Any]]: The filter arguments by the name of the filter.
+    """
+    tickets = list(repository.backend.iter_tickets())
+    message = repository.get_ticket(tickets[0].id).msg
+    timestamp_start = min(ticket.timestamp for ticket in tickets)
+    duration = max(ticket.timestamp for ticket in tickets) - timestamp_start
+
+    return {
+        "none": {},
+        "author": {"author": message.author.name},
+        "msg_content": {"msg_content": message.content.split()[0]},
+        "status": {"status": [Status.OPEN]},
+        "timestamp": {
+            "timestamp_start": timestamp_start + duration * 0.45,
+            "timestamp_end": timestamp_start + duration * 0.55
+        },
+        "combined": {"author": message.author.name, "status": [Status.OPEN, Status.CLOSED]}
+    }
+
+
+def benchmark_queries(repository: TicketRepository, page_size: int, repeat: int) -> dict[str, Any]:
+    """
+    Measures the latency of listing and counting tickets with each filter, of serializing a page of tickets, and of
+    exporting all tickets.
+
+    Parameters:
+    - repository (TicketRepository): The repository to query, without a query cache so that each run is measured.
+    - page_size (int): Number of tickets on a page.
+    - repeat (int): Number of runs per query.
+
+    Returns:
+    dict[str, Any]: The latencies of each query.
+    """
+    filter_arguments = get_filter_arguments(repository)
+    last_page = repository.get_tickets(0, page_size)["ticket_count"] // max(page_size, 1)
+    page = repository.get_tickets(0, page_size)
+    cached_serializer = TicketSerializer()
+    cached_serializer.dump_page(page)
+
+    return {
+        "get_tickets": {
+            name: measure(lambda: repository.get_tickets(0, page_size, **arguments), repeat)
+            for name, arguments in filter_arguments.items()
+        },
+        "get_tickets_last_page": measure(lambda: repository.get_tickets(last_page, page_size), repeat),
+        "get_tickets_by_cursor": measure(lambda: repository.get_tickets_by_cursor(None, page_size), repeat),
+        "get_ticket_counts": {
+            name: measure(lambda: repository.get_ticket_counts(**arguments), repeat)
+            for name, arguments in filter_arguments.items()
+            if name in ("none", "author", "timestamp")
+        },
+        "serialization": {
+            "uncached": measure(lambda: TicketSerializer(max_size=0).dump_page(page), repeat),
+            "cached": measure(lambda: cached_serializer.dump_page(page), repeat)
+        },
+        "export_tickets": {
+            compression: measure(
+                lambda: sum(map(len, CompressionUtils.compress(
+                    repository.export_tickets(), None if compression == "none" else Compression(compression)
+                ))),
+                repeat
+            )
+            for compression in ("none", Compression.GZIP.value)
+        }
+    }
+
+
+def run_suite(filepath: str, page_size: int, repeat: int) -> dict[str, Any]:
+    """
+    Runs all benchmarks of the suite against a dataset.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+    - page_size (int): Number of tickets on a page.
+    - repeat (int): Number of runs per query.
+
+    Returns:
+    dict[str, Any]: The results of each benchmark.
+    """
+    results = {"load": benchmark_load(filepath)}
+    repository = TicketRepository(filepath=filepath, use_snapshot=False, cache_size=0)
+    results.update(benchmark_queries(repository, page_size, repeat))
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark loading, querying and serializing a dataset of tickets.")
+    parser.add_argument("--filepath", help="The dataset to benchmark, instead of a generated one.")
+    parser.add_argument(
+        "--tickets", type=int, default=DEFAULT_TICKET_COUNT, help="Number of tickets of the generated dataset."
+    )
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--compare", help="Saved results of an earlier run to compare with.")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the results.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = args.filepath
+
+        if filepath is None:
+            filepath = os.path.join(directory, "synthetic_tickets.json")
+            generate_dataset(filepath, args.tickets)
+
+        suite_results = run_suite(filepath, args.page_size, args.repeat)
+
+    parameters = {
+        "dataset": args.filepath or f"synthetic:{args.tickets}", "page_size": args.page_size, "repeat": args.repeat
+    }
+    print_results(suite_results, args.compare)
+
+    if not args.no_save:
+        print(f"Saved the results to {save_results('benchmark_suite', suite_results, parameters)}")
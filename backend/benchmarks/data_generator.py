@@ -0,0 +1,163 @@
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Optional, TextIO
+
+from app.models.enums.status import Status
+
+DEFAULT_FILEPATH = "../data/synthetic_tickets.json"
+DEFAULT_TICKET_COUNT = 10000
+DEFAULT_MESSAGES_PER_TICKET = 2
+DEFAULT_SEED = 0
+
+START_TIMESTAMP = datetime(2023, 1, 1)
+# Share of the tickets per status, close to the statuses of the exported tickets
+STATUS_WEIGHTS = {Status.OPEN: 0.5, Status.CLOSED: 0.3, Status.REMOVED: 0.2}
+# Share of the messages replying to the previous message of their ticket
+REPLY_PROBABILITY = 0.5
+# Share of the tickets discussed in a thread of their own
+DISCUSSION_PROBABILITY = 0.5
+WORDS = [
+    "token", "discord", "error", "nft", "help", "wallet", "transaction", "failed", "mint", "bridge", "gas", "fee",
+    "swap", "stake", "reward", "airdrop", "claim", "connect", "metamask", "pending", "refund", "support", "bot",
+    "verify", "role", "scam", "link", "contract", "balance", "withdraw"
+]
+
+
+def generate_dataset(
+    filepath: str,
+    ticket_count: int,
+    messages_per_ticket: int = DEFAULT_MESSAGES_PER_TICKET,
+    author_count: int = 0,
+    seed: int = DEFAULT_SEED
+) -> dict[str, int]:
+    """
+    Generates a synthetic dataset in the format of the data file, reproducibly for a given seed.
+
+    Each ticket has its own message and the messages leading up to it as context messages, posted shortly before
+    it in the same channel and discussion, some of them replying to the previous one. The tickets and messages are
+    streamed to the file, so even datasets of millions of tickets are generated in constant memory.
+
+    Parameters:
+    - filepath (str): The path to the JSON file to write.
+    - ticket_count (int): Number of tickets.
+    - messages_per_ticket (int): Number of messages of each ticket, including the message of the ticket, at least 1.
+    - author_count (int): Number of distinct authors, or 0 for one author per hundred tickets.
+    - seed (int): Seed of the random generator.
+
+    Returns:
+    dict[str, int]: The number of tickets and messages written.
+    """
+    rng = random.Random(seed)
+    author_count = author_count or max(1, ticket_count // 100)
+    channel_count = max(1, ticket_count // 1000)
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    timestamp = START_TIMESTAMP
+    message_index = 0
+
+    # The tickets are buffered in a temporary file, since they follow all messages in the data file
+    with (
+        open(filepath, "w", encoding="utf-8") as data_file,
+        tempfile.TemporaryFile("w+", encoding="utf-8") as ticket_file
+    ):
+        data_file.write('{"messages": [')
+
+        for ticket_index in range(ticket_count):
+            timestamp += timedelta(seconds=rng.randint(1, 120))
+            channel_id = f"c{rng.randrange(channel_count)}"
+            discussion_id = f"d{ticket_index}" if rng.random() < DISCUSSION_PROBABILITY else None
+            message_ids = []
+
+            for position in range(messages_per_ticket):
+                message_id = f"m{message_index}"
+                message_timestamp = timestamp - timedelta(seconds=10 * (messages_per_ticket - 1 - position))
+                reference_msg_id = message_ids[-1] if message_ids and rng.random() < REPLY_PROBABILITY else None
+
+                _write_item(data_file, message_index, _generate_message(
+                    rng, message_id, channel_id, discussion_id, reference_msg_id, message_timestamp, author_count
+                ))
+                message_ids.append(message_id)
+                message_index += 1
+
+            status = rng.choices(statuses, status_weights)[0]
+            is_open = status == Status.OPEN
+            _write_item(ticket_file, ticket_index, {
+                "id": f"t{ticket_index}",
+                "msg_id": message_ids[-1],
+                "status": status.value,
+                "resolved_by": None if is_open else f"a{rng.randrange(author_count)}",
+                "ts_last_status_change": None if is_open else (timestamp + timedelta(hours=1)).isoformat(),
+                "timestamp": timestamp.isoformat(),
+                "context_messages": message_ids
+            })
+
+        data_file.write('], "tickets": [')
+        ticket_file.seek(0)
+        shutil.copyfileobj(ticket_file, data_file)
+        data_file.write("]}")
+
+    return {"tickets": ticket_count, "messages": message_index}
+
+
+def _generate_message(
+    rng: random.Random,
+    message_id: str,
+    channel_id: str,
+    discussion_id: Optional[str],
+    reference_msg_id: Optional[str],
+    timestamp: datetime,
+    author_count: int
+) -> dict:
+    author_index = rng.randrange(author_count)
+
+    return {
+        "id": message_id,
+        "channel_id": channel_id,
+        "parent_channel_id": None,
+        "community_server_id": "s0",
+        "timestamp": timestamp.isoformat(),
+        "has_attachment": rng.random() < 0.1,
+        "reference_msg_id": reference_msg_id,
+        "timestamp_insert": timestamp.isoformat(),
+        "discussion_id": discussion_id,
+        "content": " ".join(rng.choices(WORDS, k=rng.randint(3, 20))),
+        "msg_url": f"https://discord.com/channels/s0/{channel_id}/{message_id}",
+        "author": {
+            "id": f"a{author_index}",
+            "name": f"user{author_index}",
+            "nickname": f"User {author_index}",
+            "color": "#ffffff",
+            "discriminator": "0",
+            "avatar_url": f"https://cdn.discordapp.com/avatars/a{author_index}.png",
+            "is_bot": False,
+            "timestamp_insert": START_TIMESTAMP.isoformat()
+        }
+    }
+
+
+def _write_item(file: TextIO, index: int, item: dict):
+    if index:
+        file.write(",")
+
+    file.write(json.dumps(item, separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset of tickets and messages.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--tickets", type=int, default=DEFAULT_TICKET_COUNT)
+    parser.add_argument("--messages-per-ticket", type=int, default=DEFAULT_MESSAGES_PER_TICKET)
+    parser.add_argument("--authors", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate_dataset(args.filepath, args.tickets, args.messages_per_ticket, args.authors, args.seed)
+    print(
+        f"Generated {counts['tickets']} tickets and {counts['messages']} messages in {args.filepath} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
@@ -0,0 +1,57 @@
+import argparse
+import time
+from datetime import timedelta
+
+from app.repositories.ticket_repository import TicketRepository
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+DEFAULT_TICKET_COUNT = 1000
+
+
+def benchmark_ingest(filepath: str, ticket_count: int, in_order: bool) -> dict[str, float]:
+    """
+    Compares ingesting new tickets one at a time with reloading all tickets.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+    - ticket_count (int): Number of new tickets to ingest.
+    - in_order (bool): Whether the new tickets are newer than all existing ones, as usual, or older, which shifts
+      the ranks of the existing tickets.
+
+    Returns:
+    dict[str, float]: Time in seconds per ingested ticket, and to reload all tickets.
+    """
+    start = time.perf_counter()
+    repository = TicketRepository(filepath=filepath, use_snapshot=False)
+    reload_duration = time.perf_counter() - start
+
+    tickets = list(repository.backend.iter_tickets())
+    timestamp = max(ticket.timestamp for ticket in tickets) if in_order else min(ticket.timestamp for ticket in tickets)
+    new_tickets = [
+        tickets[index % len(tickets)].model_copy(update={
+            "id": f"ingested-{index}",
+            "timestamp": timestamp + timedelta(seconds=index if in_order else -index)
+        })
+        for index in range(ticket_count)
+    ]
+
+    start = time.perf_counter()
+
+    for ticket in new_tickets:
+        repository.ingest([], [ticket])
+
+    return {"ingest": (time.perf_counter() - start) / ticket_count, "reload": reload_duration}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the incremental ingestion of new tickets.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--ticket-count", type=int, default=DEFAULT_TICKET_COUNT)
+    args = parser.parse_args()
+
+    for in_order in (True, False):
+        results = benchmark_ingest(args.filepath, args.ticket_count, in_order)
+        print(
+            f"in_order={in_order!s:5} ingest {results['ingest'] * 1e6:.1f}us/ticket, "
+            f"reload {results['reload'] * 1000:.1f}ms"
+        )
@@ -0,0 +1,68 @@
+import argparse
+import time
+
+from app.models.enums.ticket_field import TicketField
+from app.repositories.ticket_repository import TicketRepository
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+DEFAULT_PAGE_SIZE = 100
+SLIM_FIELDS = [TicketField.ID, TicketField.STATUS, TicketField.TIMESTAMP]
+
+
+def benchmark_startup(filepath: str, use_snapshot: bool) -> dict[str, float]:
+    """
+    Compares the time to load and index the data with eagerly and lazily linked messages.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+    - use_snapshot (bool): Whether to load the data from an up to date snapshot, which is built beforehand.
+
+    Returns:
+    dict[str, float]: Startup time in seconds of each mode.
+    """
+    results = {}
+
+    for lazy_messages in (False, True):
+        if use_snapshot:
+            TicketRepository(filepath=filepath, lazy_messages=lazy_messages)
+
+        start = time.perf_counter()
+        TicketRepository(filepath=filepath, use_snapshot=use_snapshot, lazy_messages=lazy_messages)
+        results["lazy" if lazy_messages else "eager"] = time.perf_counter() - start
+
+    return results
+
+
+def benchmark_payload(repository: TicketRepository, page_size: int) -> dict[str, int]:
+    """
+    Compares the size of a page of tickets with all fields and with a slim projection.
+
+    Parameters:
+    - repository (TicketRepository): The repository to take the page of tickets from.
+    - page_size (int): Number of tickets on the page.
+
+    Returns:
+    dict[str, int]: Size in bytes of each response.
+    """
+    return {
+        "full": len(repository.serializer.dump_page(repository.get_tickets(0, page_size))),
+        "slim": len(repository.serializer.dump_page(
+            repository.get_tickets(0, page_size, fields=SLIM_FIELDS), SLIM_FIELDS
+        ))
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark lazily linked messages and slim ticket projections.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    for use_snapshot in (False, True):
+        for mode, duration in benchmark_startup(args.filepath, use_snapshot).items():
+            print(f"startup snapshot={use_snapshot!s:5} {mode:5} {duration * 1000:.1f}ms")
+
+    repository = TicketRepository(filepath=args.filepath, lazy_messages=True)
+
+    for projection, size in benchmark_payload(repository, args.page_size).items():
+        print(f"payload {projection:4} {size:,} bytes")
@@ -0,0 +1,239 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from typing import Any
+from urllib.parse import urlencode
+
+import uvicorn
+
+from .benchmark_results import save_results, print_results
+from .data_generator import DEFAULT_TICKET_COUNT, generate_dataset
+
+API_PREFIX = "/api/v1/tickets"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DURATION = 10.0
+DEFAULT_PERCENTILES = [50, 90, 99]
+
+
+def start_server(filepath: str) -> tuple[uvicorn.Server, threading.Thread, int]:
+    """
+    Starts the app in a thread of this process, serving a dataset over HTTP on a free local port.
+
+    The app is configured through the environment before it is imported, without a status log or delta log, so
+    that the load does not write to disk. The app can thus only be started once per process.
+
+    Parameters:
+    - filepath (str): The path to the JSON file to serve.
+
+    Returns:
+    tuple[uvicorn.Server, threading.Thread, int]: The server, the thread running it, and the port it listens on.
+    """
+    os.environ.update({
+        "TICKETS_DATA_FILEPATH": filepath,
+        "TICKETS_STATUS_LOG_FILEPATH": "",
+        "TICKETS_DELTA_FILEPATH": "",
+        "TICKETS_RELOAD_INTERVAL": "0"
+    })
+
+    from app.main import app
+
+    # asyncio only disables Nagle's algorithm on the connections of sockets created with an explicit TCP protocol
+    listening_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    listening_socket.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [listening_socket]}, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    return server, thread, listening_socket.getsockname()[1]
+
+
+def get_scenarios(port: int) -> dict[str, list[str]]:
+    """
+    Builds the requests of each scenario from the tickets served, e.g. filtering by the author of a ticket.
+
+    Parameters:
+    - port (int): The port the app listens on.
+
+    Returns:
+    dict[str, list[str]]: The request paths of each scenario, one of which is picked at random per request.
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", f"{API_PREFIX}/?page_size=100")
+    tickets = json.loads(connection.getresponse().read())["tickets"]
+    connection.close()
+
+    ticket_ids = [ticket["id"] for ticket in tickets]
+    authors = sorted({ticket["msg"]["author"]["name"] for ticket in tickets})
+    words = sorted({ticket["msg"]["content"].split()[0] for ticket in tickets if ticket["msg"]["content"]})
+
+    return {
+        "list": [f"{API_PREFIX}/?{urlencode({'page': page})}" for page in range(5)],
+        "list_by_cursor": [f"{API_PREFIX}/?cursor="],
+        "filter_author": [f"{API_PREFIX}/?{urlencode({'author': author})}" for author in authors],
+        "filter_msg_content": [f"{API_PREFIX}/?{urlencode({'msg_content': word})}" for word in words],
+        "filter_status": [f"{API_PREFIX}/?status=open", f"{API_PREFIX}/?status=closed&status=removed"],
+        "counts": [f"{API_PREFIX}/counts"] + [
+            f"{API_PREFIX}/counts?{urlencode({'author': author})}" for author in authors
+        ],
+        "ticket": [f"{API_PREFIX}/{ticket_id}" for ticket_id in ticket_ids],
+        "messages": [f"{API_PREFIX}/{ticket_id}/messages" for ticket_id in ticket_ids],
+        "thread": [f"{API_PREFIX}/{ticket_id}/thread" for ticket_id in ticket_ids]
+    }
+
+
+def run_load(port: int, scenarios: dict[str, list[str]], concurrency: int, duration: float) -> dict[str, list]:
+    """
+    Sends requests from several clients for a while, each client waiting for a response before its next request.
+
+    Parameters:
+    - port (int): The port the app listens on.
+    - scenarios (dict[str, list[str]]): The request paths of each scenario.
+    - concurrency (int): Number of clients, each with its own keep-alive connection.
+    - duration (float): Time in seconds to send requests for.
+
+    Returns:
+    dict[str, list]: The latencies in seconds of the successful requests of each scenario, and the status codes
+    or errors of the failed ones.
+    """
+    deadline = time.perf_counter() + duration
+    latencies = {scenario: [] for scenario in scenarios}
+    errors = {scenario: [] for scenario in scenarios}
+
+    def send_requests(seed: int):
+        rng = random.Random(seed)
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+
+        while time.perf_counter() < deadline:
+            scenario = rng.choice(list(scenarios))
+            start = time.perf_counter()
+
+            try:
+                connection.request("GET", rng.choice(scenarios[scenario]))
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as exception:
+                errors[scenario].append(type(exception).__name__)
+                # The connection is opened again by the next request
+                connection.close()
+                continue
+
+            if response.status == 200:
+                latencies[scenario].append(time.perf_counter() - start)
+            else:
+                errors[scenario].append(response.status)
+
+        connection.close()
+
+    clients = [threading.Thread(target=send_requests, args=[seed]) for seed in range(concurrency)]
+
+    for client in clients:
+        client.start()
+
+    for client in clients:
+        client.join()
+
+    return {"latencies": latencies, "errors": errors}
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """
+    Gets a percentile of values by the nearest-rank method.
+
+    Parameters:
+    - values (list[float]): The values, in any order.
+    - percentile (float): The percentile, between 0 and 100.
+
+    Returns:
+    float: The smallest value that is greater than or equal to the given percent of the values.
+    """
+    sorted_values = sorted(values)
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+
+    return sorted_values[int(rank) - 1]
+
+
+def summarize_load(load: dict[str, list], duration: float, percentiles: list[int]) -> dict[str, Any]:
+    """
+    Summarizes the latencies of a load run per scenario and overall.
+
+    Parameters:
+    - load (dict[str, list]): The latencies and errors of the run, as returned by `run_load`.
+    - duration (float): Time in seconds the requests were sent for.
+    - percentiles (list[int]): The latency percentiles to report.
+
+    Returns:
+    dict[str, Any]: The number of requests and errors, the throughput, and the latency percentiles in milliseconds.
+    """
+    def summarize(latencies: list[float], errors: list) -> dict[str, float]:
+        summary = {"requests": len(latencies) + len(errors), "errors": len(errors)}
+
+        if latencies:
+            summary["requests_per_s"] = len(latencies) / duration
+            summary.update({
+                f"p{percentile}_ms": get_percentile(latencies, percentile) * 1000 for percentile in percentiles
+            })
+            summary["max_ms"] = max(latencies) * 1000
+
+        return summary
+
+    summaries = {
+        scenario: summarize(latencies, load["errors"][scenario])
+        for scenario, latencies in load["latencies"].items()
+    }
+    summaries["total"] = summarize(
+        [latency for latencies in load["latencies"].values() for latency in latencies],
+        [error for errors in load["errors"].values() for error in errors]
+    )
+
+    return summaries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive HTTP load against the app running in this process.")
+    parser.add_argument("--filepath", help="The dataset to serve, instead of a generated one.")
+    parser.add_argument(
+        "--tickets", type=int, default=DEFAULT_TICKET_COUNT, help="Number of tickets of the generated dataset."
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--scenarios", nargs="*", help="The scenarios to run, instead of all of them.")
+    parser.add_argument("--compare", help="Saved results of an earlier run to compare with.")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the results.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = args.filepath
+
+        if filepath is None:
+            filepath = os.path.join(directory, "synthetic_tickets.json")
+            generate_dataset(filepath, args.tickets)
+
+        server, thread, port = start_server(filepath)
+        scenarios = get_scenarios(port)
+        scenarios = {scenario: scenarios[scenario] for scenario in args.scenarios or scenarios}
+        load_results = summarize_load(
+            run_load(port, scenarios, args.concurrency, args.duration), args.duration, DEFAULT_PERCENTILES
+        )
+
+        server.should_exit = True
+        thread.join()
+
+    parameters = {
+        "dataset": args.filepath or f"synthetic:{args.tickets}",
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "scenarios": sorted(scenarios)
+    }
+    print_results(load_results, args.compare)
+
+    if not args.no_save:
+        print(f"Saved the results to {save_results('load_driver', load_results, parameters)}")
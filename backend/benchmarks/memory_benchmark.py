@@ -0,0 +1,96 @@
+import argparse
+import gc
+import tracemalloc
+from collections.abc import MutableMapping
+from typing import Callable
+
+from app.models.message import Message
+from app.models.ticket import Ticket
+from app.storage.message_store import MessageStore
+from app.utils.data_utils import DataUtils
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+
+
+def measure_memory(load: Callable[[], MutableMapping]) -> dict[str, float]:
+    """
+    Measures the memory retained by the loaded data and the peak memory while loading it.
+
+    Parameters:
+    - load (Callable[[], MutableMapping]): Loads the data to measure.
+
+    Returns:
+    dict[str, float]: The retained and peak memory in MiB.
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    data = load()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    del data
+
+    return {"retained_mib": retained / (1 << 20), "peak_mib": peak / (1 << 20)}
+
+
+def load_data(filepath: str, use_message_store: bool, lazy_messages: bool) -> dict[str, MutableMapping]:
+    """
+    Loads the tickets and messages like the in-memory backend, linking each ticket to its message unless the
+    messages are linked lazily.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+    - use_message_store (bool): Whether to keep the messages in the compact message store.
+    - lazy_messages (bool): Whether tickets keep only their message ID.
+
+    Returns:
+    dict[str, MutableMapping]: The tickets and messages.
+    """
+    data = DataUtils.read_and_validate_data(
+        filepath,
+        [Ticket, Message],
+        ["tickets", "messages"],
+        containers={"messages": MessageStore()} if use_message_store else None
+    )
+
+    if not lazy_messages:
+        # Unlike a dictionary of models, the store builds a new message for each ticket, kept next to its record
+        for ticket in data["tickets"].values():
+            ticket.msg = data["messages"][ticket.msg_id]
+
+    return data
+
+
+def benchmark_message_storage(filepath: str) -> dict[str, dict[str, float]]:
+    """
+    Compares the memory of the tickets and messages with the messages kept as pydantic models, and with the compact
+    message store, both with the tickets linked to their messages, which is the default, and linked lazily.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+
+    Returns:
+    dict[str, dict[str, float]]: The retained and peak memory in MiB of each storage.
+    """
+    return {
+        storage: measure_memory(lambda: load_data(filepath, use_message_store, lazy_messages))
+        for storage, use_message_store, lazy_messages in [
+            ("pydantic", False, False), ("message_store", True, False), ("message_store_lazy", True, True)
+        ]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the memory of pydantic messages vs. the message store.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    args = parser.parse_args()
+
+    results = benchmark_message_storage(args.filepath)
+
+    for storage, result in results.items():
+        print(
+            f"{storage:20} retained={result['retained_mib']:.1f}MiB peak={result['peak_mib']:.1f}MiB "
+            f"reduction={results['pydantic']['retained_mib'] / result['retained_mib']:.2f}x"
+        )
@@ -0,0 +1,51 @@
+import argparse
+import timeit
+
+from app.repositories.ticket_repository import TicketRepository
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+DEFAULT_QUERIES = ["nft", "wallet", "help", "transaction failed"]
+
+
+def benchmark_msg_content(repository: TicketRepository, queries: list[str], repeat: int) -> list[dict[str, float]]:
+    """
+    Compares the message content filter through the n-gram index with a full scan over all tickets.
+
+    Parameters:
+    - repository (TicketRepository): The repository to benchmark.
+    - queries (list[str]): Message content queries to run.
+    - repeat (int): Number of runs per query.
+
+    Returns:
+    list[dict[str, float]]: Mean latency in milliseconds of the scan and the indexed path for each query.
+    """
+    tickets = list(repository.backend.data["tickets"].values())
+    results = []
+
+    for query in queries:
+        scan = timeit.timeit(lambda: [ticket for ticket in tickets if ticket.filter(msg_content=query)], number=repeat)
+        indexed = timeit.timeit(lambda: repository.get_tickets(0, len(tickets), msg_content=query), number=repeat)
+
+        results.append({
+            "query": query,
+            "matches": repository.get_tickets(0, 0, msg_content=query)["ticket_count"],
+            "scan_ms": scan / repeat * 1000,
+            "indexed_ms": indexed / repeat * 1000
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the msg_content filter: full scan vs. n-gram index.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    args = parser.parse_args()
+
+    for result in benchmark_msg_content(TicketRepository(filepath=args.filepath), args.queries, args.repeat):
+        print(
+            f"{result['query']!r:24} matches={result['matches']:<8} "
+            f"scan={result['scan_ms']:.3f}ms indexed={result['indexed_ms']:.3f}ms "
+            f"speedup={result['scan_ms'] / max(result['indexed_ms'], 1e-9):.1f}x"
+        )
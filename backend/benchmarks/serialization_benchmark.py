@@ -0,0 +1,52 @@
+import argparse
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.repositories.ticket_repository import TicketRepository
+from app.serializers.ticket_serializer import TicketSerializer
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+DEFAULT_PAGE_SIZE = 20
+
+
+def benchmark_serialization(repository: TicketRepository, page_size: int, repeat: int) -> dict[str, float]:
+    """
+    Compares serializing a page of tickets through jsonable_encoder with the pydantic-core serializer.
+
+    Parameters:
+    - repository (TicketRepository): The repository to take the page of tickets from.
+    - page_size (int): Number of tickets on the page.
+    - repeat (int): Number of runs per serialization path.
+
+    Returns:
+    dict[str, float]: Mean latency in microseconds of each serialization path.
+    """
+    page = repository.get_tickets(0, page_size)
+    cached_serializer = TicketSerializer()
+    cached_serializer.dump_page(page)
+
+    paths = {
+        "jsonable_encoder": lambda: JSONResponse(jsonable_encoder(page)).body,
+        "pydantic_core": lambda: TicketSerializer(max_size=0).dump_page(page),
+        "pydantic_core_cached": lambda: cached_serializer.dump_page(page)
+    }
+
+    return {
+        path: timeit.timeit(serialize, number=repeat) / repeat * 1000000
+        for path, serialize in paths.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark serializing a page of tickets to JSON.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = benchmark_serialization(TicketRepository(filepath=args.filepath), args.page_size, args.repeat)
+
+    for path, latency in results.items():
+        print(f"{path:24} {latency:.1f}us speedup={results['jsonable_encoder'] / latency:.1f}x")
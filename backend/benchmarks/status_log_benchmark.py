@@ -0,0 +1,73 @@
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from app.models.enums.status import Status
+from app.storage.status_log import StatusLog
+
+DEFAULT_RECORD_COUNT = 100000
+DEFAULT_BATCH_SIZES = [1, 100]
+
+
+def benchmark_append(path: str, record_count: int, batch_size: int) -> float:
+    """
+    Measures the write throughput of the status log, including the final flush to disk.
+
+    Parameters:
+    - path (str): The path to the log file.
+    - record_count (int): Number of status changes to append.
+    - batch_size (int): Number of status changes per append.
+
+    Returns:
+    float: Appended status changes per second.
+    """
+    status_log = StatusLog(path)
+    ts_last_status_change = datetime.now()
+    batch_count = record_count // batch_size
+    batches = [
+        [(str(batch * batch_size + offset), Status.CLOSED, ts_last_status_change) for offset in range(batch_size)]
+        for batch in range(batch_count)
+    ]
+
+    start = time.perf_counter()
+
+    for batch in batches:
+        status_log.append(batch)
+
+    status_log.close()
+
+    return batch_count * batch_size / (time.perf_counter() - start)
+
+
+def benchmark_recovery(path: str) -> tuple[int, float]:
+    """
+    Measures the time to read back all status changes of the status log, as done at startup.
+
+    Parameters:
+    - path (str): The path to the log file.
+
+    Returns:
+    tuple[int, float]: Number of status changes read and the time taken in seconds.
+    """
+    start = time.perf_counter()
+    record_count = sum(1 for _ in StatusLog(path).read())
+
+    return record_count, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the write throughput and recovery time of the status log.")
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORD_COUNT)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for batch_size in args.batch_sizes:
+            path = os.path.join(directory, f"batch-{batch_size}.wal")
+            throughput = benchmark_append(path, args.records, batch_size)
+            print(f"append batch_size={batch_size:<6} {throughput:,.0f} changes/s")
+
+        record_count, duration = benchmark_recovery(path)
+        print(f"recovery {record_count:,} changes in {duration * 1000:.1f}ms")
@@ -0,0 +1,76 @@
+import argparse
+import time
+
+from app.repositories.ticket_repository import TicketRepository
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+DEFAULT_MAX_DEPTH = 10
+DEFAULT_MAX_SIZE = 50
+
+
+def scan_reply_chain(messages: list, message_id: str, max_depth: int) -> set[str]:
+    """
+    Collects the reply chain of a message by scanning all messages for each level, as done without the graph.
+
+    Parameters:
+    - messages (list): The records of all messages.
+    - message_id (str): ID of the message.
+    - max_depth (int): Maximum number of reply edges between the message and the messages of its reply chain.
+
+    Returns:
+    set[str]: IDs of the messages of the reply chain.
+    """
+    references = {message.id: message.reference_msg_id for message in messages}
+    thread = {message_id}
+    frontier = {message_id}
+
+    for _ in range(max_depth):
+        referenced_ids = {references[frontier_id] for frontier_id in frontier}
+        frontier = {
+            message.id for message in messages
+            if message.reference_msg_id in frontier or message.id in referenced_ids
+        } - thread
+        thread |= frontier
+
+    return thread
+
+
+def benchmark_thread(filepath: str, max_depth: int, max_size: int) -> dict[str, float]:
+    """
+    Compares resolving the threads of all tickets from the precomputed message graph with scanning the messages.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+    - max_depth (int): Maximum number of reply edges in a thread.
+    - max_size (int): Maximum number of messages in a thread.
+
+    Returns:
+    dict[str, float]: Time in seconds per thread, with the graph and with scans of the messages.
+    """
+    repository = TicketRepository(filepath=filepath, use_snapshot=False)
+    messages = list(repository.backend.data["messages"].iter_records())
+    tickets = list(repository.backend.iter_tickets())
+
+    start = time.perf_counter()
+
+    for ticket in tickets:
+        repository.backend.get_thread(ticket.msg_id, max_depth, max_size)
+
+    graph_duration = (time.perf_counter() - start) / len(tickets)
+    start = time.perf_counter()
+
+    for ticket in tickets:
+        scan_reply_chain(messages, ticket.msg_id, max_depth)
+
+    return {"graph": graph_duration, "scan": (time.perf_counter() - start) / len(tickets)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the thread lookups of the precomputed message graph.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH)
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE)
+    args = parser.parse_args()
+
+    results = benchmark_thread(args.filepath, args.max_depth, args.max_size)
+    print(f"graph {results['graph'] * 1e6:.1f}us/thread, scan (reply chain only) {results['scan'] * 1e6:.1f}us/thread")
@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+DEFAULT_FILEPATH = "../data/awesome_tickets.json"
+DEFAULT_WORKERS = 4
+DEFAULT_PORT = 5099
+DEFAULT_SCANS = 4
+SCAN_PAGE_SIZE = 1000
+STARTUP_TIMEOUT = 600.0
+MEMORY_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def read_memory(pid: int) -> dict[str, float]:
+    """
+    Reads the memory of a process from its smaps rollup, in which the proportional set size (PSS) splits every page
+    shared with other processes evenly between them.
+
+    Parameters:
+    - pid (int): The process ID.
+
+    Returns:
+    dict[str, float]: The resident, proportional, shared and private memory in MiB.
+    """
+    memory = {}
+
+    with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as smaps_file:
+        for line in smaps_file:
+            name, _, value = line.partition(":")
+
+            if name in MEMORY_FIELDS:
+                memory[name] = int(value.split()[0]) / 1024
+
+    return memory
+
+
+def get_child_pids(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children", encoding="utf-8") as children_file:
+        return [int(child_pid) for child_pid in children_file.read().split()]
+
+
+def wait_until_ready(port: int, workers: int, server: subprocess.Popen) -> list[int]:
+    """
+    Waits until all workers are forked and the server answers.
+
+    Returns:
+    list[int]: The process IDs of the workers.
+    """
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("The server exited while starting")
+
+        try:
+            worker_pids = get_child_pids(server.pid)
+
+            if len(worker_pids) == workers:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=5).read()
+                return worker_pids
+        except OSError:
+            pass
+
+        time.sleep(0.5)
+
+    raise TimeoutError("The server did not start in time")
+
+
+def scan_tickets(port: int):
+    """
+    Pages through all tickets, so that the workers serving the pages read and serialize every loaded ticket.
+
+    Parameters:
+    - port (int): The port the server listens on.
+    """
+    page = 0
+
+    while True:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{port}/api/v1/tickets/?page={page}&page_size={SCAN_PAGE_SIZE}&with_count=false",
+            timeout=600
+        ) as response:
+            if not json.load(response)["tickets"]:
+                return
+
+        page += 1
+
+
+def measure(pids: dict[str, int]) -> dict[str, dict[str, float]]:
+    return {name: read_memory(pid) for name, pid in pids.items()}
+
+
+def benchmark_worker_memory(
+    filepath: str,
+    workers: int,
+    port: int,
+    scans: int,
+    lazy_messages: bool = False
+) -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Measures how much of the dataset loaded by the supervisor the forked workers keep sharing, right after they
+    start and after they have served all tickets.
+
+    Parameters:
+    - filepath (str): The path to the JSON file.
+    - workers (int): The number of worker processes.
+    - port (int): The port to serve on.
+    - scans (int): The number of times to page through all tickets, spread over the workers by the kernel.
+    - lazy_messages (bool): Whether to link tickets to their messages only when needed.
+
+    Returns:
+    dict[str, dict[str, dict[str, float]]]: The memory in MiB of the supervisor and of each worker, by phase.
+    """
+    environment = {
+        **os.environ,
+        "TICKETS_DATA_FILEPATH": filepath,
+        "TICKETS_STATUS_LOG_FILEPATH": "",
+        "TICKETS_DELTA_FILEPATH": "",
+        "TICKETS_LAZY_MESSAGES": str(lazy_messages).lower()
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    try:
+        worker_pids = wait_until_ready(port, workers, server)
+        pids = {"supervisor": server.pid, **{f"worker_{index}": pid for index, pid in enumerate(worker_pids)}}
+        results = {"started": measure(pids)}
+
+        for _ in range(scans):
+            scan_tickets(port)
+
+        results["scanned"] = measure(pids)
+
+        return results
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def print_results(results: dict[str, dict[str, dict[str, float]]]):
+    for phase, phase_results in results.items():
+        workers = [memory for name, memory in phase_results.items() if name != "supervisor"]
+        supervisor = phase_results["supervisor"]
+
+        print(f"{phase}:")
+
+        for name, memory in phase_results.items():
+            print(
+                f"  {name:12} rss={memory['Rss']:.1f}MiB pss={memory['Pss']:.1f}MiB "
+                f"shared={memory['Shared_Clean'] + memory['Shared_Dirty']:.1f}MiB "
+                f"private={memory['Private_Clean'] + memory['Private_Dirty']:.1f}MiB"
+            )
+
+        total_pss = supervisor["Pss"] + sum(memory["Pss"] for memory in workers)
+        print(
+            f"  total_pss={total_pss:.1f}MiB vs. {len(workers) + 1} unshared copies of "
+            f"{supervisor['Rss']:.1f}MiB={supervisor['Rss'] * (len(workers) + 1):.1f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the memory the forked workers share with the supervisor.")
+    parser.add_argument("--filepath", default=DEFAULT_FILEPATH)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--scans", type=int, default=DEFAULT_SCANS)
+    parser.add_argument("--lazy-messages", action="store_true")
+    args = parser.parse_args()
+
+    print_results(benchmark_worker_memory(args.filepath, args.workers, args.port, args.scans, args.lazy_messages))
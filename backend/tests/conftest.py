@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Status changes made by the tests are logged to a temporary file, so they do not persist into the next run
+os.environ.setdefault(
+    "TICKETS_STATUS_LOG_FILEPATH", os.path.join(tempfile.mkdtemp(prefix="tickets-"), "awesome_tickets.json.wal")
+)
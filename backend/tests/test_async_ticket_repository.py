@@ -0,0 +1,190 @@
+import asyncio
+import json
+import itertools
+import threading
+from datetime import timedelta
+
+import pytest
+
+from app.models.enums.status import Status
+from app.repositories.ticket_repository import TicketRepository
+from app.repositories.async_ticket_repository import AsyncTicketRepository
+from app.utils.cancellation_utils import CancellationToken, CancellationUtils
+from app.exceptions.service_unavailable_exception import ServiceUnavailableException
+
+mock_filepath = "../data/awesome_tickets.json"
+
+
+class SlowTicketRepository:
+    """
+    Counts tickets forever, stopping only when it is cancelled
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+
+    def get_ticket_counts(self, *args):
+        self.started.set()
+
+        try:
+            for _ in CancellationUtils.iter_checked(itertools.count()):
+                pass
+        finally:
+            self.stopped.set()
+
+    def close(self):
+        pass
+
+
+def test_async_ticket_repository():
+    """
+    Confirm that the queries run off the event loop return the same results as the repository
+    """
+    repository = TicketRepository(filepath=mock_filepath, use_snapshot=False)
+    async_repository = AsyncTicketRepository(repository)
+    filter_arguments = {"author": "samuyal", "status": [Status.OPEN]}
+
+    async def get_results():
+        return await asyncio.gather(
+            async_repository.get_tickets(0, 20, **filter_arguments),
+            async_repository.get_tickets_by_cursor(None, 20, **filter_arguments),
+            async_repository.get_ticket_counts(author="samuyal")
+        )
+
+    tickets, tickets_by_cursor, ticket_counts = asyncio.run(get_results())
+
+    assert tickets == repository.get_tickets(0, 20, **filter_arguments)
+    assert tickets_by_cursor == repository.get_tickets_by_cursor(None, 20, **filter_arguments)
+    assert ticket_counts == repository.get_ticket_counts(author="samuyal")
+    async_repository.close()
+
+
+def test_async_ticket_repository_timeout():
+    """
+    Confirm that a query exceeding the timeout is answered with 503 and stops running
+    """
+    repository = SlowTicketRepository()
+    async_repository = AsyncTicketRepository(repository, timeout=0.05)
+
+    with pytest.raises(ServiceUnavailableException):
+        asyncio.run(async_repository.get_ticket_counts())
+
+    assert repository.started.is_set()
+    assert repository.stopped.wait(timeout=5)
+    assert async_repository.pending == 0
+    async_repository.close()
+
+
+def test_async_ticket_repository_rejects_when_saturated():
+    """
+    Confirm that queries beyond the pending limit are rejected instead of queueing up
+    """
+    repository = SlowTicketRepository()
+    async_repository = AsyncTicketRepository(repository, max_workers=1, max_pending=1, timeout=0.5)
+
+    async def get_counts_twice():
+        running = asyncio.ensure_future(async_repository.get_ticket_counts())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailableException):
+            await async_repository.get_ticket_counts()
+
+        running.cancel()
+
+    asyncio.run(get_counts_twice())
+
+    assert repository.stopped.wait(timeout=5)
+    async_repository.close()
+
+
+def test_cancellation_token():
+    """
+    Confirm that checked loops stop once their token is cancelled, and run unchecked without a token
+    """
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(ServiceUnavailableException):
+        CancellationUtils.run(token, lambda: list(CancellationUtils.iter_checked(range(10))))
+
+    assert list(CancellationUtils.iter_checked(range(10))) == list(range(10))
+    assert CancellationToken(timeout=0).is_cancelled()
+
+
+def test_reload(tmp_path):
+    """
+    Confirm that reloading swaps in the new tickets, and carries over the status changes of the old ones
+    """
+    with open(mock_filepath, encoding="utf-8") as data_file:
+        data = json.load(data_file)
+
+    data_filepath = str(tmp_path / "awesome_tickets.json")
+
+    with open(data_filepath, "w", encoding="utf-8") as data_file:
+        json.dump(data, data_file)
+
+    async_repository = AsyncTicketRepository(TicketRepository(filepath=data_filepath, use_snapshot=False))
+    repository = async_repository.repository
+    closed_ticket_id, removed_ticket_id, updated_ticket_id = (ticket["id"] for ticket in data["tickets"][:3])
+    repository.close_ticket(closed_ticket_id)
+
+    data["tickets"] = [ticket for ticket in data["tickets"] if ticket["id"] != removed_ticket_id]
+    data["tickets"][1]["context_messages"] = []
+    data["tickets"].append({**data["tickets"][-1], "id": "t-added"})
+
+    with open(data_filepath, "w", encoding="utf-8") as data_file:
+        json.dump(data, data_file)
+
+    ticket_changes = asyncio.run(
+        async_repository.reload(lambda: TicketRepository(filepath=data_filepath, use_snapshot=False))
+    )
+
+    assert ticket_changes == {"added": 1, "removed": 1, "updated": 1, "carried_over": 1}
+    assert async_repository.get_ticket(closed_ticket_id).status == Status.CLOSED
+    assert async_repository.get_ticket(updated_ticket_id).context_messages == []
+    assert async_repository.get_ticket("t-added").msg_id == data["tickets"][-1]["msg_id"]
+
+    # Status changes of requests still running against the old tickets are forwarded to the new ones
+    repository.remove_ticket(updated_ticket_id)
+    assert async_repository.get_ticket(updated_ticket_id).status == Status.REMOVED
+    async_repository.close()
+
+
+def test_reload_keeps_later_status_changes_of_export(tmp_path):
+    """
+    Confirm that a reload neither replays nor carries over a status change older than the one of the new export
+    """
+    with open(mock_filepath, encoding="utf-8") as data_file:
+        data = json.load(data_file)
+
+    data_filepath = str(tmp_path / "awesome_tickets.json")
+    status_log_path = str(tmp_path / "awesome_tickets.json.wal")
+
+    with open(data_filepath, "w", encoding="utf-8") as data_file:
+        json.dump(data, data_file)
+
+    def build():
+        return TicketRepository(filepath=data_filepath, use_snapshot=False, status_log_path=status_log_path)
+
+    async_repository = AsyncTicketRepository(build())
+    reopened_ticket_id, closed_ticket_id = (ticket["id"] for ticket in data["tickets"][:2])
+    ts_last_status_change = asyncio.run(async_repository.close_ticket(reopened_ticket_id)).ts_last_status_change
+    asyncio.run(async_repository.close_ticket(closed_ticket_id))
+
+    # The export reopened the first ticket after it was closed, and holds an older change of the second one
+    data["tickets"][0].update(status="open", ts_last_status_change=(
+        ts_last_status_change + timedelta(hours=1)
+    ).isoformat())
+    data["tickets"][1].update(status="open", ts_last_status_change="2000-01-01T00:00:00Z")
+
+    with open(data_filepath, "w", encoding="utf-8") as data_file:
+        json.dump(data, data_file)
+
+    ticket_changes = asyncio.run(async_repository.reload(build))
+
+    assert ticket_changes["carried_over"] == 0
+    assert async_repository.get_ticket(reopened_ticket_id).status == Status.OPEN
+    assert async_repository.get_ticket(reopened_ticket_id).ts_last_status_change > ts_last_status_change
+    assert async_repository.get_ticket(closed_ticket_id).status == Status.CLOSED
+    async_repository.close()
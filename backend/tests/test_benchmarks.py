@@ -0,0 +1,45 @@
+from benchmarks.benchmark_results import compare_results, save_results
+from benchmarks.data_generator import generate_dataset
+from benchmarks.load_driver import get_percentile
+from app.repositories.ticket_repository import TicketRepository
+
+
+def test_generate_dataset(tmp_path):
+    """
+    Confirm that the generated dataset is reproducible and loads with all tickets linked to their messages
+    """
+    filepaths = [str(tmp_path / f"synthetic_tickets_{index}.json") for index in range(2)]
+
+    for filepath in filepaths:
+        assert generate_dataset(filepath, 500, messages_per_ticket=3, seed=1) == {"tickets": 500, "messages": 1500}
+
+    with open(filepaths[0], encoding="utf-8") as first_file, open(filepaths[1], encoding="utf-8") as second_file:
+        assert first_file.read() == second_file.read()
+
+    repository = TicketRepository(filepath=filepaths[0], use_snapshot=False)
+    assert sum(repository.get_ticket_counts().values()) == 500
+    assert len(repository.get_ticket_context_messages("t499")) == 3
+    assert repository.get_ticket("t0").msg.author.name.startswith("user")
+
+
+def test_compare_results(tmp_path):
+    """
+    Confirm that saved results are compared metric by metric with the current ones
+    """
+    path = save_results("suite", {"load": {"load_s": 2.0}, "counts": {"median_ms": 0}}, {}, directory=str(tmp_path))
+
+    assert compare_results(path, {"load": {"load_s": 1.5}, "counts": {"median_ms": 1.0}, "new_ms": 3.0}) == [
+        ("load.load_s", 2.0, 1.5, -25.0),
+        ("counts.median_ms", 0, 1.0, None),
+        ("new_ms", None, 3.0, None)
+    ]
+
+
+def test_get_percentile():
+    """
+    Confirm that percentiles are taken by the nearest rank
+    """
+    latencies = [float(latency) for latency in range(100, 0, -1)]
+
+    assert [get_percentile(latencies, percentile) for percentile in (0, 50, 99, 100)] == [1.0, 50.0, 99.0, 100.0]
+    assert get_percentile([7.0], 99) == 7.0
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from app.models.ticket import Ticket
+from app.models.message import Message
+from app.utils.data_utils import DataUtils
+from app.utils.json_stream_utils import JsonStreamUtils
+
+mock_filepath = "../data/awesome_tickets.json"
+
+with open(mock_filepath) as mock_file:
+    mock_json_data = json.load(mock_file)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 4096, JsonStreamUtils.CHUNK_SIZE])
+def test_iter_array_items(chunk_size):
+    """
+    Confirm that the streamed array items match the fully parsed JSON regardless of the chunk size
+    """
+    items = {"tickets": [], "messages": []}
+
+    for data_key, item in JsonStreamUtils.iter_array_items(mock_filepath, {"tickets", "messages"}, chunk_size):
+        items[data_key].append(item)
+
+    assert items["tickets"] == mock_json_data["tickets"]
+    assert items["messages"] == mock_json_data["messages"]
+
+
+def test_iter_array_items_with_missing_key(tmp_path):
+    """
+    Confirm that a missing top-level key raises a KeyError like indexing the parsed JSON would
+    """
+    filepath = tmp_path / "data.json"
+    filepath.write_text(json.dumps({"tickets": [{"id": 1}], "other": {"nested": [1, 2.5, None]}}))
+
+    with pytest.raises(KeyError):
+        list(JsonStreamUtils.iter_array_items(str(filepath), {"tickets", "messages"}, 3))
+
+
+@pytest.mark.parametrize("min_chunk_size", [1, 100, 5000, JsonStreamUtils.CHUNK_SIZE])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_array_chunks(tmp_path, min_chunk_size, indent):
+    """
+    Confirm that the chunks of raw items decode to the same items as the fully parsed JSON, including strings that
+    look like item boundaries or brackets, and nested arrays of objects
+    """
+    contents = ['},{"id":"x"}', '}], "messages": [{"id', "\\", '"', '\\"}', "{[", "]]}", "}, {\"k", "\n", "text"]
+    data = {
+        "meta": {"items": [1, {"id": "]"}]},
+        "tickets": [
+            {"id": f"t{index}", "content": "".join(contents[index % 7:][:index % 4]), "nested": [{"a": [{}]}]}
+            for index in range(200)
+        ],
+        "numbers": [1, 2.5, None],
+        "messages": [{"id": f"m{index}", "content": contents[index % len(contents)] * 3} for index in range(100)],
+        "empty": []
+    }
+    filepath = tmp_path / "data.json"
+    filepath.write_text(json.dumps(data, indent=indent))
+    items = {"tickets": [], "numbers": [], "messages": [], "empty": []}
+
+    for data_key, text in JsonStreamUtils.iter_array_chunks(str(filepath), set(items), min_chunk_size):
+        items[data_key] += json.loads("[" + text + "]")
+
+    assert items == {data_key: data[data_key] for data_key in items}
+
+
+def test_read_and_validate_data_in_chunks():
+    """
+    Confirm that validation in chunks returns the same models in the same order and reports progress
+    """
+    progress = []
+
+    data = DataUtils.read_and_validate_data(
+        filepath=mock_filepath,
+        data_types=[Ticket, Message],
+        data_keys=["tickets", "messages"],
+        chunk_size=5000,
+        progress_callback=lambda data_key, count: progress.append((data_key, count))
+    )
+
+    assert list(data.keys()) == ["tickets", "messages"]
+    assert [ticket.id for ticket in data["tickets"].values()] == [item["id"] for item in mock_json_data["tickets"]]
+    assert [message.id for message in data["messages"].values()] == [item["id"] for item in mock_json_data["messages"]]
+    assert ("tickets", len(data["tickets"])) in progress
+    assert ("messages", len(data["messages"])) in progress
+    assert len(progress) > 2
@@ -1,3 +1,5 @@
+import json
+
 from fastapi import status as http_status
 from fastapi.testclient import TestClient
 
@@ -11,3 +13,135 @@ def test_healthz():
 
     assert response.status_code == http_status.HTTP_200_OK
     assert response.text.strip('"\n') == "OK"
+
+
+def test_metrics():
+    client.get("/api/v1/tickets/", params={"author": "samuyal"})
+    response = client.get("/metrics")
+
+    assert response.status_code == http_status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/api/v1/tickets/",status="200"}' in response.text
+    assert 'tickets_stage_duration_seconds_count{stage="scan"}' in response.text
+    assert 'tickets_dataset_size{kind="tickets"}' in response.text
+
+
+def test_export_tickets():
+    params = {"status": ["open", "closed"], "author": "a"}
+    response = client.get("/api/v1/tickets/export", params=params)
+    tickets = client.get("/api/v1/tickets/", params={**params, "page_size": 1000}).json()["tickets"]
+
+    assert response.status_code == http_status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == tickets
+
+    compressed_response = client.get("/api/v1/tickets/export", params={**params, "compression": "gzip"})
+
+    assert compressed_response.headers["content-encoding"] == "gzip"
+    assert compressed_response.content == response.content
+
+    lines = client.get("/api/v1/tickets/export", params={**params, "with_context_messages": True}).text.splitlines()
+
+    assert [json.loads(line)["ticket"] for line in lines] == tickets
+    assert [
+        [message["id"] for message in json.loads(line)["context_messages"]] for line in lines
+    ] == [ticket["context_messages"] for ticket in tickets]
+
+
+def test_time_zone_bounds():
+    params = {"timestamp_start": "2023-10-28T06:30:00", "timestamp_end": "2023-11-02T08:15:00"}
+    zoned_params = {"timestamp_start": "2023-10-28T06:30:00Z", "timestamp_end": "2023-11-02T03:15:00-05:00"}
+
+    for filter_params in [{}, {"status": ["open", "closed"]}, {"author": "a"}, {"msg_content": "e"}]:
+        for pagination_params in [{"page_size": 1000}, {"page_size": 1000, "cursor": ""}]:
+            tickets = client.get("/api/v1/tickets/", params={**params, **filter_params, **pagination_params}).json()
+            response = client.get("/api/v1/tickets/", params={**zoned_params, **filter_params, **pagination_params})
+
+            assert response.status_code == http_status.HTTP_200_OK
+            assert response.json() == tickets and tickets["tickets"]
+
+        export = client.get("/api/v1/tickets/export", params={**params, **filter_params})
+        zoned_export = client.get("/api/v1/tickets/export", params={**zoned_params, **filter_params})
+
+        assert zoned_export.status_code == http_status.HTTP_200_OK
+        assert zoned_export.text == export.text and export.text
+
+    counts = client.get("/api/v1/tickets/counts", params=params).json()
+
+    assert client.get("/api/v1/tickets/counts", params=zoned_params).json() == counts
+
+    # A bound in another time zone selects the tickets of the same instant, not of the same wall-clock time
+    shifted_params = {**zoned_params, "timestamp_end": "2023-11-02T08:15:00-05:00"}
+
+    assert client.get("/api/v1/tickets/counts", params=shifted_params).json() != counts
+
+
+def test_ticket_histogram():
+    params = {"bucket": "day", "timestamp_start": "2023-10-28T06:00:00", "timestamp_end": "2023-10-30T23:59:59"}
+    histogram = client.get("/api/v1/tickets/analytics", params=params).json()
+    counts = client.get("/api/v1/tickets/counts", params=params).json()
+
+    assert histogram["buckets"] == ["2023-10-28T00:00:00", "2023-10-29T00:00:00", "2023-10-30T00:00:00"]
+    assert {group: sum(series) for group, series in histogram["series"].items()} == {
+        status: count for status, count in counts.items() if count
+    }
+
+    truncated_histogram = client.get("/api/v1/tickets/analytics", params={"group_by": "author", "max_groups": 1}).json()
+
+    assert truncated_histogram["truncated"] and len(truncated_histogram["series"]) == 1
+
+    response = client.get(
+        "/api/v1/tickets/analytics", params={"bucket": "hour", "timestamp_end": "2030-01-01T00:00:00"}
+    )
+
+    assert response.status_code == http_status.HTTP_400_BAD_REQUEST
+
+    # Bounds with a time zone cutting through hours are converted to UTC, the time zone of the tickets
+    params = {"bucket": "hour", "timestamp_start": "2023-10-28T06:30:00", "timestamp_end": "2023-10-29T08:15:00"}
+    histogram = client.get("/api/v1/tickets/analytics", params=params).json()
+    zoned_params = {**params, "timestamp_start": "2023-10-28T06:30:00Z", "timestamp_end": "2023-10-29T10:15:00+02:00"}
+    zoned_histogram = client.get("/api/v1/tickets/analytics", params=zoned_params).json()
+
+    assert zoned_histogram == histogram and histogram["series"]
+
+
+def test_conditional_requests():
+    # Closing a closed ticket still changes it, without changing the tickets other tests expect
+    params = {"status": ["closed"], "page_size": 50}
+    response = client.get("/api/v1/tickets/", params=params)
+    ticket_id = response.json()["tickets"][0]["id"]
+    etag = response.headers["etag"]
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == "no-cache"
+
+    not_modified_response = client.get("/api/v1/tickets/", params=params, headers={"If-None-Match": etag})
+
+    assert not_modified_response.status_code == http_status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.headers["etag"] == etag and not not_modified_response.content
+
+    since_response = client.get(
+        "/api/v1/tickets/", params=params, headers={"If-Modified-Since": response.headers["last-modified"]}
+    )
+
+    assert since_response.status_code == http_status.HTTP_304_NOT_MODIFIED
+
+    ticket_response = client.get(f"/api/v1/tickets/{ticket_id}")
+    messages_response = client.get(f"/api/v1/tickets/{ticket_id}/messages")
+    ticket_etag = ticket_response.headers["etag"]
+
+    assert "content-encoding" not in ticket_response.headers
+    assert messages_response.headers["etag"] == ticket_etag
+    assert client.get(
+        f"/api/v1/tickets/{ticket_id}", headers={"If-None-Match": ticket_etag}
+    ).status_code == http_status.HTTP_304_NOT_MODIFIED
+
+    client.put(f"/api/v1/tickets/{ticket_id}")
+
+    modified_response = client.get("/api/v1/tickets/", params=params, headers={"If-None-Match": etag})
+
+    assert modified_response.status_code == http_status.HTTP_200_OK
+    assert modified_response.headers["etag"] != etag
+    assert client.get(
+        f"/api/v1/tickets/{ticket_id}", headers={"If-None-Match": ticket_etag}
+    ).status_code == http_status.HTTP_200_OK
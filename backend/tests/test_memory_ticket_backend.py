@@ -0,0 +1,143 @@
+from collections import Counter
+from datetime import datetime
+
+from app.models.ticket_delta import TicketDelta
+from app.models.enums.status import Status
+from app.models.enums.ticket_field import TicketField
+from app.models.enums.time_bucket import TimeBucket
+from app.models.enums.ticket_grouping import TicketGrouping
+from app.utils.time_bucket_utils import TimeBucketUtils
+from app.repositories.ticket_repository import TicketRepository
+from app.storage.ticket_delta_log import TicketDeltaLog
+
+mock_filepath = "../data/awesome_tickets.json"
+
+
+def test_lazy_messages():
+    """
+    Confirm that lazily linked tickets stay slim in memory, and are returned the same as eagerly linked tickets
+    """
+    repository = TicketRepository(filepath=mock_filepath, use_snapshot=False)
+    lazy_repository = TicketRepository(filepath=mock_filepath, use_snapshot=False, lazy_messages=True)
+    filter_arguments = {"author": "samuyal", "msg_content": "help", "status": [Status.OPEN]}
+
+    assert all(ticket.msg is None for ticket in lazy_repository.backend.data["tickets"].values())
+    assert lazy_repository.get_tickets(0, 20, **filter_arguments) == repository.get_tickets(0, 20, **filter_arguments)
+    assert lazy_repository.get_ticket_counts(author="samuyal") == repository.get_ticket_counts(author="samuyal")
+
+    ticket_id = repository.get_tickets(0, 1, **filter_arguments)["tickets"][0].id
+    assert lazy_repository.close_ticket(ticket_id).msg == repository.get_ticket(ticket_id).msg
+
+    slim_tickets = lazy_repository.get_tickets(0, 20, fields=[TicketField.ID], **filter_arguments)["tickets"]
+    assert all(ticket.msg is None for ticket in slim_tickets)
+    assert all(ticket.msg is None for ticket in lazy_repository.backend.data["tickets"].values())
+
+
+def test_ingest_delta_log(tmp_path):
+    """
+    Confirm that the tickets and messages appended to a delta log are ingested incrementally and indexed
+    """
+    repository = TicketRepository(filepath=mock_filepath, use_snapshot=False)
+    ticket_counts = repository.get_ticket_counts()
+    ticket = repository.get_tickets(0, 1)["tickets"][0]
+    message = ticket.msg.model_copy(update={
+        "id": "m-new", "content": "A freshly ingested message", "author": ticket.msg.author.model_copy(update={
+            "name": "newcomer"
+        })
+    })
+    new_ticket = ticket.model_copy(update={
+        "id": "t-new", "msg_id": "m-new", "msg": None, "status": Status.OPEN, "timestamp": datetime(2000, 1, 1)
+    })
+    orphan_ticket = new_ticket.model_copy(update={"id": "t-orphan", "msg_id": "m-missing"})
+
+    delta_log_path = tmp_path / "awesome_tickets.delta.jsonl"
+    delta_log = TicketDeltaLog(str(delta_log_path))
+
+    with open(delta_log_path, "w", encoding="utf-8") as delta_log_file:
+        delta_log_file.write(TicketDelta(messages=[message], tickets=[new_ticket]).model_dump_json() + "\n")
+        delta_log_file.write(TicketDelta(tickets=[orphan_ticket]).model_dump_json() + "\n")
+        # A line that is still being written is not read yet
+        delta_log_file.write('{"tickets": [')
+
+    assert repository.ingest_log(delta_log) == {"messages": 1, "tickets": 1}
+    assert repository.ingest_log(TicketDeltaLog(str(delta_log_path))) == {"messages": 0, "tickets": 0}
+    assert delta_log.offset < delta_log_path.stat().st_size
+
+    assert [ticket.id for ticket in repository.get_tickets(0, 20, author="newcomer")["tickets"]] == ["t-new"]
+    assert [ticket.id for ticket in repository.get_tickets(0, 20, msg_content="freshly")["tickets"]] == ["t-new"]
+    assert repository.get_tickets_by_cursor(None, 1)["tickets"][0].id == "t-new"
+    assert repository.get_ticket("t-new").msg.content == "A freshly ingested message"
+    assert repository.get_ticket_counts()[Status.OPEN] == ticket_counts[Status.OPEN] + 1
+    assert repository.get_ticket_counts(author="newcomer") == {Status.OPEN: 1}
+    assert repository.get_ticket_counts(timestamp_end=datetime(2000, 1, 1)) == {Status.OPEN: 1}
+
+    assert repository.close_ticket("t-new").status == Status.CLOSED
+    assert repository.get_ticket_counts(author="newcomer") == {Status.CLOSED: 1}
+
+
+def test_ticket_thread():
+    """
+    Confirm that a thread follows the reply chain within the depth limit, and is filled up to the size limit
+    """
+    repository = TicketRepository(filepath=mock_filepath, use_snapshot=False)
+    ticket = repository.get_tickets(0, 1)["tickets"][0]
+    reply = ticket.msg.model_copy(update={
+        "id": "m-reply", "reference_msg_id": ticket.msg_id, "discussion_id": None, "channel_id": "c-new"
+    })
+    reply_to_reply = reply.model_copy(update={"id": "m-reply-to-reply", "reference_msg_id": "m-reply"})
+    repository.ingest([reply, reply_to_reply], [])
+
+    thread = repository.get_ticket_thread(ticket.id, max_depth=1, max_size=2)
+    assert {message.id for message in thread["messages"]} == {ticket.msg_id, "m-reply"}
+    assert thread["truncated"]
+
+    thread = repository.get_ticket_thread(ticket.id, max_depth=100, max_size=1000)
+    message_ids = [message.id for message in thread["messages"]]
+    assert {ticket.msg_id, "m-reply", "m-reply-to-reply"} <= set(message_ids)
+    assert message_ids == [message.id for message in sorted(thread["messages"], key=lambda m: (m.timestamp, m.id))]
+    assert not thread["truncated"]
+
+    # Beyond the depth limit, the thread is filled up with the messages of the same discussion and channel
+    thread = repository.get_ticket_thread(ticket.id, max_depth=0, max_size=3)
+    assert len(thread["messages"]) == 3 and "m-reply" not in {message.id for message in thread["messages"]}
+    assert all(
+        message.discussion_id == ticket.msg.discussion_id or message.channel_id == ticket.msg.channel_id
+        for message in thread["messages"]
+    )
+    assert thread["truncated"]
+
+
+def test_ticket_rollups():
+    """
+    Confirm that the histograms summed from the hourly rollups match counting every ticket, after status changes and
+    within windows cutting through hours
+    """
+    repository = TicketRepository(filepath=mock_filepath, use_snapshot=False, lazy_messages=True)
+    tickets = repository.get_tickets(0, 5)["tickets"]
+    repository.close_tickets([ticket.id for ticket in tickets[:3]])
+    repository.remove_ticket(tickets[3].id)
+    windows = [
+        (None, None),
+        (datetime(2023, 10, 27, 13, 30), datetime(2023, 11, 2, 8, 15)),
+        (None, datetime(2023, 10, 28, 0, 0))
+    ]
+    all_tickets = repository.get_tickets(0, 1000)["tickets"]
+
+    for bucket in TimeBucket:
+        for grouping in TicketGrouping:
+            for timestamp_start, timestamp_end in windows:
+                expected = Counter(
+                    (
+                        TimeBucketUtils.get_group(ticket, ticket.msg, grouping),
+                        TimeBucketUtils.get_bucket(TimeBucketUtils.get_hour(ticket.timestamp), bucket)
+                    )
+                    for ticket in all_tickets
+                    if (timestamp_start is None or ticket.timestamp >= timestamp_start)
+                    and (timestamp_end is None or ticket.timestamp <= timestamp_end)
+                )
+                histogram = repository.backend.get_histogram(bucket, grouping, timestamp_start, timestamp_end)
+
+                assert {
+                    (group, bucket_number): count
+                    for group, counts in histogram.items() for bucket_number, count in counts.items()
+                } == dict(expected)
@@ -0,0 +1,64 @@
+import threading
+import time
+
+from app.metrics.metrics_registry import MetricsRegistry
+from app.metrics.sampling_profiler import SamplingProfiler
+
+
+def test_metrics_registry():
+    """
+    Confirm that counters, gauges and histograms are rendered in the Prometheus text format
+    """
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests.", ("route",))
+    histogram = registry.histogram("duration_seconds", "Durations.", ("stage",), buckets=(0.1, 1.0))
+    registry.gauge("size", "Size.", function=lambda: 42)
+
+    counter.inc('/"quoted"')
+    counter.inc('/"quoted"', amount=2)
+
+    for duration in (0.05, 0.5, 5.0):
+        histogram.observe(duration, "scan")
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/\\"quoted\\""} 3',
+        "# HELP duration_seconds Durations.",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{stage="scan",le="0.1"} 1',
+        'duration_seconds_bucket{stage="scan",le="1.0"} 2',
+        'duration_seconds_bucket{stage="scan",le="+Inf"} 3',
+        'duration_seconds_sum{stage="scan"} 5.55',
+        'duration_seconds_count{stage="scan"} 3',
+        "# HELP size Size.",
+        "# TYPE size gauge",
+        "size 42"
+    ]
+
+
+def test_sampling_profiler():
+    """
+    Confirm that only the requests exceeding the threshold are profiled, with the stacks of the busy threads
+    """
+    profiler = SamplingProfiler(threshold=0.05, interval=0.001)
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+
+    fast_request_id = profiler.start_request()
+    assert profiler.finish_request(fast_request_id, "GET /fast") is None
+
+    worker = threading.Thread(target=spin)
+    worker.start()
+    slow_request_id = profiler.start_request()
+    time.sleep(0.2)
+    profile = profiler.finish_request(slow_request_id, "GET /slow")
+    stop.set()
+    worker.join()
+    profiler.close()
+
+    assert profile["request"] == "GET /slow" and profile["duration"] >= 0.2
+    assert any("spin" in stack for stack in profile["stacks"])
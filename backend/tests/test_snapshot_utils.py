@@ -0,0 +1,41 @@
+import os
+
+from app.utils.snapshot_utils import SnapshotUtils
+
+
+def test_load_or_build(tmp_path):
+    """
+    Confirm that the snapshot is reused until the source file changes, and rebuilt afterwards
+    """
+    filepath = tmp_path / "data.json"
+    filepath.write_text('{"version": 1}')
+    builds = []
+
+    def build():
+        builds.append(filepath.read_text())
+        return {"content": filepath.read_text()}
+
+    assert SnapshotUtils.load_or_build(str(filepath), build) == {"content": '{"version": 1}'}
+    assert SnapshotUtils.load_or_build(str(filepath), build) == {"content": '{"version": 1}'}
+    assert len(builds) == 1
+
+    # Touching the file without changing its content keeps the snapshot
+    os.utime(filepath, ns=(0, 0))
+    assert SnapshotUtils.load_or_build(str(filepath), build) == {"content": '{"version": 1}'}
+    assert len(builds) == 1
+
+    filepath.write_text('{"version": 2}')
+    assert SnapshotUtils.load_or_build(str(filepath), build) == {"content": '{"version": 2}'}
+    assert len(builds) == 2
+
+
+def test_load_or_build_with_corrupted_snapshot(tmp_path):
+    """
+    Confirm that a corrupted snapshot is ignored and replaced
+    """
+    filepath = tmp_path / "data.json"
+    filepath.write_text("{}")
+    (tmp_path / f"data.json{SnapshotUtils.SNAPSHOT_SUFFIX}").write_bytes(b"not a snapshot")
+
+    assert SnapshotUtils.load_or_build(str(filepath), lambda: "built") == "built"
+    assert SnapshotUtils.load_or_build(str(filepath), lambda: "rebuilt") == "built"
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.enums.status import Status
+from app.models.enums.time_bucket import TimeBucket
+from app.models.enums.ticket_grouping import TicketGrouping
+from app.backends.sqlite_ticket_backend import SqliteTicketBackend
+from app.repositories.ticket_repository import TicketRepository
+
+mock_filepath = "../data/awesome_tickets.json"
+
+
+@pytest.fixture(scope="module")
+def repositories(tmp_path_factory):
+    database_path = str(tmp_path_factory.mktemp("sqlite") / "awesome_tickets.db")
+    SqliteTicketBackend.import_json(mock_filepath, database_path)
+
+    return (
+        TicketRepository(filepath=mock_filepath, use_snapshot=False),
+        TicketRepository(backend=SqliteTicketBackend(database_path))
+    )
+
+
+@pytest.mark.parametrize("filter_arguments", [
+    {},
+    {"status": [Status.OPEN]},
+    {"status": []},
+    {"author": "A"},
+    {"author": "SAMUYAL"},
+    {"msg_content": "nft"},
+    {"msg_content": "error help"},
+    {"msg_content": "e", "status": [Status.OPEN, Status.CLOSED]},
+    {"timestamp_start": datetime(2023, 10, 28), "timestamp_end": datetime(2023, 11, 1)}
+])
+def test_filters_match_memory_backend(repositories, filter_arguments):
+    """
+    Confirm that the filters pushed down into SQL select the same tickets in the same order as the memory backend
+    """
+    memory_repository, sqlite_repository = repositories
+
+    for page in range(2):
+        memory_response = memory_repository.get_tickets(page, 20, **filter_arguments)
+        sqlite_response = sqlite_repository.get_tickets(page, 20, **filter_arguments)
+
+        assert sqlite_response["ticket_count"] == memory_response["ticket_count"]
+        assert sqlite_response["tickets"] == memory_response["tickets"]
+
+    memory_response = memory_repository.get_tickets_by_cursor(None, 20, **filter_arguments)
+    sqlite_response = sqlite_repository.get_tickets_by_cursor(None, 20, **filter_arguments)
+
+    assert sqlite_response == memory_response
+
+    # Small batches make the export go through several keyset queries
+    memory_export = b"".join(memory_repository.export_tickets(batch_size=7, **filter_arguments))
+    sqlite_export = b"".join(sqlite_repository.export_tickets(batch_size=7, **filter_arguments))
+
+    assert sqlite_export == memory_export
+    assert memory_export.count(b"\n") == memory_repository.get_tickets(0, 0, **filter_arguments)["ticket_count"]
+
+
+@pytest.mark.parametrize("timestamp_start,timestamp_end", [
+    (None, None),
+    (datetime(2023, 10, 27, 13, 30), datetime(2023, 11, 2, 8, 15)),
+    (datetime(2023, 10, 30), None),
+    (datetime(2023, 10, 27, 13, 30, tzinfo=timezone.utc), datetime(2023, 11, 2, 8, 15, tzinfo=timezone.utc))
+])
+def test_histograms_match_memory_backend(repositories, timestamp_start, timestamp_end):
+    """
+    Confirm that the histograms grouped in SQL match the histograms summed from the hourly rollups
+    """
+    memory_repository, sqlite_repository = repositories
+
+    for bucket in TimeBucket:
+        for grouping in TicketGrouping:
+            assert sqlite_repository.get_ticket_histogram(bucket, grouping, timestamp_start, timestamp_end, 5) == (
+                memory_repository.get_ticket_histogram(bucket, grouping, timestamp_start, timestamp_end, 5)
+            )
+
+
+def test_status_changes_are_stored(repositories):
+    """
+    Confirm that status changes are written to the database and reflected in the counts
+    """
+    _, sqlite_repository = repositories
+    ticket_id = sqlite_repository.get_tickets(0, 1, status=[Status.OPEN])["tickets"][0].id
+    open_count = sqlite_repository.get_ticket_counts()[Status.OPEN]
+
+    closed_ticket = sqlite_repository.close_ticket(ticket_id)
+    other_repository = TicketRepository(backend=SqliteTicketBackend(sqlite_repository.backend.database_path))
+
+    assert other_repository.get_ticket(ticket_id) == closed_ticket
+    assert other_repository.get_ticket_counts()[Status.OPEN] == open_count - 1
+
+
+def test_threads_match_memory_backend(repositories):
+    """
+    Confirm that the threads resolved by recursive SQL queries match the threads of the precomputed message graph
+    """
+    memory_repository, sqlite_repository = repositories
+
+    for ticket in memory_repository.get_tickets(0, 20)["tickets"]:
+        for max_depth, max_size in [(0, 1), (1, 5), (3, 50)]:
+            assert sqlite_repository.get_ticket_thread(ticket.id, max_depth, max_size) == (
+                memory_repository.get_ticket_thread(ticket.id, max_depth, max_size)
+            )
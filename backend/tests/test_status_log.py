@@ -0,0 +1,162 @@
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from app.models.enums.status import Status
+from app.storage.status_log import StatusLog
+from app.repositories.ticket_repository import TicketRepository
+from app.utils.snapshot_utils import SnapshotUtils
+
+
+def test_read_appended_changes(tmp_path):
+    """
+    Confirm that appended changes are read back in order, skipping a torn last record
+    """
+    path = tmp_path / "status.wal"
+    status_log = StatusLog(str(path))
+    changes = [
+        ("1", Status.CLOSED, datetime(2024, 1, 1, 12)),
+        ("2", Status.REMOVED, datetime(2024, 1, 1, 13)),
+        ("1", Status.REMOVED, datetime(2024, 1, 1, 14))
+    ]
+
+    status_log.append(changes[:2])
+    status_log.append(changes[2:])
+    status_log.close()
+
+    with open(path, "a", encoding="utf-8") as log_file:
+        log_file.write('{"id": "3", "sta')
+
+    assert list(StatusLog(str(path)).read()) == changes
+
+    # Appending after a torn record keeps the new record readable
+    status_log = StatusLog(str(path))
+    status_log.append([("3", Status.CLOSED, datetime(2024, 1, 1, 15))])
+    status_log.close()
+
+    assert list(status_log.read())[-1] == ("3", Status.CLOSED, datetime(2024, 1, 1, 15))
+
+
+def test_compact(tmp_path):
+    """
+    Confirm that compaction keeps only the latest change of each ticket, and that appends continue afterwards
+    """
+    status_log = StatusLog(str(tmp_path / "status.wal"))
+    status_log.append([
+        ("1", Status.CLOSED, datetime(2024, 1, 1, 12)),
+        ("2", Status.CLOSED, datetime(2024, 1, 1, 13)),
+        ("1", Status.REMOVED, datetime(2024, 1, 1, 14))
+    ])
+    status_log.compact()
+    status_log.append([("2", Status.REMOVED, datetime(2024, 1, 1, 15))])
+    status_log.close()
+
+    assert list(status_log.read()) == [
+        ("1", Status.REMOVED, datetime(2024, 1, 1, 14)),
+        ("2", Status.CLOSED, datetime(2024, 1, 1, 13)),
+        ("2", Status.REMOVED, datetime(2024, 1, 1, 15))
+    ]
+
+
+def test_compact_changes_appended_out_of_order(tmp_path):
+    """
+    Confirm that compaction keeps the change a replay ends up with, when processes append their changes out of order
+    """
+    status_log_path = str(tmp_path / "status.wal")
+    ticket_ids = list(TicketRepository(filepath="../data/awesome_tickets.json").backend.data["tickets"])[:2]
+    status_log = StatusLog(status_log_path)
+    status_log.append([
+        (ticket_ids[0], Status.REMOVED, datetime(2030, 1, 1, 14)),
+        (ticket_ids[0], Status.CLOSED, datetime(2030, 1, 1, 12)),
+        (ticket_ids[1], Status.CLOSED, datetime(2030, 1, 1, 13)),
+        (ticket_ids[1], Status.REMOVED, datetime(2030, 1, 1, 13))
+    ])
+    status_log.close()
+
+    def replay() -> list[tuple[Status, datetime]]:
+        ticket_repository = TicketRepository(filepath="../data/awesome_tickets.json", status_log_path=status_log_path)
+        tickets = [ticket_repository.get_ticket(ticket_id) for ticket_id in ticket_ids]
+        ticket_repository.close()
+
+        return [(ticket.status, ticket.ts_last_status_change) for ticket in tickets]
+
+    replayed_statuses = replay()
+    status_log.compact()
+
+    assert replayed_statuses == [(Status.REMOVED, datetime(2030, 1, 1, 14)), (Status.CLOSED, datetime(2030, 1, 1, 13))]
+    assert replay() == replayed_statuses
+
+
+def test_replay_into_repository(tmp_path):
+    """
+    Confirm that status changes survive a restart of the repository through the status log
+    """
+    status_log_path = str(tmp_path / "status.wal")
+    ticket_repository = TicketRepository(filepath="../data/awesome_tickets.json", status_log_path=status_log_path)
+    ticket_id = next(iter(ticket_repository.backend.data["tickets"]))
+    closed_ticket = ticket_repository.close_ticket(ticket_id)
+    ticket_repository.close()
+
+    restarted_repository = TicketRepository(filepath="../data/awesome_tickets.json", status_log_path=status_log_path)
+    restarted_ticket = restarted_repository.get_ticket(ticket_id)
+
+    assert restarted_ticket.status == Status.CLOSED
+    assert restarted_ticket.ts_last_status_change == closed_ticket.ts_last_status_change
+    assert restarted_repository.get_tickets(0, 1, status=[Status.CLOSED])["tickets"][0].id == ticket_id
+
+
+def test_compact_into_snapshot(tmp_path):
+    """
+    Confirm that compaction stores the statuses in the snapshot without the ingested tickets, and that status
+    changes start at most one compaction at a time
+    """
+    data_filepath = str(tmp_path / "awesome_tickets.json")
+    shutil.copyfile("../data/awesome_tickets.json", data_filepath)
+    status_log_path = str(tmp_path / "status.wal")
+
+    ticket_repository = TicketRepository(filepath=data_filepath, status_log_path=status_log_path)
+    backend = ticket_repository.backend
+    ticket_id, other_ticket_id = list(backend.data["tickets"])[:2]
+    ticket = backend.get_ticket(ticket_id)
+    ticket_repository.ingest([], [ticket.model_copy(update={"id": "ingested-ticket"})])
+
+    compaction_started = threading.Event()
+    compaction_released = threading.Event()
+    compact_status_log = backend.compact_status_log
+    compaction_count = 0
+
+    def compact_slowly():
+        nonlocal compaction_count
+        compaction_count += 1
+        compaction_started.set()
+        compaction_released.wait(5)
+        compact_status_log()
+
+    backend.compact_status_log = compact_slowly
+    backend.status_log.compaction_interval = 0
+    ticket_repository.close_ticket(ticket_id)
+    assert compaction_started.wait(5)
+
+    # Status changes go through while the compaction is running, without starting another one
+    ticket_repository.remove_ticket(other_ticket_id)
+    compaction_released.set()
+
+    while backend.compaction_scheduled:
+        time.sleep(0.01)
+
+    assert compaction_count == 1
+    ticket_repository.close()
+
+    snapshot = SnapshotUtils.load_or_build(data_filepath, lambda: None, backend.snapshot_path)
+
+    assert "ingested-ticket" not in snapshot["tickets"]
+    assert snapshot["tickets"][ticket_id].status == Status.CLOSED
+    assert len(snapshot["messages"]) == backend.source_message_count
+
+    restarted_repository = TicketRepository(filepath=data_filepath, status_log_path=status_log_path)
+
+    assert "ingested-ticket" not in restarted_repository.backend.data["tickets"]
+    assert restarted_repository.get_ticket(ticket_id).status == Status.CLOSED
+    assert restarted_repository.get_ticket(other_ticket_id).status == Status.REMOVED
+    restarted_repository.close()
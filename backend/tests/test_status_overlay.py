@@ -0,0 +1,78 @@
+import fcntl
+import os
+import signal
+import time
+from datetime import datetime
+
+from app.models.enums.status import Status
+from app.repositories.ticket_repository import TicketRepository
+from app.storage.status_overlay import StatusOverlay
+
+mock_filepath = "../data/awesome_tickets.json"
+
+
+def test_status_changes_are_shared_through_overlay():
+    """
+    Confirm that a status change in one repository is seen by another one attached to the same overlay
+    """
+    repository = TicketRepository(filepath=mock_filepath)
+    other_repository = TicketRepository(filepath=mock_filepath)
+    other_repository.backend.attach_overlay(repository.backend.attach_overlay())
+
+    ticket_id = next(
+        ticket.id for ticket in repository.backend.data["tickets"].values() if ticket.status == Status.OPEN
+    )
+    open_count = other_repository.get_ticket_counts()[Status.OPEN]
+
+    repository.close_ticket(ticket_id)
+
+    assert other_repository.get_ticket(ticket_id).status == Status.CLOSED
+    assert other_repository.get_ticket(ticket_id).ts_last_status_change is not None
+    assert other_repository.get_ticket_counts()[Status.OPEN] == open_count - 1
+    assert ticket_id in [
+        ticket.id for ticket in other_repository.get_tickets(0, open_count, status=[Status.CLOSED])["tickets"]
+    ]
+
+
+def test_overlay_rescans_after_log_overflow():
+    """
+    Confirm that a repository lagging behind more changes than the overlay log holds still converges
+    """
+    repository = TicketRepository(filepath=mock_filepath)
+    other_repository = TicketRepository(filepath=mock_filepath)
+    overlay = repository.backend.attach_overlay()
+    other_repository.backend.attach_overlay(overlay)
+
+    ticket_ids = list(repository.backend.data["tickets"].keys())
+
+    for _ in range(overlay.log_capacity // len(ticket_ids) + 1):
+        for ticket_id in ticket_ids:
+            repository.remove_ticket(ticket_id)
+
+    assert other_repository.get_ticket_counts() == {Status.REMOVED: len(ticket_ids)}
+
+
+def test_overlay_lock_is_released_when_its_holder_exits():
+    """
+    Confirm that a process exiting while holding the overlay lock leaves the overlay usable by the other processes
+    """
+    overlay = StatusOverlay([Status.OPEN, Status.OPEN])
+    read_descriptor, write_descriptor = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        fcntl.lockf(overlay.lock_file, fcntl.LOCK_EX)
+        os.write(write_descriptor, b"1")
+        time.sleep(60)
+        os._exit(0)
+
+    os.read(read_descriptor, 1)
+
+    assert not overlay.check_lock(timeout=0.1)
+
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+
+    assert overlay.check_lock()
+    assert overlay.write(0, Status.CLOSED, datetime(2024, 1, 1)) == 1
+    assert overlay.read(0) == (Status.CLOSED, datetime(2024, 1, 1))
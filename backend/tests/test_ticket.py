@@ -8,6 +8,7 @@ from app.routes.ticket_routes import DEFAULT_PAGE, DEFAULT_PAGE_SIZE
 from app.models.ticket import Ticket
 from app.models.message import Message
 from app.models.enums.status import Status
+from app.repositories.ticket_repository import TicketRepository
 from app.exceptions.not_found_exception import NotFoundException
 from app.utils.data_utils import DataUtils
 
@@ -225,3 +226,241 @@ def test_remove_ticket():
     assert response.status_code == http_status.HTTP_200_OK
     assert response_data["id"] == ticket_id
     assert response_data["status"] == Status.REMOVED
+
+
+def test_get_tickets_with_status_filter_after_close():
+    """
+    Confirm that the status filter reflects a ticket that has been closed
+    """
+    ticket_id = next(ticket.id for ticket in mock_data["tickets"].values() if ticket.status == Status.OPEN)
+
+    client.put(f"/api/v1/tickets/{ticket_id}")
+
+    response_open = client.get("/api/v1/tickets/", params={
+        "page": 0, "page_size": len(mock_data["tickets"]),
+        "status": Status.OPEN.value
+    })
+    response_closed = client.get("/api/v1/tickets/", params={
+        "page": 0, "page_size": len(mock_data["tickets"]),
+        "status": Status.CLOSED.value
+    })
+
+    assert response_open.status_code == http_status.HTTP_200_OK
+    assert response_closed.status_code == http_status.HTTP_200_OK
+    assert ticket_id not in [item["id"] for item in response_open.json()["tickets"]]
+    assert ticket_id in [item["id"] for item in response_closed.json()["tickets"]]
+
+
+def test_get_tickets_with_cursor_pagination():
+    """
+    Confirm that following the cursors returns every ticket exactly once, ordered by timestamp and ID
+    """
+    page_size = 7
+    expected_ticket_ids = [
+        ticket.id for ticket in sorted(mock_data["tickets"].values(), key=lambda ticket: (ticket.timestamp, ticket.id))
+    ]
+    ticket_ids = []
+    cursor = ""
+
+    while cursor is not None:
+        response = client.get("/api/v1/tickets/", params={"page_size": page_size, "cursor": cursor})
+        response_data = response.json()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert response_data["ticket_count"] == len(mock_data["tickets"])
+        assert len(response_data["tickets"]) <= page_size
+
+        ticket_ids += [item["id"] for item in response_data["tickets"]]
+        cursor = response_data["next_cursor"]
+
+    assert ticket_ids == expected_ticket_ids
+
+
+def test_get_tickets_with_invalid_cursor():
+    """
+    Confirm that a malformed cursor results in a 400 Bad Request response
+    """
+    response = client.get("/api/v1/tickets/", params={"cursor": "INVALID_CURSOR"})
+
+    assert response.status_code == http_status.HTTP_400_BAD_REQUEST
+
+
+def test_get_tickets_without_count():
+    """
+    Confirm that the total ticket count is omitted on request while the page stays the same
+    """
+    params = {"page": 3, "page_size": 8, "author": "samuyal01"}
+
+    response = client.get("/api/v1/tickets/", params={**params, "with_count": False})
+    response_data = response.json()
+
+    assert response.status_code == http_status.HTTP_200_OK
+    assert "ticket_count" not in response_data
+    assert response_data["tickets"] == client.get("/api/v1/tickets/", params=params).json()["tickets"]
+
+
+def test_get_tickets_with_fields():
+    """
+    Confirm that only the requested fields of each ticket are returned
+    """
+    params = {"page_size": 8, "msg_content": "help"}
+
+    response = client.get("/api/v1/tickets/", params={**params, "fields": ["id", "status"]})
+    response_data = response.json()
+
+    assert response.status_code == http_status.HTTP_200_OK
+    assert response_data["ticket_count"] == client.get("/api/v1/tickets/", params=params).json()["ticket_count"]
+    assert response_data["tickets"] == [
+        {"id": ticket["id"], "status": ticket["status"]}
+        for ticket in client.get("/api/v1/tickets/", params=params).json()["tickets"]
+    ]
+
+    response = client.get("/api/v1/tickets/", params={**params, "fields": ["unknown"]})
+    assert response.status_code == http_status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_tickets_is_cached_until_status_change():
+    """
+    Confirm that repeated queries are served from the cache, and that a status change invalidates them
+    """
+    params = {"page": 0, "page_size": len(mock_data["tickets"]), "status": [Status.OPEN.value, Status.CLOSED.value]}
+
+    response_data = client.get("/api/v1/tickets/", params=params).json()
+    stats = client.get("/api/v1/tickets/cache/stats").json()
+
+    # An equivalent filter with a different order and case hits the same entry
+    assert client.get("/api/v1/tickets/", params={
+        **params, "status": [Status.CLOSED.value, Status.OPEN.value]
+    }).json() == response_data
+    assert client.get("/api/v1/tickets/cache/stats").json()["hits"] == stats["hits"] + 1
+
+    ticket_id = next(item["id"] for item in response_data["tickets"] if item["status"] == Status.OPEN)
+    client.delete(f"/api/v1/tickets/{ticket_id}")
+
+    response_data_after_change = client.get("/api/v1/tickets/", params=params).json()
+    stats_after_change = client.get("/api/v1/tickets/cache/stats").json()
+
+    assert response_data_after_change["ticket_count"] == response_data["ticket_count"] - 1
+    assert ticket_id not in [item["id"] for item in response_data_after_change["tickets"]]
+    assert stats_after_change["invalidations"] > stats["invalidations"]
+
+
+def test_ticket_versions():
+    """
+    Confirm that a status change only changes the version of its ticket and of the tickets, and that the versions
+    of another generation of the repository differ
+    """
+    repository = TicketRepository(filepath="../data/awesome_tickets.json", cache_size=0)
+    ticket_id, other_ticket_id = [ticket.id for ticket in repository.get_tickets(0, 2)["tickets"]]
+    version, last_modified = repository.get_version()
+    ticket_version, _ = repository.get_ticket_version(ticket_id)
+    other_ticket_version = repository.get_ticket_version(other_ticket_id)
+
+    assert repository.get_version() == (version, last_modified)
+
+    repository.close_ticket(ticket_id)
+
+    assert repository.get_version()[0] != version and repository.get_version()[1] >= last_modified
+    assert repository.get_ticket_version(ticket_id)[0] != ticket_version
+    assert repository.get_ticket_version(other_ticket_id) == other_ticket_version
+
+    successor = TicketRepository(filepath="../data/awesome_tickets.json", cache_size=0)
+
+    assert successor.get_ticket_version(other_ticket_id)[0] != other_ticket_version[0]
+
+    successor.close()
+    repository.close()
+
+
+def test_get_ticket_counts_with_filters():
+    """
+    Confirm that the counts by author and time window match the number of tickets listed with the same filters
+    """
+    filter_arguments = {
+        "author": "SAMUYAL",
+        "timestamp_start": "2023-10-30T09:00:00",
+        "timestamp_end": "2023-11-02T12:00:00"
+    }
+
+    for filter_names in [["author"], ["timestamp_start", "timestamp_end"], list(filter_arguments.keys())]:
+        params = {filter_name: filter_arguments[filter_name] for filter_name in filter_names}
+
+        response = client.get("/api/v1/tickets/counts", params=params)
+        response_data = response.json()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert response_data == {
+            status.value: count
+            for status in Status
+            if (count := client.get("/api/v1/tickets/", params={
+                **params, "status": status.value, "page_size": 0
+            }).json()["ticket_count"]) > 0
+        }
+
+
+def test_get_ticket_counts_with_time_zone():
+    """
+    Confirm that time window bounds with a time zone are converted to UTC, the time zone of the tickets
+    """
+    for author in [None, "a"]:
+        params = {"timestamp_start": "2023-10-30T09:00:00", "timestamp_end": "2023-11-02T12:00:00"}
+
+        if author is not None:
+            params["author"] = author
+
+        counts = client.get("/api/v1/tickets/counts", params=params).json()
+        response = client.get("/api/v1/tickets/counts", params={
+            **params, "timestamp_start": params["timestamp_start"] + "Z", "timestamp_end": params["timestamp_end"] + "Z"
+        })
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert response.json() == counts and counts
+
+
+def test_get_tickets_by_ids():
+    """
+    Confirm that a batch of tickets is returned with their context messages, along with the unknown IDs
+    """
+    ticket_ids = list(mock_data["tickets"].keys())[:5]
+
+    response = client.post(
+        "/api/v1/tickets/batch",
+        params={"with_context_messages": True},
+        json={"ticket_ids": ticket_ids + ["INVALID_TICKET_ID"]}
+    )
+    response_data = response.json()
+
+    assert response.status_code == http_status.HTTP_200_OK
+    assert list(response_data["tickets"].keys()) == ticket_ids
+    assert response_data["not_found"] == ["INVALID_TICKET_ID"]
+    assert all([
+        [message["id"] for message in response_data["context_messages"][ticket_id]]
+        == mock_data["tickets"][ticket_id].context_messages
+        for ticket_id in ticket_ids
+    ])
+
+
+def test_close_and_remove_tickets():
+    """
+    Confirm that batches of tickets are closed and removed in one request each
+    """
+    ticket_ids = list(mock_data["tickets"].keys())[5:10]
+
+    for action, status in [("close", Status.CLOSED), ("remove", Status.REMOVED)]:
+        response = client.post(f"/api/v1/tickets/batch/{action}", json={"ticket_ids": ticket_ids + ["INVALID_TICKET_ID"]})
+        response_data = response.json()
+
+        assert response.status_code == http_status.HTTP_200_OK
+        assert list(response_data["tickets"].keys()) == ticket_ids
+        assert all([item["status"] == status for item in response_data["tickets"].values()])
+        assert response_data["not_found"] == ["INVALID_TICKET_ID"]
+        assert all([client.get(f"/api/v1/tickets/{ticket_id}").json()["status"] == status for ticket_id in ticket_ids])
+
+
+def test_close_tickets_with_empty_batch():
+    """
+    Confirm that an empty batch results in a 422 Unprocessable Entity response
+    """
+    response = client.post("/api/v1/tickets/batch/close", json={"ticket_ids": []})
+
+    assert response.status_code == http_status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.events.ticket_event_hub import TicketEventHub
+from app.models.enums.status import Status
+from app.repositories.ticket_repository import TicketRepository
+from app.exceptions.service_unavailable_exception import ServiceUnavailableException
+
+mock_filepath = "../data/awesome_tickets.json"
+
+
+def parse_event(event: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in event.decode().strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_ticket_event_hub():
+    """
+    Confirm that status changes published from other threads are sent to all clients, followed by a single update
+    of the counts
+    """
+    repository = TicketRepository(filepath=mock_filepath, cache_size=0)
+    count_calls = []
+
+    def get_counts():
+        count_calls.append(1)
+        return repository.get_ticket_counts()
+
+    hub = TicketEventHub(get_counts, counts_delay=0.05)
+    repository.listeners.append(hub.publish)
+    ticket_ids = [ticket.id for ticket in repository.get_tickets(0, 2)["tickets"]]
+
+    async def stream_events():
+        streams = [hub.stream(), hub.stream()]
+
+        for stream in streams:
+            assert (await stream.__anext__()).startswith(b"retry: ")
+            assert parse_event(await stream.__anext__())[0] == "counts"
+
+        count_calls.clear()
+        # Status changes are published from the worker threads of the repository
+        threads = [threading.Thread(target=repository.close_ticket, args=[ticket_id]) for ticket_id in ticket_ids]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        for stream in streams:
+            status_events = [parse_event(await stream.__anext__()) for _ in ticket_ids]
+            event_type, counts = parse_event(await stream.__anext__())
+
+            assert {event_type for event_type, _ in status_events} == {"status"}
+            assert sorted(ticket["id"] for _, data in status_events for ticket in data["tickets"]) == sorted(ticket_ids)
+            assert all(ticket["status"] == "closed" for _, data in status_events for ticket in data["tickets"])
+            assert event_type == "counts"
+            assert counts == {status.value: count for status, count in repository.get_ticket_counts().items()}
+
+            await stream.aclose()
+
+        assert len(count_calls) == 1
+        assert not hub.subscriptions and not hub.tasks
+
+    asyncio.run(stream_events())
+    repository.close()
+
+
+def test_ticket_event_hub_backpressure():
+    """
+    Confirm that a client falling behind is told to resync instead of queueing events without bound, and that
+    clients beyond the maximum are rejected
+    """
+    hub = TicketEventHub(lambda: {Status.OPEN: 0}, max_queue_size=2, max_subscribers=1, counts_delay=60)
+
+    async def publish_events():
+        subscription = hub.subscribe()
+
+        with pytest.raises(ServiceUnavailableException):
+            hub.subscribe()
+
+        for _ in range(2):
+            hub.publish([])
+            await asyncio.sleep(0)
+
+        assert [parse_event(event)[0] for event in subscription.drain()] == ["status", "status"]
+
+        for _ in range(3):
+            hub.publish([])
+            await asyncio.sleep(0)
+
+        assert [parse_event(event)[0] for event in subscription.drain()] == ["resync"]
+        assert subscription.drain() == [] and hub.lagged_count == 1
+
+        hub.unsubscribe(subscription)
+
+    asyncio.run(publish_events())
+
+
+def test_ticket_repository_listeners():
+    """
+    Confirm that the listeners are notified of added tickets, and are handed over to the next generation
+    """
+    repository = TicketRepository(filepath=mock_filepath, cache_size=0)
+    successor = TicketRepository(filepath=mock_filepath, cache_size=0)
+    notifications = []
+    repository.listeners.append(notifications.append)
+
+    ticket = repository.get_tickets(0, 1)["tickets"][0]
+    new_ticket = ticket.model_copy(update={"id": "new-ticket"})
+    repository.ingest([], [new_ticket])
+    repository.retire(successor)
+    successor.remove_ticket(ticket.id)
+
+    assert [ticket.id for ticket in notifications[0]] == ["new-ticket"]
+    assert notifications[1] is None
+    assert [(ticket.id, ticket.status) for ticket in notifications[2]] == [(ticket.id, Status.REMOVED)]
+
+    successor.close()
+    repository.close()
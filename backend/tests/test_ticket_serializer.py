@@ -0,0 +1,33 @@
+from app.models.enums.status import Status
+from app.repositories.ticket_repository import TicketRepository
+from app.serializers.ticket_serializer import TicketSerializer
+
+
+def test_dump_ticket_invalidated_while_dumping():
+    """
+    Confirm that the bytes of a ticket invalidated while it is being serialized are not cached
+    """
+    repository = TicketRepository(filepath="../data/awesome_tickets.json", cache_size=0)
+    ticket = repository.get_tickets(0, 1)["tickets"][0]
+    serializer = TicketSerializer()
+
+    class ChangingAdapter:
+        """
+        Changes the status of the ticket right after serializing it, like a concurrent status change
+        """
+
+        @staticmethod
+        def dump_json(value):
+            value_json = TicketSerializer.TICKET_ADAPTER.dump_json(value)
+            value.status = Status.CLOSED
+            serializer.invalidate(value.id)
+            return value_json
+
+    serializer.TICKET_ADAPTER = ChangingAdapter
+    stale_json = serializer.dump_ticket(ticket)
+    del serializer.TICKET_ADAPTER
+
+    assert b'"status":"open"' in stale_json
+    assert b'"status":"closed"' in serializer.dump_ticket(ticket)
+    assert serializer.dump_ticket(ticket) is serializer.dump_ticket(ticket)
+    repository.close()
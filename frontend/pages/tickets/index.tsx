@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { NextPage } from "next";
 import {
   Box, Grid
@@ -15,6 +15,7 @@ import MessageCard from "../../components/tickets/messageCard";
 import TicketDetailsDialog from "../../components/tickets/ticketDetailsDialog";
 
 import TicketService from "../../services/ticketService";
+import type { TicketStatusChange } from "../../services/ticketService";
 import type Ticket from "../../types/ticket.type";
 
 const DEFAULT_PAGE = 0;
@@ -40,36 +41,41 @@ const Tickets: NextPage = () => {
   const [confirmationDialogShown, setConfirmationDialogShown] = useState<boolean>(false);
   const [ticketDetailsDialogShown, setTicketDetailsDialogShown] = useState<boolean>(false);
 
-  useEffect(() => {
-    setTotalNumTickets(null); // Set to null to visualize loading
+  const listedStatuses = filterApplied["status"] ? [filterApplied["status"]] : ['open', 'closed'];
 
-    TicketService.getTicketCounts()
-      .then((ticketCountsResponse) => {
-        setStatusTicketCounts(ticketCountsResponse.data);
-      })
-      .catch((err) => {
-        eventBus.emit("showAlert", "error", `An error occurred while fetching the ticket counts. (Error: ${err.message})`);
-        setTotalNumTickets(0);
-      });
-  }, []);
+  // The latest listed tickets and their count, which status changes arriving before the next render build on
+  const listedTicketsRef = useRef({ tickets, totalNumTickets });
+  listedTicketsRef.current = { tickets, totalNumTickets };
+
+  // Status changes received while the page is loading, which the loaded page may not include yet
+  const pendingStatusChangesRef = useRef<TicketStatusChange[]>([]);
+
+  const setListedTickets = (tickets: Ticket[], totalNumTickets: number): void => {
+    listedTicketsRef.current = { tickets, totalNumTickets };
+    setTickets(tickets);
+    setTotalNumTickets(totalNumTickets);
+  }
 
   const fetchTickets = () => {
-    setTickets(null); // Set to null to visualize loading
+    setListedTickets(null, listedTicketsRef.current.totalNumTickets); // Set to null to visualize loading
+    pendingStatusChangesRef.current = [];
 
     TicketService.getTickets(page, pageSize, {
       author: filterApplied["author"] || undefined,
       msgContent: filterApplied["message"] || undefined,
-      statusList: filterApplied["status"] ? [filterApplied["status"]] : ['open', 'closed'],
+      statusList: listedStatuses,
       timestampStart: filterApplied["startDate"] ? toLocalISOString(filterApplied["startDate"]) : undefined,
       timestampEnd: filterApplied["endDate"] ? toLocalISOString(filterApplied["endDate"], true) : undefined
     })
       .then((ticketsResponse) => {
-        setTotalNumTickets(ticketsResponse.data.ticket_count)
-        setTickets(ticketsResponse.data.tickets);
+        const { tickets, removedCount } = patchTickets(ticketsResponse.data.tickets, pendingStatusChangesRef.current);
+        pendingStatusChangesRef.current = [];
+
+        setListedTickets(tickets, ticketsResponse.data.ticket_count - removedCount);
       })
       .catch((err) => {
         eventBus.emit("showAlert", "error", `An error occurred while fetching the tickets. (Error: ${err.message})`);
-        setTickets([]);
+        setListedTickets([], listedTicketsRef.current.totalNumTickets);
       });
   }
 
@@ -77,6 +83,57 @@ const Tickets: NextPage = () => {
     fetchTickets();
   }, [filterApplied, page, pageSize]);
 
+  // Sets the new status of the listed tickets that changed later than they were loaded, and drops the tickets
+  // whose new status is no longer listed, leaving the page short until it is fetched again
+  const patchTickets = (
+    currentTickets: Ticket[], changes: TicketStatusChange[]
+  ): { tickets: Ticket[], removedCount: number } => {
+    const changesById = new Map(changes.map((change): [string, TicketStatusChange] => [change.id, change]));
+    const patchedTickets = currentTickets.map((ticket) => {
+      const change = changesById.get(ticket.id);
+
+      if (!change || (ticket.ts_last_status_change && change.ts_last_status_change
+        && new Date(change.ts_last_status_change) < new Date(ticket.ts_last_status_change))) {
+        return ticket;
+      }
+
+      return { ...ticket, status: change.status, ts_last_status_change: change.ts_last_status_change };
+    });
+    const tickets = patchedTickets.filter((ticket) => listedStatuses.includes(ticket.status));
+
+    return { tickets, removedCount: patchedTickets.length - tickets.length };
+  }
+
+  const applyStatusChanges = (changes: TicketStatusChange[]): void => {
+    const { tickets, totalNumTickets } = listedTicketsRef.current;
+
+    if (tickets === null) {
+      pendingStatusChangesRef.current.push(...changes);
+      return;
+    }
+
+    const { tickets: patchedTickets, removedCount } = patchTickets(tickets, changes);
+    setListedTickets(patchedTickets, totalNumTickets - removedCount);
+  }
+
+  // The event handlers outlive the renders, so they patch and fetch the tickets of the latest page and filter
+  const applyStatusChangesRef = useRef(applyStatusChanges);
+  applyStatusChangesRef.current = applyStatusChanges;
+  const fetchTicketsRef = useRef(fetchTickets);
+  fetchTicketsRef.current = fetchTickets;
+
+  useEffect(() => {
+    // The counts and the status changes made by anyone are pushed by the server instead of being polled. Only the
+    // listed tickets are patched, and the page is only fetched again when the server asks for a resync
+    const eventSource = TicketService.subscribeToTicketEvents({
+      onCounts: setStatusTicketCounts,
+      onStatusChange: (changes) => applyStatusChangesRef.current(changes),
+      onResync: () => fetchTicketsRef.current()
+    });
+
+    return () => eventSource.close();
+  }, []);
+
   const toLocalISOString = (date: Date, end_of_day: boolean = false): string => {
     const offset = new Date(date).getTimezoneOffset();
     const isoString = new Date(new Date(date).getTime() - offset * 60 * 1000).toISOString();
@@ -103,9 +160,9 @@ const Tickets: NextPage = () => {
 
   const closeTicket = (ticket: Ticket): void => {
     TicketService.closeTicket(ticket.id)
-      .then(() => {
-        // Fetch all tickets after closing the ticket
-        fetchTickets();
+      .then((ticketResponse) => {
+        // Patch the closed ticket instead of fetching all tickets again
+        applyStatusChanges([ticketResponse.data]);
 
         // Update status ticket counts
         setStatusCountsAfterUpdate(ticket.status, "closed");
@@ -119,9 +176,9 @@ const Tickets: NextPage = () => {
 
   const removeTicket = (ticket: Ticket): void => {
     TicketService.removeTicket(ticket.id)
-      .then(() => {
-        // Fetch all tickets after removing the ticket
-        fetchTickets();
+      .then((ticketResponse) => {
+        // Patch the removed ticket instead of fetching all tickets again
+        applyStatusChanges([ticketResponse.data]);
 
         // Update status ticket counts
         setStatusCountsAfterUpdate(ticket.status, "removed");
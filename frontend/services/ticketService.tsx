@@ -9,6 +9,18 @@ type TicketsResponse = {
   tickets: Ticket[];
 }
 
+export type TicketStatusChange = {
+  id: string;
+  status: string;
+  ts_last_status_change?: string | null;
+}
+
+type TicketEventHandlers = {
+  onCounts: (counts: { [key: string]: number }) => void;
+  onStatusChange: (tickets: TicketStatusChange[]) => void;
+  onResync: () => void;
+}
+
 class TicketService {
 
   private static readonly API_URL: string = `${Constants.BASE_URL}/tickets`;
@@ -59,6 +71,19 @@ class TicketService {
   static removeTicket(ticketId: string): Promise<AxiosResponse<Ticket>> {
     return axios.delete<Ticket>(`${TicketService.API_URL}/${ticketId}`);
   }
+
+  static subscribeToTicketEvents(handlers: TicketEventHandlers): EventSource {
+    // The browser reconnects on its own, after which the counts are sent again
+    const eventSource = new EventSource(`${TicketService.API_URL}/events`);
+
+    eventSource.addEventListener("counts", (event: MessageEvent) => handlers.onCounts(JSON.parse(event.data)));
+    eventSource.addEventListener("status", (event: MessageEvent) => {
+      handlers.onStatusChange(JSON.parse(event.data).tickets);
+    });
+    eventSource.addEventListener("resync", () => handlers.onResync());
+
+    return eventSource;
+  }
 }
 
 export default TicketService;